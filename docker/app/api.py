@@ -20,7 +20,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from models import ChatConfig
 from pydantic import BaseModel, Field
-from services import ChatService, ImageService, LLMService
+from services import ChatService, FileStorageService, ImageService, LLMService
+from services.image_generation_client import image_generation_client
+from services.llm_client_service import llm_client_service
 from tools.initialize_tools import initialize_all_tools
 from tools.registry import get_all_tool_definitions
 from ui import ChatHistoryComponent
@@ -208,6 +210,7 @@ class APIChatbotService:
                 from services.session_state import set_session_id
 
                 set_session_id(session_id)
+                FileStorageService().mark_session_active(session_id)
 
             # Convert messages to internal format
             messages = self._convert_messages_to_dict(request.messages)
@@ -489,6 +492,24 @@ async def health_check():
     return {"status": "healthy", "service": "brandonbot-api"}
 
 
+@app.get("/health/llm-pool")
+async def llm_pool_stats():
+    """LLM client connection pool statistics"""
+    return llm_client_service.get_pool_stats()
+
+
+@app.get("/health/image-pool")
+async def image_pool_stats():
+    """Image generation client pool and coalescing statistics"""
+    return image_generation_client.get_stats()
+
+
+@app.get("/health/storage")
+async def storage_metrics():
+    """Stored file eviction metrics"""
+    return FileStorageService().get_storage_metrics()
+
+
 @app.post("/agent")
 async def chat_completion(request: ChatCompletionRequest):
     """
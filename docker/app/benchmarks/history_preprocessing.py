@@ -0,0 +1,163 @@
+"""
+History Preprocessing Benchmark
+
+Replays conversations of up to 200 turns through
+MessageController.prepare_messages_for_processing, adding one user and one
+assistant message per turn as the app does, and reports the time spent
+preparing the history for each turn. Scanning and cleaning every message
+again on every turn, as before, is reproduced by clearing the per-message
+caches before each turn. Both modes are checked to prepare identical
+messages.
+
+The context marker extraction used to run a (.*?)START(.*?)END regex,
+which backtracks quadratically on messages without markers. Its cost per
+message is reported separately, since replaying whole conversations with
+it would take hours.
+
+Usage (from docker/app):
+    python benchmarks/history_preprocessing.py --turns 200
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from typing import Any, Dict, List
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from controllers import message_controller  # noqa: E402
+from controllers.message_controller import MessageController  # noqa: E402
+from services import chat_service  # noqa: E402
+from services.chat_service import ChatService  # noqa: E402
+from utils.split_context import (  # noqa: E402
+    END_CONTEXT,
+    START_CONTEXT,
+    extract_context_regex,
+)
+
+_WORDS = (
+    "the function returns a list of results sorted by score and the caller "
+    "should handle the empty case before indexing into it because an "
+    "exception would otherwise escape to the user"
+).split()
+
+
+def _text(rng: random.Random, length: int) -> str:
+    """Markdown-like text of about the given length"""
+    parts = []
+    size = 0
+    while size < length:
+        if rng.random() < 0.05:
+            part = "\n\n```python\nresult = sorted(items, key=score)\n```\n\n"
+        elif rng.random() < 0.1:
+            part = "\n- " + " ".join(rng.choices(_WORDS, k=8))
+        else:
+            part = rng.choice(_WORDS) + " "
+        parts.append(part)
+        size += len(part)
+    return "".join(parts)
+
+
+def _turn(rng: random.Random, turn: int) -> List[Dict[str, Any]]:
+    """User and assistant messages of one turn, as stored in history"""
+    if turn % 25 == 0:
+        user_content: Any = {
+            "type": "image",
+            "text": "Here is the image you requested",
+            "image_id": f"img_{turn}",
+        }
+    else:
+        user_content = _text(rng, rng.randint(80, 600))
+    return [
+        {"role": "user", "content": user_content},
+        {"role": "assistant", "content": _text(rng, rng.randint(800, 4000))},
+    ]
+
+
+def _former_extract_context(text: str) -> str:
+    """The former regex-based context marker extraction"""
+    pattern = f"(.*?){re.escape(START_CONTEXT)}(.*?){re.escape(END_CONTEXT)}"
+    match = re.search(pattern, text, re.DOTALL)
+    return match.group(1) if match else text
+
+
+def _best_time(fn, text: str, repeat: int = 3) -> float:
+    """Best time of a call in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _clear_caches() -> None:
+    """Drop the per-message caches"""
+    message_controller._contains_tool_call_instructions.cache_clear()
+    chat_service.clean_history_content.cache_clear()
+
+
+def replay(turns: int, seed: int, cached: bool) -> tuple:
+    """
+    Prepare the history after every turn of a conversation
+
+    Returns:
+        Per-turn preparation times in seconds and the last prepared messages
+    """
+    rng = random.Random(seed)
+    controller = MessageController(None, ChatService(None))
+    messages = [{"role": "system", "content": "You are a helpful assistant."}]
+    timings = []
+    prepared = []
+    _clear_caches()
+    for turn in range(1, turns + 1):
+        messages.extend(_turn(rng, turn))
+        if not cached:
+            _clear_caches()
+        start = time.perf_counter()
+        prepared = controller.prepare_messages_for_processing(messages)
+        timings.append(time.perf_counter() - start)
+    return timings, prepared
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'message chars':>14} {'former ms':>10} {'current ms':>11}")
+    for length in (1_000, 4_000, 16_000):
+        text = _text(rng, length)
+        if _former_extract_context(text) != extract_context_regex(text):
+            raise AssertionError("Context extraction differs")
+        former = _best_time(_former_extract_context, text)
+        current = _best_time(extract_context_regex, text)
+        print(f"{length:>14} {former * 1000:>10.2f} {current * 1000:>11.4f}")
+
+    uncached, uncached_prepared = replay(args.turns, args.seed, cached=False)
+    cached, cached_prepared = replay(args.turns, args.seed, cached=True)
+    if uncached_prepared != cached_prepared:
+        raise AssertionError("Prepared messages differ between modes")
+    print("\nPrepared messages identical\n")
+
+    print(f"{'turn':>6} {'uncached ms':>12} {'cached ms':>10}")
+    for turn in sorted({1, 10, 50, 100, args.turns}):
+        if turn <= args.turns:
+            print(
+                f"{turn:>6} {uncached[turn - 1] * 1000:>12.3f}"
+                f" {cached[turn - 1] * 1000:>10.3f}"
+            )
+    print(
+        f"{'total':>6} {sum(uncached) * 1000:>12.1f}"
+        f" {sum(cached) * 1000:>10.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Image Upload Benchmark
+
+Measures per-upload CPU time and extra peak memory of preparing an uploaded
+image for storage with the former multi-pass path (temp file, decode,
+resize, encode, base64, re-open to verify, then base64-decode and hash again
+in storage) versus the single-pass pipeline. Sample images are synthesized
+once in a few sizes and formats. Sample synthesis and each measurement run
+in their own interpreter, since Linux carries peak RSS over from the parent
+process.
+
+Usage (from docker/app):
+    python benchmarks/image_upload.py --repeat 5
+"""
+
+import argparse
+import base64
+import hashlib
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+# name: (width, height, PIL format, MIME type)
+SAMPLES = {
+    "photo_4000x3000_jpeg": (4000, 3000, "JPEG", "image/jpeg"),
+    "photo_2048x1536_jpeg": (2048, 1536, "JPEG", "image/jpeg"),
+    "screenshot_2560x1440_png": (2560, 1440, "PNG", "image/png"),
+    "small_800x600_jpeg": (800, 600, "JPEG", "image/jpeg"),
+}
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (Linux reports KB)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _make_sample(width: int, height: int, img_format: str) -> bytes:
+    """Encode a synthetic image with gradients and noise"""
+    from PIL import Image
+
+    size = (width, height)
+    img = Image.merge(
+        "RGB",
+        (
+            Image.linear_gradient("L").resize(size),
+            Image.effect_noise(size, 48),
+            Image.radial_gradient("L").resize(size),
+        ),
+    )
+    buffer = BytesIO()
+    img.save(buffer, format=img_format)
+    return buffer.getvalue()
+
+
+def _multi_pass_upload(image_bytes: bytes, file_type: str) -> str:
+    """The former path, up to and including storage"""
+    from PIL import Image
+
+    suffix = f".{file_type.split('/')[-1]}"
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp:
+        temp.write(image_bytes)
+    try:
+        with Image.open(temp.name) as img:
+            width, height = img.size
+            if max(width, height) > 1024:
+                scale = 1024 / max(width, height)
+                resized = img.resize(
+                    (int(width * scale), int(height * scale)),
+                    Image.Resampling.LANCZOS,
+                )
+                buffer = BytesIO()
+                img_format = file_type.split("/")[-1].upper()
+                resized.save(buffer, format=img_format, optimize=True)
+                encoded = buffer.getvalue()
+            else:
+                with open(temp.name, "rb") as f:
+                    encoded = f.read()
+            image_base64 = base64.b64encode(encoded).decode("utf-8")
+            Image.open(BytesIO(encoded)).size
+    finally:
+        os.unlink(temp.name)
+
+    # Session state size logging and storage decoded and hashed it again
+    len(base64.b64decode(image_base64))
+    stored_bytes = base64.b64decode(image_base64)
+    len(stored_bytes)
+    return hashlib.md5(image_base64.encode()).hexdigest()
+
+
+def _single_pass_upload(image_bytes: bytes, file_type: str) -> str:
+    """The single-pass pipeline, including the base64 kept in session"""
+    from utils.image_upload import prepare_image_upload
+
+    processed = prepare_image_upload(image_bytes, "upload", file_type)
+    processed.base64
+    return processed.sha256
+
+
+def _write_samples(sample_dir: str) -> None:
+    """Synthesize every sample image into a directory"""
+    for sample, (width, height, img_format, _) in SAMPLES.items():
+        with open(os.path.join(sample_dir, sample), "wb") as f:
+            f.write(_make_sample(width, height, img_format))
+
+
+def _run_child(mode: str, sample: str, path: str, repeat: int) -> None:
+    """Time repeated uploads of one sample and print CPU ms and peak MB"""
+    import utils.image_upload  # noqa: F401
+
+    _, _, img_format, file_type = SAMPLES[sample]
+    with open(path, "rb") as f:
+        image_bytes = f.read()
+    handler = _multi_pass_upload if mode == "multi" else _single_pass_upload
+
+    # Warm up Pillow's plugins and allocator before taking the baseline
+    _single_pass_upload(_make_sample(64, 64, img_format), file_type)
+    baseline = _peak_rss_mb()
+
+    start = time.process_time()
+    for _ in range(repeat):
+        handler(image_bytes, file_type)
+    cpu_ms = (time.process_time() - start) * 1000 / repeat
+    print(f"{cpu_ms:.1f} {_peak_rss_mb() - baseline:.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--child", choices=["multi", "single"])
+    parser.add_argument("--sample", choices=list(SAMPLES))
+    parser.add_argument("--path")
+    parser.add_argument("--write-samples")
+    args = parser.parse_args()
+
+    if args.write_samples:
+        _write_samples(args.write_samples)
+        return
+    if args.child:
+        _run_child(args.child, args.sample, args.path, args.repeat)
+        return
+
+    sample_dir = tempfile.TemporaryDirectory()
+    subprocess.run(
+        [sys.executable, __file__, "--write-samples", sample_dir.name],
+        check=True,
+    )
+    print(f"{'sample':<26} {'mode':>6} {'cpu ms/upload':>14} {'peak MB':>8}")
+    for sample in SAMPLES:
+        path = os.path.join(sample_dir.name, sample)
+        for mode in ("multi", "single"):
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--child",
+                    mode,
+                    "--sample",
+                    sample,
+                    "--path",
+                    path,
+                    "--repeat",
+                    str(args.repeat),
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.strip()
+            cpu_ms, peak_mb = output.splitlines()[-1].split()
+            print(f"{sample:<26} {mode:>6} {cpu_ms:>14} {'+' + peak_mb:>8}")
+    sample_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
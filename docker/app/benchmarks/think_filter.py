@@ -0,0 +1,239 @@
+"""
+Think Tag Filter Benchmark
+
+Replays reasoning-model transcripts through StreamingThinkTagFilter in
+token-sized chunks and reports the per-chunk overhead of the former
+implementation, which kept and re-scanned the whole open think block on
+every chunk, versus the current one. Before timing, every transcript is
+also replayed in several chunkings to check that both implementations
+return the same text for every chunk and on flush.
+
+Transcripts are synthesized with a fixed seed: think blocks of growing
+length, answers with markdown, code and stray "<" characters, several
+think blocks per response and an unclosed one. Recorded transcripts (raw
+model output as text files) can be added with --transcript.
+
+Usage (from docker/app):
+    python benchmarks/think_filter.py --repeat 3
+    python benchmarks/think_filter.py --transcript recorded/*.txt
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from utils.text_processing import StreamingThinkTagFilter  # noqa: E402
+
+_WORDS = (
+    "the model should check whether each step follows from the previous "
+    "one so let me reconsider the constraint and compute the value again "
+    "wait that is not right because x < y holds only when n > 0"
+).split()
+
+
+class LegacyStreamingThinkTagFilter:
+    """The former filter, kept to check output and compare timings"""
+
+    def __init__(self):
+        self.buffer = ""
+        self.in_think_tag = False
+
+    def process_chunk(self, chunk: str) -> str:
+        self.buffer += chunk
+        output = ""
+        i = 0
+
+        while i < len(self.buffer):
+            if self.in_think_tag:
+                close_index = self.buffer.find("</think>", i)
+                if close_index != -1:
+                    i = close_index + 8
+                    self.in_think_tag = False
+                else:
+                    break
+            else:
+                open_index = self.buffer.find("<think>", i)
+                if open_index != -1:
+                    output += self.buffer[i:open_index]
+                    i = open_index + 7
+                    self.in_think_tag = True
+                else:
+                    partial_tag_start = max(i, len(self.buffer) - 7)
+                    for j in range(partial_tag_start, len(self.buffer)):
+                        if (
+                            self.buffer[j:].startswith("<")
+                            or self.buffer[j:].startswith("<t")
+                            or self.buffer[j:].startswith("<th")
+                            or self.buffer[j:].startswith("<thi")
+                            or self.buffer[j:].startswith("<thin")
+                            or self.buffer[j:].startswith("<think")
+                        ):
+                            output += self.buffer[i:j]
+                            self.buffer = self.buffer[j:]
+                            return output
+
+                    output += self.buffer[i:]
+                    self.buffer = ""
+                    break
+
+        if i < len(self.buffer):
+            self.buffer = self.buffer[i:]
+        else:
+            self.buffer = ""
+
+        return output
+
+    def flush(self) -> str:
+        if self.in_think_tag:
+            return ""
+        output = self.buffer
+        self.buffer = ""
+        return output
+
+
+def _prose(rng: random.Random, length: int) -> str:
+    """Reasoning-like prose of about the given length"""
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(_WORDS)
+        if rng.random() < 0.08:
+            word += ".\n"
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)
+
+
+def _answer(rng: random.Random, length: int) -> str:
+    """Markdown answer with code, HTML-like text and tag look-alikes"""
+    parts = [
+        "## Answer\n\n",
+        _prose(rng, length // 3),
+        "\n\n```python\nif a < b and b <= c:\n    print('<th>')\n```\n\n",
+        "| col | <thin |\n|---|---|\n| 1 | <t |\n\n",
+        _prose(rng, length // 3),
+        " <b>bold</b> and <thinking> is not a tag, nor is <thi",
+    ]
+    return "".join(parts)
+
+
+def synthesize_transcripts(seed: int = 7) -> Dict[str, str]:
+    """Transcripts shaped like reasoning-model output"""
+    rng = random.Random(seed)
+    transcripts = {}
+    for think_len in (2_000, 20_000, 100_000):
+        transcripts[f"think_{think_len // 1000}k"] = (
+            f"<think>\n{_prose(rng, think_len)}\n</think>\n\n"
+            f"{_answer(rng, 3_000)}"
+        )
+    transcripts["multi_think"] = "".join(
+        f"<think>{_prose(rng, 4_000)}</think>\n{_answer(rng, 600)}\n"
+        for _ in range(8)
+    )
+    transcripts["unclosed_think"] = (
+        f"{_answer(rng, 500)}\n<think>{_prose(rng, 30_000)}"
+    )
+    return transcripts
+
+
+def chunk_transcript(
+    text: str, rng: random.Random, max_chunk: int
+) -> List[str]:
+    """Split text into chunks of 1 to max_chunk characters"""
+    chunks = []
+    i = 0
+    while i < len(text):
+        size = rng.randint(1, max_chunk)
+        chunks.append(text[i : i + size])
+        i += size
+    return chunks
+
+
+def _replay(filter_cls: Callable, chunks: List[str]) -> List[str]:
+    """Per-chunk outputs of a filter, with the flush output last"""
+    think_filter = filter_cls()
+    outputs = [think_filter.process_chunk(chunk) for chunk in chunks]
+    outputs.append(think_filter.flush())
+    return outputs
+
+
+def check_identical(transcripts: Dict[str, str], seed: int) -> None:
+    """Assert both filters return the same text for every chunk"""
+    rng = random.Random(seed)
+    for name, text in transcripts.items():
+        for max_chunk in (1, 3, 8, 64):
+            chunks = chunk_transcript(text, rng, max_chunk)
+            expected = _replay(LegacyStreamingThinkTagFilter, chunks)
+            actual = _replay(StreamingThinkTagFilter, chunks)
+            if expected != actual:
+                raise AssertionError(
+                    f"Output differs for {name} in chunks of up to"
+                    f" {max_chunk} characters"
+                )
+
+
+def _time_replay(
+    filter_cls: Callable, chunks: List[str], repeat: int
+) -> float:
+    """Best total replay time in seconds over several runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _replay(filter_cls, chunks)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--max-chunk",
+        type=int,
+        default=8,
+        help="Largest chunk in characters (about two tokens)",
+    )
+    parser.add_argument(
+        "--transcript",
+        nargs="*",
+        default=[],
+        help="Recorded raw model output files to replay as well",
+    )
+    args = parser.parse_args()
+
+    transcripts = synthesize_transcripts(args.seed)
+    for path in args.transcript:
+        with open(path, encoding="utf-8") as f:
+            transcripts[os.path.basename(path)] = f.read()
+
+    check_identical(transcripts, args.seed)
+    print("Per-chunk output identical for all transcripts and chunkings\n")
+
+    rng = random.Random(args.seed)
+    print(
+        f"{'transcript':<18} {'chars':>8} {'chunks':>7}"
+        f" {'former us/chunk':>16} {'current us/chunk':>17} {'speedup':>8}"
+    )
+    for name, text in transcripts.items():
+        chunks = chunk_transcript(text, rng, args.max_chunk)
+        former = _time_replay(
+            LegacyStreamingThinkTagFilter, chunks, args.repeat
+        )
+        current = _time_replay(StreamingThinkTagFilter, chunks, args.repeat)
+        print(
+            f"{name:<18} {len(text):>8} {len(chunks):>7}"
+            f" {former * 1e6 / len(chunks):>16.2f}"
+            f" {current * 1e6 / len(chunks):>17.2f}"
+            f" {former / current:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
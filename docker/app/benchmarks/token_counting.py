@@ -0,0 +1,295 @@
+"""
+Token Counting Benchmark
+
+Compares the former len(text) // 4 estimate and the heuristic token
+counter against a reference tokenizer on samples of prose and code taken
+from this repository, CJK text, base64 payloads and JSON tool results,
+reporting the mean absolute error and the bias of each. The reference is
+a tiktoken BPE file given with --tokenizer (a Llama 3 tokenizer.model or
+cl100k_base), and defaults to TOKENIZER_PATH; the accuracy table is
+skipped without one.
+
+It then reports the counting throughput of each counter, uncached and
+cached, and times LLMService._truncate_messages against the former
+implementation, which rebuilt the kept history with list.insert(0), on
+histories of growing length with message counts cached. Both
+implementations are checked to keep the same messages.
+
+Usage (from docker/app):
+    python benchmarks/token_counting.py --tokenizer /app/assets/tokenizer.model
+"""
+
+import argparse
+import base64
+import glob
+import json
+import os
+import random
+import re
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from services.llm_service import LLMService  # noqa: E402
+from utils import token_counter  # noqa: E402
+from utils.config import config  # noqa: E402
+from utils.token_counter import (  # noqa: E402
+    BPETokenCounter,
+    HeuristicTokenCounter,
+    TokenCounter,
+)
+
+_CJK_SENTENCES = (
+    "我们需要在下一个版本中修复这个问题，并更新相关的文档。",
+    "搜索结果显示，今天的天气晴朗，最高气温二十五度。",
+    "このファイルを開いて、設定を確認してください。",
+    "東京の明日の天気は雨のち曇りでしょう。",
+    "이 문서는 시스템의 구성 요소를 설명합니다.",
+    "검색 결과를 요약해서 알려 주세요.",
+)
+
+
+class _LengthCounter(TokenCounter):
+    """The former estimate of four characters per token"""
+
+    name = "len // 4"
+
+    def count(self, text: str) -> int:
+        return len(text) // 4
+
+
+def _repo_sources() -> List[str]:
+    """Python sources of the app"""
+    sources = []
+    for path in sorted(glob.glob(f"{APP_DIR}/**/*.py", recursive=True)):
+        with open(path, encoding="utf-8") as f:
+            sources.append(f.read())
+    return sources
+
+
+def _split(text: str, size: int) -> List[str]:
+    """Samples of about size characters, cut at line ends"""
+    samples = []
+    start = 0
+    while start < len(text):
+        end = text.find("\n", start + size)
+        end = len(text) if end == -1 else end + 1
+        samples.append(text[start:end])
+        start = end
+    return [sample for sample in samples if sample.strip()]
+
+
+def build_samples(rng: random.Random, size: int) -> Dict[str, List[str]]:
+    """Text samples by category"""
+    sources = _repo_sources()
+    prose = []
+    for source in sources:
+        prose += re.findall(r'"""(.*?)"""', source, re.DOTALL)
+        prose += [
+            line.strip()[2:]
+            for line in source.splitlines()
+            if line.strip().startswith("# ")
+        ]
+
+    cjk = "\n".join(
+        " ".join(rng.choices(_CJK_SENTENCES, k=rng.randint(1, 4)))
+        + rng.choice(("", " See `config.py` for details.", " (v2.1)"))
+        for _ in range(400)
+    )
+
+    payload = "\n".join(
+        "data:image/png;base64,"
+        + base64.b64encode(rng.randbytes(3000)).decode()
+        for _ in range(40)
+    )
+
+    words = "search result news weather price update release model".split()
+    results = {
+        "results": [
+            {
+                "title": " ".join(rng.choices(words, k=6)).capitalize(),
+                "url": f"https://example.com/{rng.randint(0, 10**9)}",
+                "score": round(rng.random(), 4),
+                "published": f"2025-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}",
+                "id": rng.randint(10**5, 10**9),
+            }
+            for _ in range(600)
+        ]
+    }
+
+    return {
+        "prose": _split("\n".join(prose), size),
+        "code": _split("\n".join(sources), size),
+        "cjk": _split(cjk, size),
+        "base64": _split(payload, size),
+        "json": _split(json.dumps(results, indent=2), size),
+    }
+
+
+def report_accuracy(
+    samples: Dict[str, List[str]],
+    reference: TokenCounter,
+    counters: List[TokenCounter],
+) -> None:
+    """Print the mean absolute error and bias of each counter"""
+    header = f"{'category':<9} {'samples':>8} {'chars/token':>12}"
+    for counter in counters:
+        header += f" {counter.name + ' err':>15} {'bias':>7}"
+    print(header)
+    for category, texts in samples.items():
+        expected = [reference.count(text) for text in texts]
+        chars_per_token = sum(map(len, texts)) / sum(expected)
+        row = f"{category:<9} {len(texts):>8} {chars_per_token:>12.2f}"
+        for counter in counters:
+            errors = [
+                (counter.count(text) - tokens) / tokens
+                for text, tokens in zip(texts, expected)
+                if tokens
+            ]
+            mean_abs = sum(map(abs, errors)) / len(errors)
+            bias = sum(errors) / len(errors)
+            row += f" {mean_abs:>14.1%} {bias:>+7.1%}"
+        print(row)
+
+
+def _best_time(fn: Callable[[], Any], repeat: int) -> float:
+    """Best time of a call in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report_throughput(
+    samples: Dict[str, List[str]], counters: List[TokenCounter], repeat: int
+) -> None:
+    """Print counting throughput over all samples"""
+    texts = [text for category in samples.values() for text in category]
+    megabytes = sum(len(text.encode("utf-8")) for text in texts) / 1e6
+    print(f"\n{'counter':<32} {'uncached MB/s':>14} {'cached MB/s':>12}")
+    for counter in counters:
+        uncached = _best_time(
+            lambda: [counter.count(text) for text in texts], repeat
+        )
+        for text in texts:
+            counter.count_cached(text)
+        cached = _best_time(
+            lambda: [counter.count_cached(text) for text in texts], repeat
+        )
+        print(
+            f"{counter.name:<32} {megabytes / uncached:>14.1f}"
+            f" {megabytes / cached:>12.1f}"
+        )
+
+
+def former_truncate_messages(
+    service: LLMService, messages: List[Dict[str, Any]], max_tokens: int
+) -> tuple:
+    """The former history selection, which inserted at the list front"""
+    system_messages = [msg for msg in messages if msg.get("role") == "system"]
+    non_system_messages = [
+        msg for msg in messages if msg.get("role") != "system"
+    ]
+    system_tokens = service._count_message_tokens(system_messages)
+    latest_user_idx = max(
+        i
+        for i, msg in enumerate(non_system_messages)
+        if msg.get("role") == "user"
+    )
+    latest_user_msg = non_system_messages[latest_user_idx]
+    latest_user_tokens = service._count_message_tokens([latest_user_msg])
+    available_tokens = max_tokens - system_tokens - latest_user_tokens - 4000
+
+    selected_messages = [latest_user_msg]
+    selected_tokens = latest_user_tokens
+    for i in range(len(non_system_messages) - 1, -1, -1):
+        if i == latest_user_idx:
+            continue
+        msg = non_system_messages[i]
+        msg_tokens = service._count_message_tokens([msg])
+        if selected_tokens + msg_tokens > available_tokens:
+            break
+        selected_messages.insert(0, msg)
+        selected_tokens += msg_tokens
+
+    was_truncated = len(selected_messages) < len(non_system_messages)
+    return system_messages + selected_messages, was_truncated
+
+
+def _history(rng: random.Random, turns: int) -> List[Dict[str, Any]]:
+    """Conversation of short user and longer assistant messages"""
+    words = "the result of the search is listed below with sources".split()
+    messages = [{"role": "system", "content": "You are a helpful assistant."}]
+    for turn in range(turns):
+        for role, length in (("user", 12), ("assistant", 60)):
+            content = " ".join(rng.choices(words, k=length))
+            messages.append({"role": role, "content": f"{turn} {content}"})
+    return messages
+
+
+def report_truncation(rng: random.Random, repeat: int) -> None:
+    """Print the time to select the history that fits the context"""
+    service = LLMService.__new__(LLMService)
+    print(
+        f"\n{'messages':>9} {'kept':>7} {'former ms':>10} {'current ms':>11}"
+    )
+    for turns in (500, 5_000, 50_000):
+        messages = _history(rng, turns)
+        # Message counts are cached in the app, so time the selection
+        # itself with every count cached
+        token_counter._token_counter = HeuristicTokenCounter(cache_size=None)
+        # Keep about half of the history
+        max_tokens = service._count_message_tokens(messages) // 2
+        expected = former_truncate_messages(service, messages, max_tokens)
+        actual = service._truncate_messages(messages, max_tokens)
+        if expected != actual:
+            raise AssertionError(f"Kept messages differ for {turns} turns")
+        former = _best_time(
+            lambda: former_truncate_messages(service, messages, max_tokens),
+            repeat,
+        )
+        current = _best_time(
+            lambda: service._truncate_messages(messages, max_tokens), repeat
+        )
+        print(
+            f"{len(messages):>9} {len(actual[0]):>7} {former * 1000:>10.2f}"
+            f" {current * 1000:>11.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--tokenizer",
+        default=config.llm.TOKENIZER_PATH,
+        help="Reference tiktoken BPE file",
+    )
+    parser.add_argument("--sample-chars", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    samples = build_samples(rng, args.sample_chars)
+    counters: List[TokenCounter] = [_LengthCounter(), HeuristicTokenCounter()]
+
+    reference: Optional[TokenCounter] = None
+    if os.path.isfile(args.tokenizer):
+        reference = BPETokenCounter(args.tokenizer)
+        report_accuracy(samples, reference, counters)
+    else:
+        print(f"No tokenizer at {args.tokenizer}, skipping accuracy")
+
+    report_throughput(
+        samples, counters + ([reference] if reference else []), args.repeat
+    )
+    report_truncation(rng, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Upload Peak RSS Benchmark
+
+Measures the extra peak memory of handling one PDF upload with the former
+in-memory path (read the whole upload, copy it to a temp file, hash the
+bytes) versus the streaming spool (copy and hash in chunks). Each run uses
+a fresh interpreter so peak RSS values do not leak between runs.
+
+Usage (from docker/app):
+    python benchmarks/upload_rss.py --size-mb 100
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (Linux reports KB)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _in_memory_upload(upload: io.BytesIO) -> str:
+    """The former path: full reads for the temp file and for the hash"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp:
+        temp.write(upload.read())
+    upload.seek(0)
+    digest = hashlib.sha256(upload.read()).hexdigest()
+    os.unlink(temp.name)
+    return digest
+
+
+def _streaming_upload(upload: io.BytesIO) -> str:
+    """The streaming path: one chunked pass that spools and hashes"""
+    from utils.upload_spool import spool_upload
+
+    with spool_upload(upload, filename="upload.pdf", suffix=".pdf") as spooled:
+        return spooled.sha256
+
+
+def _run_child(mode: str, size_mb: int) -> None:
+    """Run one upload and print the extra peak RSS in MB"""
+    # Imports and the in-memory upload itself count towards the baseline
+    import utils.upload_spool  # noqa: F401
+
+    # Written in chunks so the buffer is owned, like a received upload
+    upload = io.BytesIO()
+    for _ in range(size_mb):
+        upload.write(os.urandom(1024 * 1024))
+    upload.seek(0)
+    baseline = _peak_rss_mb()
+    handler = _in_memory_upload if mode == "in_memory" else _streaming_upload
+    handler(upload)
+    print(f"{_peak_rss_mb() - baseline:.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--size-mb", type=int, default=100)
+    parser.add_argument("--child", choices=["in_memory", "streaming"])
+    args = parser.parse_args()
+
+    if args.child:
+        _run_child(args.child, args.size_mb)
+        return
+
+    print(f"Upload size: {args.size_mb} MB")
+    for mode in ("in_memory", "streaming"):
+        output = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--child",
+                mode,
+                "--size-mb",
+                str(args.size_mb),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+        print(f"{mode:>10}: +{output.splitlines()[-1]} MB peak RSS")
+
+
+if __name__ == "__main__":
+    main()
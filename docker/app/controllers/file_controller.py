@@ -1,13 +1,15 @@
 import json
 import logging
 import os
-import tempfile
 from typing import Tuple
 
 import requests
 from models.chat_config import ChatConfig
 from utils.config import config
+from utils.exceptions import FileProcessingError
+from utils.pdf_id_generator import pdf_id_from_digest
 from utils.text_processing import TextProcessor
+from utils.upload_spool import SpooledUpload, spool_upload
 
 
 class FileController:
@@ -99,32 +101,41 @@ class FileController:
         """
         Process the PDF file using the external NVIngest service
 
+        The upload is spooled to disk once and hashed on the way; the
+        content digest sets the returned data's pdf_id so ingestion does not
+        hash the file again.
+
         Args:
-            uploaded_file: Streamlit uploaded file object
+            uploaded_file: Streamlit uploaded file object, or an already
+                spooled upload that the caller cleans up
 
         Returns:
             Tuple of (success: bool, result: dict)
         """
-        # Create temporary file with configured suffix
-        with tempfile.NamedTemporaryFile(
-            delete=False, suffix=config.file_processing.PDF_TEMP_FILE_SUFFIX
-        ) as temp_file:
-            temp_file.write(uploaded_file.read())
-            temp_file_path = temp_file.name
+        size_error = {
+            "error": (
+                "PDF file too large. Maximum size: "
+                f"{config.file_processing.MAX_PDF_SIZE // (1024*1024)}MB"
+            )
+        }
+
+        owns_spool = not isinstance(uploaded_file, SpooledUpload)
+        if owns_spool:
+            try:
+                spooled = spool_upload(
+                    uploaded_file,
+                    suffix=config.file_processing.PDF_TEMP_FILE_SUFFIX,
+                    max_bytes=config.file_processing.MAX_PDF_SIZE,
+                )
+            except FileProcessingError:
+                return False, size_error
+        else:
+            spooled = uploaded_file
 
         try:
             # Check file size limits
-            file_size = os.path.getsize(temp_file_path)
-            if file_size > config.file_processing.MAX_PDF_SIZE:
-                return (
-                    False,
-                    {
-                        "error": (
-                            "PDF file too large. Maximum size: "
-                            f"{config.file_processing.MAX_PDF_SIZE // (1024*1024)}MB"
-                        )
-                    },
-                )
+            if spooled.size_bytes > config.file_processing.MAX_PDF_SIZE:
+                return False, size_error
 
             # Make request to PDF processing server using configured
             # endpoint and timeout
@@ -137,7 +148,7 @@ class FileController:
                     )
                 }
 
-            with open(temp_file_path, "rb") as pdf_file:
+            with spooled.open() as pdf_file:
                 files = {"file": pdf_file}
 
                 # Use resilient request
@@ -172,6 +183,8 @@ class FileController:
                 total_chars,
             )
 
+            # Reuse the digest computed while spooling as content-based ID
+            pdf_data["pdf_id"] = pdf_id_from_digest(spooled.sha256)
             return True, pdf_data
 
         except requests.exceptions.Timeout:
@@ -199,10 +212,8 @@ class FileController:
             return False, {"error": f"PDF processing failed: {str(e)}"}
         finally:
             # Clean up temporary file
-            try:
-                os.unlink(temp_file_path)
-            except:
-                pass
+            if owns_spool:
+                spooled.cleanup()
 
     def _make_resilient_request(
         self, url: str, files: dict, base_timeout: int = None
@@ -1,15 +1,11 @@
-import base64
 import logging
-import os
-import tempfile
-from io import BytesIO
-from typing import Tuple
+from typing import Any, Tuple
 
 import streamlit as st
 from controllers.message_controller import MessageController
 from models.chat_config import ChatConfig
-from PIL import Image
 from utils.config import config
+from utils.image_upload import ProcessedImage, prepare_image_upload
 
 
 class ImageController:
@@ -70,15 +66,15 @@ class ImageController:
             # Always clear the processing marker when done
             self.clear_processing_file()
 
-    def _process_image_file(self, uploaded_file) -> Tuple[bool, dict]:
+    def _process_image_file(self, uploaded_file) -> Tuple[bool, Any]:
         """
-        Process the image file and convert to base64
+        Read, resize and hash the image file in a single pass
 
         Args:
             uploaded_file: Streamlit uploaded file object
 
         Returns:
-            Tuple of (success: bool, result: dict)
+            Tuple of (success: bool, result: ProcessedImage or error dict)
         """
         logging.info(
             "Starting to process image file: %s, type: %s",
@@ -86,19 +82,14 @@ class ImageController:
             uploaded_file.type,
         )
 
-        # Create temporary file with configured suffix
-        with tempfile.NamedTemporaryFile(
-            delete=False, suffix=f".{uploaded_file.type.split('/')[-1]}"
-        ) as temp_file:
-            temp_file.write(uploaded_file.read())
-            temp_file_path = temp_file.name
-
         try:
-            # Check file size limits
-            file_size = os.path.getsize(temp_file_path)
-            logging.debug("Original file size: %.2f KB", file_size / 1024)
+            # Check file size limits before touching the image data
+            image_bytes = uploaded_file.getvalue()
+            logging.debug(
+                "Original file size: %.2f KB", len(image_bytes) / 1024
+            )
 
-            if file_size > config.file_processing.MAX_IMAGE_SIZE:
+            if len(image_bytes) > config.file_processing.MAX_IMAGE_SIZE:
                 return (
                     False,
                     {
@@ -109,193 +100,51 @@ class ImageController:
                     },
                 )
 
-            # Open image with PIL for resizing
-            with Image.open(temp_file_path) as img:
-                original_width, original_height = img.size
-                max_dimension = 1024
-
-                logging.debug(
-                    "Original image dimensions: %sx%s",
-                    original_width,
-                    original_height,
-                )
-
-                # Check if resizing is needed
-                if (
-                    original_width > max_dimension
-                    or original_height > max_dimension
-                ):
-                    # Calculate scale factor to fit longest side within
-                    # max_dimension
-                    scale = max_dimension / max(
-                        original_width, original_height
-                    )
-
-                    # Calculate new dimensions
-                    new_width = int(original_width * scale)
-                    new_height = int(original_height * scale)
-
-                    logging.debug(
-                        "Image needs resizing. Scale factor: %.3f", scale
-                    )
-
-                    # Resize using high-quality Lanczos resampling
-                    resized_img = img.resize(
-                        (new_width, new_height), Image.Resampling.LANCZOS
-                    )
-
-                    logging.info(
-                        "Resized uploaded image '%s' from %sx%s to %sx%s",
-                        uploaded_file.name,
-                        original_width,
-                        original_height,
-                        new_width,
-                        new_height,
-                    )
-
-                    # Save resized image to bytes
-                    img_buffer = BytesIO()
-                    # Determine format from file type or default to PNG
-                    img_format = uploaded_file.type.split("/")[-1].upper()
-                    if img_format == "JPG":
-                        img_format = "JPEG"
-                    if img_format not in ["JPEG", "PNG", "GIF", "BMP"]:
-                        img_format = "PNG"
-
-                    logging.debug(
-                        "Saving resized image as format: %s", img_format
-                    )
-
-                    resized_img.save(
-                        img_buffer, format=img_format, optimize=True
-                    )
-                    img_buffer.seek(0)  # Reset buffer position to beginning
-                    image_bytes = img_buffer.getvalue()
-
-                    logging.debug(
-                        "Resized image size: %.2f KB", len(image_bytes) / 1024
-                    )
-                else:
-                    logging.debug(
-                        "Uploaded image '%s' already within size limit "
-                        "(%sx%s)",
-                        uploaded_file.name,
-                        original_width,
-                        original_height,
-                    )
-                    # Read original image bytes
-                    with open(temp_file_path, "rb") as image_file:
-                        image_bytes = image_file.read()
-
-                # Convert to base64
-                image_base64 = base64.b64encode(image_bytes).decode("utf-8")
-
-                # Verify the dimensions of the final image
-                from PIL import Image as PILImage
-
-                verify_img = PILImage.open(BytesIO(image_bytes))
-                verify_width, verify_height = verify_img.size
-                logging.debug(
-                    "Final image dimensions after processing: %sx%s",
-                    verify_width,
-                    verify_height,
-                )
-
-                # Update file size after potential resizing
-                file_size = len(image_bytes)
-
-                logging.info(
-                    "Processed image '%s': %.2f KB, %sx%s",
-                    uploaded_file.name,
-                    file_size / 1024,
-                    verify_width,
-                    verify_height,
-                )
-
-            # Get file type from uploaded file
-            file_type = (
-                uploaded_file.type if uploaded_file.type else "image/png"
+            processed = prepare_image_upload(
+                image_bytes,
+                uploaded_file.name,
+                uploaded_file.type if uploaded_file.type else "image/png",
             )
 
-            return (
-                True,
-                {
-                    "image_data": image_base64,
-                    "filename": uploaded_file.name,
-                    "file_type": file_type,
-                    "size_bytes": file_size,
-                },
+            logging.info(
+                "Processed image '%s': %.2f KB, %sx%s",
+                uploaded_file.name,
+                processed.size_bytes / 1024,
+                processed.width,
+                processed.height,
             )
+            return True, processed
 
         except Exception as e:
             error_msg = f"Failed to process image file: {str(e)}"
             logging.error("Image processing error: %s", e, exc_info=True)
             return False, {"error": error_msg}
 
-        finally:
-            # Clean up temporary file
-            try:
-                os.unlink(temp_file_path)
-                logging.debug("Cleaned up temporary file: %s", temp_file_path)
-            except OSError:
-                pass
-
-    def _handle_successful_processing(self, filename: str, image_data: dict):
+    def _handle_successful_processing(
+        self, filename: str, image: ProcessedImage
+    ):
         """
         Handle successful image processing
 
         Args:
             filename: Name of the processed file
-            image_data: Processed image data
+            image: Processed image ready for storage
         """
         try:
             # Store image in session controller
             if self.session_controller:
-                image_id = self.session_controller.store_uploaded_image(
-                    image_data["image_data"],
-                    image_data["filename"],
-                    image_data["file_type"],
-                )
-
-                # Get the stored image data to retrieve the file path
-                stored_image_data = (
-                    self.session_controller.get_latest_uploaded_image()
-                )
-                if stored_image_data and "file_path" in stored_image_data:
-                    # Add the file path to the image_data dict
-                    image_data["file_object"] = stored_image_data["file_path"]
-                    logging.info(
-                        "Added file path to image_data: %s",
-                        stored_image_data["file_path"],
-                    )
-                else:
-                    logging.warning(
-                        "Could not retrieve file path for stored image"
-                    )
+                image_id = self.session_controller.store_uploaded_image(image)
 
                 # Store the image data in session state for easy access
-                st.session_state.current_image_base64 = image_data[
-                    "image_data"
-                ]
+                st.session_state.current_image_base64 = image.base64
                 st.session_state.current_image_filename = filename
                 st.session_state.current_image_id = image_id
 
                 logging.debug(
                     "Stored image in session state - "
-                    "filename: %s, data length: %s",
+                    "filename: %s, size: %.2f KB",
                     filename,
-                    len(image_data["image_data"]),
-                )
-
-                # Verify the size of what we stored in session state
-                import base64 as b64
-
-                stored_bytes = b64.b64decode(
-                    st.session_state.current_image_base64
-                )
-                logging.debug(
-                    "Session state image size: %.2f KB",
-                    len(stored_bytes) / 1024,
+                    image.size_bytes / 1024,
                 )
 
                 # Add user notification message (without base64 data)
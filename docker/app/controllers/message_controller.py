@@ -1,12 +1,31 @@
 import logging
 import re
+from functools import lru_cache
 from typing import Any, Dict, List
 
 import streamlit as st
 from models.chat_config import ChatConfig
 from services import ChatService
+from utils.config import config
 from utils.text_processing import TextProcessor, strip_think_tags
 
+# Compile pattern once for performance
+_TOOLCALL_PATTERN = re.compile(
+    r'<TOOLCALL(?:[-"\s])*\[.*?\]</TOOLCALL>',
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+@lru_cache(maxsize=config.session.HISTORY_CLEAN_CACHE_SIZE)
+def _contains_tool_call_instructions(content: str) -> bool:
+    """Tool call check of a message, memoized by content"""
+    # Quick string check first - if no '<TOOLCALL' found, return early
+    if "<TOOLCALL" not in content.upper():
+        return False
+
+    # Only do regex if the quick check passes
+    return bool(_TOOLCALL_PATTERN.search(content))
+
 
 class MessageController:
     """Controller for handling message processing and validation"""
@@ -29,11 +48,6 @@ class MessageController:
         self.config_obj = config_obj
         self.chat_service = chat_service
         self.session_controller = session_controller
-        # Compile pattern once for performance
-        self._toolcall_pattern = re.compile(
-            r'<TOOLCALL(?:[-"\s])*\[.*?\]</TOOLCALL>',
-            re.DOTALL | re.IGNORECASE,
-        )
 
     def validate_prompt(self, prompt: str) -> tuple[bool, str]:
         """
@@ -57,7 +71,7 @@ class MessageController:
     def contains_tool_call_instructions(self, content: str) -> bool:
         """
         Check if content contains custom tool call instructions
-        (optimized for speed)
+        (memoized, so history messages are only scanned once)
 
         Args:
             content: The content to check
@@ -68,12 +82,7 @@ class MessageController:
         if not isinstance(content, str):
             return False
 
-        # Quick string check first - if no '<TOOLCALL' found, return early
-        if "<TOOLCALL" not in content.upper():
-            return False
-
-        # Only do regex if the quick check passes
-        return bool(self._toolcall_pattern.search(content))
+        return _contains_tool_call_instructions(content)
 
     def clean_chat_history_of_tool_calls(
         self, messages: List[Dict[str, Any]]
@@ -1,7 +1,7 @@
-import asyncio
 import json
 import logging
 import re
+from contextlib import closing
 from typing import Any, Dict, List
 
 import streamlit as st
@@ -10,9 +10,10 @@ from controllers.message_controller import MessageController
 from controllers.session_controller import SessionController
 from models.chat_config import ChatConfig
 from services import LLMService
-from ui import ChatHistoryComponent
+from ui import ChatHistoryComponent, IncrementalMarkdownRenderer
 from utils.animated_loading import get_animated_loading_html
 from utils.config import config
+from utils.event_loop import background_loop
 from utils.text_processing import (
     StreamingThinkTagFilter,
     sanitize_markdown_for_streamlit,
@@ -120,15 +121,13 @@ class ResponseController:
                 )
 
             try:
-                # Use asyncio.run for simpler async handling
-                full_response = asyncio.run(
-                    self._async_stream_response(
-                        prepared_messages,
-                        model_name,
-                        model_type,
-                        message_placeholder,
-                        response_chunks,
-                    )
+                # Stream on the shared background event loop
+                full_response = self._stream_response(
+                    prepared_messages,
+                    model_name,
+                    model_type,
+                    message_placeholder,
+                    response_chunks,
                 )
 
             except Exception as e:
@@ -170,7 +169,7 @@ class ResponseController:
         self._full_response = full_response
         self._response_chunks = response_chunks
 
-    async def _async_stream_response(
+    def _stream_response(
         self,
         prepared_messages: List[Dict[str, Any]],
         model_name: str,
@@ -179,7 +178,11 @@ class ResponseController:
         response_chunks: List[str],
     ) -> str:
         """
-        Async helper to stream response
+        Stream the response and display it as it arrives
+
+        The LLM stream runs on the background event loop while chunks are
+        rendered here, on the script thread. Stopping or rerunning the
+        script closes the stream, which cancels the request.
 
         Args:
             prepared_messages: Messages to send
@@ -192,9 +195,10 @@ class ResponseController:
             Full response text
         """
         full_response = ""
-        display_text = ""
+        has_display_text = False
         think_filter = StreamingThinkTagFilter()
         first_chunk_received = False
+        renderer = None
 
         # Progress tracking
         progress_bar = None
@@ -204,89 +208,93 @@ class ResponseController:
 
         try:
             # Stream response from LLM service with consistent model type
-            async for chunk in self.llm_service.generate_streaming_response(
-                prepared_messages, model_name, model_type
-            ):
-                response_chunks.append(chunk)
-                full_response += chunk
-
-                # Check for progress markers
-                progress_match = re.search(
-                    r"<<<PROGRESS:([0-9.]+):(.+?)>>>", chunk
+            stream = background_loop.stream(
+                self.llm_service.generate_streaming_response(
+                    prepared_messages, model_name, model_type
                 )
-                if progress_match:
-                    # Extract progress info
-                    progress_value = float(progress_match.group(1))
-                    progress_message = progress_match.group(2)
-
-                    # Initialize progress bar on first progress update
-                    if progress_bar is None and not first_chunk_received:
-                        # Clear the loading animation
-                        message_placeholder.empty()
-                        first_chunk_received = True
-
-                        # Create progress container
-                        progress_container = st.container()
-                        with progress_container:
-                            progress_text = st.empty()
-                            progress_bar = st.progress(0.0)
-
-                    # Update progress
-                    if progress_bar is not None:
-                        current_progress = progress_value
-                        progress_bar.progress(current_progress)
-                        progress_text.markdown(f"*{progress_message}*")
-
-                    # Remove progress marker from chunk before processing
-                    chunk = re.sub(r"<<<PROGRESS:[0-9.]+:.+?>>>", "", chunk)
-
-                # Process chunk through streaming filter
-                filtered_chunk = think_filter.process_chunk(chunk)
-                if filtered_chunk:
-                    display_text += filtered_chunk
-
-                    # Update UI with filtered response
-                    # Show content when we have actual text (not just progress)
-                    if display_text.strip():
-                        # Clear progress bar when actual content starts
-                        if progress_container is not None:
-                            progress_container.empty()
-                            progress_container = None
-                            progress_bar = None
-                            progress_text = None
-
-                        if not first_chunk_received:
-                            # Clear animation if needed
+            )
+            with closing(stream):
+                for chunk in stream:
+                    response_chunks.append(chunk)
+                    full_response += chunk
+
+                    # Check for progress markers
+                    progress_match = re.search(
+                        r"<<<PROGRESS:([0-9.]+):(.+?)>>>", chunk
+                    )
+                    if progress_match:
+                        # Extract progress info
+                        progress_value = float(progress_match.group(1))
+                        progress_message = progress_match.group(2)
+
+                        # Initialize progress bar on first progress update
+                        if progress_bar is None and not first_chunk_received:
+                            # Clear the loading animation
                             message_placeholder.empty()
                             first_chunk_received = True
 
-                        # Sanitize markdown for proper rendering
-                        sanitized_text = sanitize_markdown_for_streamlit(
-                            display_text
+                            # Create progress container
+                            progress_container = st.container()
+                            with progress_container:
+                                progress_text = st.empty()
+                                progress_bar = st.progress(0.0)
+
+                        # Update progress
+                        if progress_bar is not None:
+                            current_progress = progress_value
+                            progress_bar.progress(current_progress)
+                            progress_text.markdown(f"*{progress_message}*")
+
+                        # Remove progress marker from chunk before processing
+                        chunk = re.sub(
+                            r"<<<PROGRESS:[0-9.]+:.+?>>>", "", chunk
                         )
-                        message_placeholder.markdown(
-                            sanitized_text, unsafe_allow_html=True
+
+                    # Process chunk through streaming filter
+                    filtered_chunk = think_filter.process_chunk(chunk)
+                    if filtered_chunk:
+                        has_display_text = has_display_text or bool(
+                            filtered_chunk.strip()
                         )
 
-                # Small delay for visual effect
-                # await asyncio.sleep(0.01)
+                        # Update UI with filtered response
+                        # Show content when we have actual text
+                        # (not just progress)
+                        if has_display_text:
+                            # Clear progress bar when actual content starts
+                            if progress_container is not None:
+                                progress_container.empty()
+                                progress_container = None
+                                progress_bar = None
+                                progress_text = None
+
+                            if not first_chunk_received:
+                                # Clear animation if needed
+                                message_placeholder.empty()
+                                first_chunk_received = True
+
+                            # Render committed markdown blocks once and the
+                            # open block at the flush cadence
+                            if renderer is None:
+                                renderer = IncrementalMarkdownRenderer(
+                                    message_placeholder
+                                )
+                            renderer.append(filtered_chunk)
 
             # Process any remaining buffered content
             final_chunk = think_filter.flush()
-            if final_chunk:
-                display_text += final_chunk
 
             # Clear any remaining progress bar
             if progress_container is not None:
                 progress_container.empty()
 
             # Display final content
-            if display_text.strip():
-                # Sanitize markdown for proper rendering
-                sanitized_text = sanitize_markdown_for_streamlit(display_text)
-                message_placeholder.markdown(
-                    sanitized_text, unsafe_allow_html=True
-                )
+            if renderer is None and final_chunk and final_chunk.strip():
+                message_placeholder.empty()
+                renderer = IncrementalMarkdownRenderer(message_placeholder)
+            if renderer is not None:
+                renderer.append(final_chunk)
+                renderer.finish()
 
         except Exception as e:
             logging.error("Streaming error: %s", e)
@@ -410,7 +418,7 @@ class ResponseController:
         Args:
             image_response: Image response data
         """
-        from utils.image import base64_to_pil_image
+        from utils.image import decode_base64_image
 
         image_data = image_response["image_data"]
         enhanced_prompt = image_response.get(
@@ -418,8 +426,8 @@ class ResponseController:
         )
         original_prompt = image_response.get("original_prompt", "")
 
-        # Convert base64 to PIL Image for display
-        generated_image = base64_to_pil_image(image_data)
+        # Streamlit displays the encoded bytes, no PIL round trip needed
+        generated_image = decode_base64_image(image_data)
 
         if generated_image:
             # Display the generated image
@@ -827,7 +835,7 @@ class ResponseController:
             ui_elements: List of UI elements to display
             message_placeholder: Streamlit placeholder for the message
         """
-        from utils.image import base64_to_pil_image
+        from utils.image import decode_base64_image
 
         # First, display the full text response
         display_response = strip_think_tags(full_response)
@@ -841,8 +849,8 @@ class ResponseController:
             if element["type"] == "image":
                 image_data = element["data"]
                 if image_data["success"] and image_data["image_data"]:
-                    # Convert base64 to PIL Image
-                    generated_image = base64_to_pil_image(
+                    # Streamlit displays the encoded bytes as is
+                    generated_image = decode_base64_image(
                         image_data["image_data"]
                     )
                     if generated_image:
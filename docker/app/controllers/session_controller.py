@@ -17,6 +17,7 @@ from models import (
 from services.file_storage_service import FileStorageService
 from ui.view_helpers import view_factory
 from utils.config import config
+from utils.image_upload import ProcessedImage
 from utils.system_prompts import get_system_prompt
 
 
@@ -91,6 +92,7 @@ class SessionController:
 
             # Store models in session state
             self._store_session_state(session, user)
+            self.file_storage.mark_session_active(session_id)
 
             # Initialize UI state
             if not hasattr(st.session_state, "current_page"):
@@ -129,7 +131,9 @@ class SessionController:
 
         else:
             # Session already initialized, load existing models
-            return self.get_current_session()
+            session = self.get_current_session()
+            self.file_storage.mark_session_active(session.session_id)
+            return session
 
     def _get_or_create_session_id(self) -> str:
         """Get existing session ID or create new one"""
@@ -623,9 +627,15 @@ class SessionController:
         logging.info("Stored PDF document '%s' with ID '%s'", filename, pdf_id)
         return pdf_id
 
-    def get_latest_pdf_document(self) -> Optional[Dict[str, Any]]:
+    def get_latest_pdf_document(
+        self, include_pages: bool = True
+    ) -> Optional[Dict[str, Any]]:
         """Get the most recently uploaded PDF document
 
+        Args:
+            include_pages: Whether to load the page text; without it only
+                the stored metadata (filename, total_pages, ...) is read
+
         Returns:
             PDF data dictionary or None
         """
@@ -650,6 +660,8 @@ class SessionController:
                     "pages": [],
                 }
 
+        if not include_pages:
+            return self.file_storage.get_pdf_metadata(latest_pdf_id)
         return self.file_storage.get_pdf(latest_pdf_id)
 
     def clear_pdf_documents(self) -> None:
@@ -671,15 +683,11 @@ class SessionController:
             and len(st.session_state.stored_pdfs) > 0
         )
 
-    def store_uploaded_image(
-        self, image_data: str, filename: str, file_type: str
-    ) -> str:
+    def store_uploaded_image(self, image: ProcessedImage) -> str:
         """Store user-uploaded image
 
         Args:
-            image_data: Base64 encoded image data
-            filename: Original filename
-            file_type: Image file type
+            image: Processed upload from the image controller
 
         Returns:
             Image ID for retrieval
@@ -687,7 +695,7 @@ class SessionController:
         session = self.get_current_session()
 
         image_id = self.file_storage.store_uploaded_image(
-            image_data, filename, file_type, session.session_id
+            image, session.session_id
         )
 
         if "stored_images" not in st.session_state:
@@ -705,11 +713,11 @@ class SessionController:
                 -config.session.MAX_IMAGES_IN_SESSION :
             ]
 
-            for image_id in removed:
-                logging.info("Removing old image: %s", image_id)
+            for removed_id in removed:
+                logging.info("Removing old image: %s", removed_id)
 
         logging.info(
-            "Stored uploaded image '%s' with ID '%s'", filename, image_id
+            "Stored uploaded image '%s' with ID '%s'", image.filename, image_id
         )
         return image_id
 
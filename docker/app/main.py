@@ -13,6 +13,7 @@ from controllers.response_controller import ResponseController
 from controllers.session_controller import SessionController
 from models import ChatConfig
 from services import ChatService, ImageService, LLMService
+from services.pdf_ingestion_worker import pdf_ingestion_worker
 
 # PDFContextService replaced by SimplePDFContextService
 from tools.initialize_tools import initialize_all_tools
@@ -20,7 +21,12 @@ from ui import ChatHistoryComponent
 from utils.animated_loading import get_galaxy_animation_html
 from utils.config import config
 from utils.exceptions import ChatbotException, ConfigurationError
-from utils.pdf_upload_handler import get_active_pdf_info, handle_pdf_upload
+from utils.pdf_upload_handler import (
+    activate_pdf,
+    get_active_pdf_info,
+    handle_pdf_upload,
+    submit_pdf_upload,
+)
 from yaml.loader import SafeLoader
 
 
@@ -191,10 +197,14 @@ class ProductionStreamlitChatApp:
             return  # Exit early if no analysis in progress
 
         progress_info = st.session_state.pdf_analysis_progress
+        if progress_info.get("job_id"):
+            progress_info = self._poll_pdf_ingestion_job(progress_info)
 
         if progress_info.get("status") in ["starting", "analyzing"]:
             st.info("🔍 **Intelligent PDF Analysis in Progress**")
             message = progress_info.get("message", "Processing...")
+            if progress_info.get("job_id"):
+                st.progress(progress_info.get("progress", 0.0), text=message)
             # Only log when status changes to reduce log noise
             if not hasattr(
                 st.session_state, "_last_pdf_analysis_status"
@@ -218,6 +228,60 @@ class ProductionStreamlitChatApp:
                     del st.session_state._last_pdf_analysis_status
                 del st.session_state.analysis_completion_shown
 
+    def _poll_pdf_ingestion_job(self, progress_info: dict) -> dict:
+        """
+        Mirror a background ingestion job into session state
+
+        Activates the PDF as soon as its first chunks are indexed so it can
+        be queried while the rest of the document is still being indexed.
+
+        Args:
+            progress_info: Current pdf_analysis_progress with a job_id
+
+        Returns:
+            Updated progress info
+        """
+        job = pdf_ingestion_worker.get_job(progress_info["job_id"])
+        if not job:
+            progress_info = {"status": "completed", "message": "Done"}
+            st.session_state.pdf_analysis_progress = progress_info
+            return progress_info
+
+        filename = job["filename"]
+        progress_info = {
+            **progress_info,
+            "status": "analyzing",
+            "progress": job["progress"],
+            "message": f"{filename}: {job['message']}",
+        }
+
+        if (
+            job["pdf_id"]
+            and job["indexed_chunks"]
+            and not progress_info.get("activated")
+        ):
+            activate_pdf(job["pdf_id"], filename, {})
+            progress_info["activated"] = True
+
+        if job["status"] == "completed":
+            result = job["result"]
+            activate_pdf(result["pdf_id"], filename, result)
+            self.file_controller.mark_file_as_processed(filename)
+            st.session_state.pdf_processing_status = "completed"
+            st.session_state.pdf_processing_message = (
+                f"✅ Successfully processed PDF: {filename}"
+            )
+            progress_info["status"] = "completed"
+        elif job["status"] == "error":
+            st.session_state.pdf_processing_status = "error"
+            st.session_state.pdf_processing_message = (
+                f"❌ PDF processing error: {job['error']}"
+            )
+            progress_info = None
+
+        st.session_state.pdf_analysis_progress = progress_info
+        return progress_info or {}
+
     @st.fragment(run_every=1)
     def pdf_processing_fragment(self):
         """
@@ -235,8 +299,15 @@ class ProductionStreamlitChatApp:
 
         if processing_status == "processing":
             # Show processing status
-            getattr(st.session_state, "pdf_processing_file", "Unknown")
-            getattr(st.session_state, "pdf_processing_start_time", time.time())
+            filename = getattr(
+                st.session_state, "pdf_processing_file", "Unknown"
+            )
+            progress_info = (
+                getattr(st.session_state, "pdf_analysis_progress", None) or {}
+            )
+            st.info(f"⏳ Processing {filename}...")
+            if progress_info.get("job_id"):
+                st.caption(progress_info.get("message", ""))
 
         elif processing_status == "completed":
             # Show completion message
@@ -309,6 +380,17 @@ class ProductionStreamlitChatApp:
                     st.session_state.pdf_processing_start_time = time.time()
                     st.session_state.pdf_processing_file = uploaded_file.name
 
+                    if config.file_processing.PDF_BACKGROUND_INGESTION:
+                        # Ingest in the background; progress is polled by
+                        # pdf_analysis_progress_fragment
+                        job_id = submit_pdf_upload(uploaded_file)
+                        st.session_state.pdf_analysis_progress = {
+                            "status": "starting",
+                            "job_id": job_id,
+                            "message": f"{uploaded_file.name}: Queued",
+                        }
+                        st.rerun()
+
                     # Process PDF synchronously with spinner
                     with st.spinner(f"Processing {uploaded_file.name}..."):
                         try:
@@ -361,7 +443,9 @@ class ProductionStreamlitChatApp:
 
             # Show current PDF status if available
             if self.session_controller.has_pdf_documents():
-                latest_pdf = self.session_controller.get_latest_pdf_document()
+                latest_pdf = self.session_controller.get_latest_pdf_document(
+                    include_pages=False
+                )
                 logging.debug("Latest PDF: %s", latest_pdf)
                 if latest_pdf:
                     filename = latest_pdf.get("filename", "Unknown")
@@ -558,7 +642,11 @@ class ProductionStreamlitChatApp:
                                     "Failed to check image dimensions: %s", e
                                 )
 
-                    st.image(latest_image["file_path"])
+                    file_storage = self.session_controller.file_storage
+                    thumbnail = file_storage.get_image_derivative(
+                        latest_image["image_id"], "thumbnail"
+                    )
+                    st.image(thumbnail or latest_image["file_path"])
 
                     if st.button(
                         "🗑️ Remove Current Image",
@@ -1,8 +1,10 @@
 import logging
+from functools import lru_cache
 from typing import Any, Dict, List
 
 from models.chat_config import ChatConfig
 from models.chat_message import ChatMessage
+from utils.config import config
 from utils.split_context import (
     END_CONTEXT,
     START_CONTEXT,
@@ -11,6 +13,29 @@ from utils.split_context import (
 from utils.text_processing import strip_think_tags
 
 
+@lru_cache(maxsize=config.session.HISTORY_CLEAN_CACHE_SIZE)
+def clean_history_content(content: str) -> str:
+    """
+    Remove context markers and thinking tags from a message, memoized by
+    content
+
+    History messages never change once stored, and session state keeps the
+    same string objects across reruns, so each message is cleaned once and
+    later turns only pay for a cache lookup.
+
+    Args:
+        content: Text content of a history message
+
+    Returns:
+        Content without context information and thinking tags
+    """
+    # First remove context markers
+    cleaned_content = extract_context_regex(content)
+
+    # Then remove any thinking tags that might be present
+    return strip_think_tags(cleaned_content)
+
+
 class ChatService:
     """Service for handling chat processing operations"""
 
@@ -53,14 +78,13 @@ class ChatService:
 
                 # Only clean string content
                 if isinstance(message["content"], str):
-                    # First remove context markers
-                    cleaned_content = extract_context_regex(message["content"])
-
-                    # Then remove any thinking tags that might be present
-                    cleaned_content = strip_think_tags(cleaned_content)
-
                     cleaned_messages.append(
-                        {"role": message["role"], "content": cleaned_content}
+                        {
+                            "role": message["role"],
+                            "content": clean_history_content(
+                                message["content"]
+                            ),
+                        }
                     )
                 else:
                     cleaned_messages.append(message)
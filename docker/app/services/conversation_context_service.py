@@ -4,9 +4,17 @@ Conversation Context Service
 This service handles automatic injection of conversation context
 into LLM messages to ensure the model always has access to recent
 conversation history up to the configured maximum turns.
+
+Summaries are maintained incrementally per session: the service remembers
+the last summary and which messages it covered, and on each turn only the
+new messages are folded into the running summary.
 """
 
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
 from models.chat_config import ChatConfig
@@ -15,6 +23,26 @@ from utils.config import config
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class ConversationSummaryState:
+    """Rolling summary state tracked for a single session"""
+
+    summary: str
+    # Fingerprints of every conversation message covered by the summary
+    covered_hashes: List[str] = field(default_factory=list)
+
+    @property
+    def covered_count(self) -> int:
+        """Number of conversation messages folded into the summary"""
+        return len(self.covered_hashes)
+
+
+# Summary state is kept at module level so it survives Streamlit reruns,
+# which recreate the service objects on every script execution
+_summary_states: "OrderedDict[str, ConversationSummaryState]" = OrderedDict()
+_summary_states_lock = threading.Lock()
+
+
 class ConversationContextService:
     """Service for automatically injecting conversation context"""
 
@@ -28,6 +56,121 @@ class ConversationContextService:
         self.config = config_obj
         self._context_cache = {}
 
+    @staticmethod
+    def get_session_key() -> str:
+        """Get the key used to scope rolling summary state"""
+        from services.session_state import get_session_id
+
+        return get_session_id() or "default"
+
+    @staticmethod
+    def _message_fingerprint(message: Dict[str, Any]) -> str:
+        """Create a stable fingerprint for a conversation message"""
+        content = message.get("content", "")
+        if not isinstance(content, str):
+            content = repr(content)
+        digest = hashlib.sha1(
+            f"{message.get('role', '')}\x00{content}".encode("utf-8")
+        )
+        return digest.hexdigest()[:16]
+
+    def _get_summary_state(
+        self, session_key: str
+    ) -> Optional[ConversationSummaryState]:
+        """Get the rolling summary state for a session"""
+        with _summary_states_lock:
+            state = _summary_states.get(session_key)
+            if state is not None:
+                _summary_states.move_to_end(session_key)
+            return state
+
+    def _set_summary_state(
+        self, session_key: str, state: ConversationSummaryState
+    ) -> None:
+        """Store the rolling summary state for a session"""
+        with _summary_states_lock:
+            _summary_states[session_key] = state
+            _summary_states.move_to_end(session_key)
+            while len(_summary_states) > config.llm.SUMMARY_MAX_SESSIONS:
+                _summary_states.popitem(last=False)
+
+    def clear_summary_state(self, session_key: Optional[str] = None) -> None:
+        """
+        Forget the rolling summary for a session
+
+        Args:
+            session_key: Session to clear (defaults to the current session)
+        """
+        with _summary_states_lock:
+            _summary_states.pop(session_key or self.get_session_key(), None)
+
+    def _find_new_messages(
+        self,
+        state: ConversationSummaryState,
+        conversation_messages: List[Dict[str, Any]],
+        hashes: List[str],
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Locate messages that are not yet covered by the rolling summary
+
+        The message list may have been shifted by the sliding window, so the
+        last covered message is searched for from the end and the overlap
+        with the covered history is verified.
+
+        Args:
+            state: Current rolling summary state
+            conversation_messages: Conversation messages for this turn
+            hashes: Fingerprints of conversation_messages
+
+        Returns:
+            Messages after the covered history, or None if the history no
+            longer lines up with the summary and it must be rebuilt
+        """
+        if not state.covered_hashes:
+            return None
+
+        last_covered = state.covered_hashes[-1]
+        for idx in range(len(hashes) - 1, -1, -1):
+            if hashes[idx] != last_covered:
+                continue
+            overlap = hashes[: idx + 1]
+            if len(overlap) > state.covered_count:
+                continue
+            if state.covered_hashes[-len(overlap) :] == overlap:
+                return conversation_messages[idx + 1 :]
+        return None
+
+    def _has_substantive_content(
+        self, new_messages: List[Dict[str, Any]]
+    ) -> bool:
+        """
+        Check whether new messages add anything worth summarizing
+
+        User acknowledgments and very short assistant messages do not change
+        the running summary, so the cached summary can be reused for them.
+        Any other user message counts, however short, since it may answer a
+        clarifying question.
+
+        Args:
+            new_messages: Messages not yet covered by the summary
+
+        Returns:
+            True if the summary should be updated
+        """
+        from tools.tool_descriptions import is_acknowledgment
+
+        for msg in new_messages:
+            content = msg.get("content", "")
+            if not isinstance(content, str):
+                return True
+            text = content.strip()
+            if msg.get("role") == "user":
+                if text and not is_acknowledgment(text):
+                    return True
+            elif len(text) >= config.llm.SUMMARY_MIN_NEW_CHARS:
+                return True
+        return False
+
     def should_inject_context(self, messages: List[Dict[str, Any]]) -> bool:
         """
         Determine if conversation context should be injected
@@ -55,8 +198,36 @@ class ConversationContextService:
         # Inject context if we have at least the minimum required turns
         return num_turns >= config.llm.MIN_TURNS_FOR_CONTEXT_INJECTION
 
+    def _has_context_message(self, messages: List[Dict[str, Any]]) -> bool:
+        """Check if conversation context has already been injected"""
+        return self.get_context_message(messages) is not None
+
+    @staticmethod
+    def get_context_message(messages: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        Get the injected conversation context from messages
+
+        Args:
+            messages: Conversation messages
+
+        Returns:
+            Content of the conversation context system message, if present
+        """
+        for msg in messages:
+            content = msg.get("content", "")
+            if (
+                msg.get("role") == "system"
+                and isinstance(content, str)
+                and "## Conversation Context" in content
+            ):
+                return content
+        return None
+
     def inject_conversation_context(
-        self, messages: List[Dict[str, Any]], user_message: str
+        self,
+        messages: List[Dict[str, Any]],
+        user_message: str,
+        session_key: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
         Inject conversation context into messages for LLM processing
@@ -64,6 +235,8 @@ class ConversationContextService:
         Args:
             messages: Current conversation messages
             user_message: The user's current query
+            session_key: Session owning the rolling summary. Must be passed
+                when called outside the Streamlit script thread.
 
         Returns:
             Messages with conversation context injected
@@ -77,28 +250,75 @@ class ConversationContextService:
             return messages
 
         # Check if context has already been injected (avoid duplicates)
-        for msg in messages:
-            if msg.get(
-                "role"
-            ) == "system" and "## Conversation Context" in msg.get(
-                "content", ""
-            ):
-                logger.debug(
-                    "Conversation context already present, skipping injection"
-                )
-                return messages
+        if self._has_context_message(messages):
+            logger.debug(
+                "Conversation context already present, skipping injection"
+            )
+            return messages
 
         logger.info("Injecting conversation context for LLM invocation")
 
         # Get the conversation context
         context_summary = self._get_conversation_summary(
-            messages, user_message
+            messages, user_message, session_key
         )
 
         if not context_summary:
             logger.warning("Failed to generate conversation context")
             return messages
 
+        enhanced_messages = self._insert_context_message(
+            messages, context_summary
+        )
+
+        logger.info(
+            "Injected conversation context summary "
+            f"({len(context_summary)} chars)"
+        )
+        return enhanced_messages
+
+    def inject_cached_conversation_context(
+        self, messages: List[Dict[str, Any]], session_key: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Inject the session's last rolling summary without calling the LLM
+
+        The cached summary may lag the conversation by the latest turns.
+        It is used for speculative work that runs while the up-to-date
+        summary is being generated.
+
+        Args:
+            messages: Current conversation messages
+            session_key: Session owning the rolling summary
+
+        Returns:
+            Messages with the cached context injected, or the original
+            messages if no summary is cached
+        """
+        if not self.should_inject_context(messages):
+            return messages
+        if self._has_context_message(messages):
+            return messages
+
+        state = self._get_summary_state(session_key)
+        if state is None or not state.summary:
+            return messages
+
+        return self._insert_context_message(messages, state.summary)
+
+    def _insert_context_message(
+        self, messages: List[Dict[str, Any]], context_summary: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Insert a conversation context system message after system messages
+
+        Args:
+            messages: Current conversation messages
+            context_summary: Conversation summary to inject
+
+        Returns:
+            New message list with the context system message
+        """
         # Create system message with conversation context
         context_system_message = self._create_context_system_message(
             context_summary, len(messages)
@@ -120,72 +340,150 @@ class ConversationContextService:
             if msg.get("role") != "system":
                 enhanced_messages.append(msg)
 
-        logger.info(
-            "Injected conversation context summary "
-            f"({len(context_summary)} chars)"
-        )
         return enhanced_messages
 
     def _get_conversation_summary(
-        self, messages: List[Dict[str, Any]], user_message: str
+        self,
+        messages: List[Dict[str, Any]],
+        user_message: str,
+        session_key: Optional[str] = None,
     ) -> Optional[str]:
         """
-        Generate a conversation summary using the conversation context tool
+        Get the conversation summary, updating the session's rolling summary
+
+        Only messages added since the last summary are sent to the
+        conversation context tool. When nothing substantive was added, the
+        cached summary is reused without an LLM call.
 
         Args:
             messages: Conversation messages
             user_message: Current user message
+            session_key: Session owning the rolling summary (defaults to
+                the current session)
 
         Returns:
             Conversation summary or None if failed
         """
         try:
-            # Prepare messages for context analysis (limit to max turns)
-            max_turns = config.llm.SLIDING_WINDOW_MAX_TURNS
-
             # Filter conversation messages (exclude system/tool messages)
             conversation_messages = [
                 msg
                 for msg in messages
                 if msg.get("role") not in ["system", "tool"]
             ]
+            if not conversation_messages:
+                return None
 
-            # Apply max turns limit (convert turns to messages: 1 turn = 2
-            # messages)
-            max_messages = max_turns * 2
-            if len(conversation_messages) > max_messages:
-                limited_messages = conversation_messages[-max_messages:]
-            else:
-                limited_messages = conversation_messages
-
-            # Use the conversation context tool to analyze
-            params = {
-                "query": "conversation_summary",
-                "max_messages": len(limited_messages),
-                "messages": limited_messages,
-                "include_document_content": False,  # We handle documents
-                # separately
-                "but_why": (
-                    "An integer from 1-5 where a larger number indicates "
-                    "confidence this is the right tool to help the user."
-                ),
-            }
+            hashes = [
+                self._message_fingerprint(msg) for msg in conversation_messages
+            ]
+
+            if not config.llm.INCREMENTAL_CONVERSATION_SUMMARY:
+                return self._summarize_messages(conversation_messages)
 
-            # Execute the context analysis using the tool registry
-            from tools.registry import execute_tool
+            session_key = session_key or self.get_session_key()
+            state = self._get_summary_state(session_key)
 
-            response = execute_tool("conversation_context", params)
+            new_messages = (
+                self._find_new_messages(state, conversation_messages, hashes)
+                if state is not None
+                else None
+            )
 
-            if response and response.success:
-                return response.analysis
+            if new_messages is None:
+                # No usable summary for this history - build one from scratch
+                logger.debug(
+                    "Building conversation summary from"
+                    f" {len(conversation_messages)} messages"
+                )
+                summary = self._summarize_messages(conversation_messages)
+            elif not new_messages:
+                logger.debug("No new messages - reusing conversation summary")
+                return state.summary
+            elif not self._has_substantive_content(new_messages):
+                # Leave them uncovered so the next fold still includes them
+                logger.debug(
+                    f"{len(new_messages)} new message(s) add nothing"
+                    " substantive - reusing conversation summary"
+                )
+                return state.summary
             else:
-                logger.warning("Context analysis failed")
+                logger.debug(
+                    f"Folding {len(new_messages)} new message(s) into"
+                    " conversation summary"
+                )
+                summary = self._summarize_messages(
+                    new_messages, previous_summary=state.summary
+                )
+
+            if not summary:
+                # Fall back to the previous summary only if it still
+                # describes this conversation
+                if state is not None and new_messages is not None:
+                    return state.summary
                 return None
 
+            # Keep fingerprints bounded to the messages the window can hold
+            max_tracked = config.llm.SLIDING_WINDOW_MAX_TURNS * 2 * 4
+            self._set_summary_state(
+                session_key,
+                ConversationSummaryState(
+                    summary=summary, covered_hashes=hashes[-max_tracked:]
+                ),
+            )
+            return summary
+
         except Exception as e:
             logger.error(f"Error generating conversation context: {e}")
             return None
 
+    def _summarize_messages(
+        self,
+        conversation_messages: List[Dict[str, Any]],
+        previous_summary: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Summarize messages using the conversation context tool
+
+        Args:
+            conversation_messages: Messages to summarize (no system/tool
+                messages)
+            previous_summary: Running summary to fold the messages into
+
+        Returns:
+            Conversation summary or None if failed
+        """
+        # Apply max turns limit (convert turns to messages: 1 turn = 2
+        # messages)
+        max_messages = config.llm.SLIDING_WINDOW_MAX_TURNS * 2
+        limited_messages = conversation_messages[-max_messages:]
+
+        # Use the conversation context tool to analyze
+        params = {
+            "query": "conversation_summary",
+            "max_messages": len(limited_messages),
+            "messages": limited_messages,
+            "include_document_content": False,  # We handle documents
+            # separately
+            "but_why": (
+                "An integer from 1-5 where a larger number indicates "
+                "confidence this is the right tool to help the user."
+            ),
+        }
+        if previous_summary:
+            params["previous_summary"] = previous_summary
+
+        # Execute the context analysis using the tool registry
+        from tools.registry import execute_tool
+
+        response = execute_tool("conversation_context", params)
+
+        if response and response.success:
+            return response.analysis
+
+        logger.warning("Context analysis failed")
+        return None
+
     def _create_context_system_message(
         self, context_summary: str, total_messages: int
     ) -> Dict[str, str]:
@@ -13,6 +13,7 @@ from models.chat_config import ChatConfig
 from services.llm_client_service import llm_client_service
 from utils.batch_processor import DocumentProcessor
 from utils.config import config as app_config
+from utils.token_counter import get_token_counter
 
 logger = logging.getLogger(__name__)
 
@@ -52,9 +53,7 @@ class DocumentAnalyzerService:
         """
         try:
             # Check if the document is too large for direct processing
-            estimated_tokens = (
-                len(document_text) // 4
-            )  # Rough token estimation
+            estimated_tokens = get_token_counter().count(document_text)
             max_tokens = (
                 126000  # Conservative limit to stay well under model limits
             )
@@ -148,7 +147,7 @@ class DocumentAnalyzerService:
 
         try:
             # Check if the document is too large
-            estimated_tokens = len(document_text) // 4
+            estimated_tokens = get_token_counter().count(document_text)
             max_tokens = 50000  # Conservative limit for analysis
 
             if estimated_tokens > max_tokens:
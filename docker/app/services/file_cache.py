@@ -0,0 +1,123 @@
+"""
+File Cache
+
+Byte-budgeted in-memory LRU cache in front of FileStorageService reads.
+Stored images and PDFs are addressed by content-hash IDs, so a cached entry
+stays valid until the file is deleted or rewritten, at which point the
+storage service invalidates it. Chat history reruns then read images from
+memory instead of re-reading and re-encoding them from disk.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class FileCache:
+    """Thread-safe LRU cache bounded by the total size of its values"""
+
+    def __init__(self, max_bytes: int):
+        """
+        Initialize the cache
+
+        Args:
+            max_bytes: Memory budget for cached values; 0 disables caching
+        """
+        self.max_bytes = max(0, max_bytes)
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self.evictions = 0
+
+    def get(self, kind: str, file_id: str) -> Optional[Any]:
+        """
+        Look up a cached value
+
+        Args:
+            kind: Kind of value, e.g. "image" or "pdf"
+            file_id: Image or PDF reference ID
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        key = f"{kind}:{file_id}"
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses[kind] = self._misses.get(kind, 0) + 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits[kind] = self._hits.get(kind, 0) + 1
+            return entry[0]
+
+    def put(self, kind: str, file_id: str, value: Any, size: int) -> None:
+        """
+        Cache a value, evicting least recently used entries to fit
+
+        Values larger than the whole budget are not cached.
+
+        Args:
+            kind: Kind of value, e.g. "image" or "pdf"
+            file_id: Image or PDF reference ID
+            value: Value to cache; callers must not mutate it afterwards
+            size: Approximate memory size of the value in bytes
+        """
+        if size > self.max_bytes:
+            return
+
+        key = f"{kind}:{file_id}"
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._entries[key] = (value, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, file_id: str) -> None:
+        """Drop every cached value of a file"""
+        with self._lock:
+            for key in [
+                key for key in self._entries if key.split(":", 1)[1] == file_id
+            ]:
+                self._size -= self._entries.pop(key)[1]
+
+    def clear(self) -> None:
+        """Drop all cached values"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with entry count, bytes used, evictions and hits,
+            misses and hit ratio per kind of value
+        """
+        with self._lock:
+            by_kind = {}
+            for kind in set(self._hits) | set(self._misses):
+                hits = self._hits.get(kind, 0)
+                misses = self._misses.get(kind, 0)
+                by_kind[kind] = {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_ratio": hits / (hits + misses),
+                }
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "by_kind": by_kind,
+            }
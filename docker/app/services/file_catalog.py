@@ -0,0 +1,455 @@
+"""
+File Catalog
+
+Indexed SQLite catalog of the files kept by FileStorageService. Each stored
+image or PDF has one row with its type, size and access times, and triggers
+keep a running total of stored bytes so limit checks and per-session cleanup
+are indexed queries instead of scans over every JSON metadata file. Files
+are content-addressed, so one file can be used by several sessions; every
+session that stored a file is linked to it. The database runs in WAL mode so
+the app and API processes can share it.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    file_id TEXT PRIMARY KEY,
+    file_type TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL DEFAULT 0,
+    file_path TEXT,
+    metadata_path TEXT,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_files_session ON files (session_id, file_type);
+CREATE INDEX IF NOT EXISTS idx_files_last_access ON files (last_access);
+
+CREATE TABLE IF NOT EXISTS file_sessions (
+    file_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    PRIMARY KEY (file_id, session_id)
+);
+CREATE INDEX IF NOT EXISTS idx_file_sessions_session
+ON file_sessions (session_id);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    last_seen REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS catalog_state (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO catalog_state (key, value) VALUES ('total_size', 0);
+
+CREATE TRIGGER IF NOT EXISTS files_size_insert AFTER INSERT ON files
+BEGIN
+    UPDATE catalog_state SET value = value + NEW.size_bytes
+    WHERE key = 'total_size';
+END;
+CREATE TRIGGER IF NOT EXISTS files_size_update
+AFTER UPDATE OF size_bytes ON files
+BEGIN
+    UPDATE catalog_state SET value = value + NEW.size_bytes - OLD.size_bytes
+    WHERE key = 'total_size';
+END;
+CREATE TRIGGER IF NOT EXISTS files_size_delete AFTER DELETE ON files
+BEGIN
+    UPDATE catalog_state SET value = value - OLD.size_bytes
+    WHERE key = 'total_size';
+END;
+CREATE TRIGGER IF NOT EXISTS files_sessions_delete AFTER DELETE ON files
+BEGIN
+    DELETE FROM file_sessions WHERE file_id = OLD.file_id;
+END;
+"""
+
+# Files with a session seen after a cutoff (bound as the last parameter)
+_USED_BY_LIVE_SESSION = """
+EXISTS (
+    SELECT 1 FROM file_sessions
+    JOIN sessions ON sessions.session_id = file_sessions.session_id
+    WHERE file_sessions.file_id = files.file_id
+      AND sessions.last_seen >= ?
+)
+"""
+
+
+class FileCatalog:
+    """Thread-safe SQLite index of stored files"""
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize the catalog, creating the database if needed
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_path), check_same_thread=False, timeout=30
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock, self._conn:
+            links_exist = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table'"
+                " AND name = 'file_sessions'"
+            ).fetchone()
+            self._conn.executescript(_SCHEMA)
+            if not links_exist:
+                # Catalogs created before files could be shared link each
+                # file to the session recorded on it
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO file_sessions (file_id, session_id)"
+                    " SELECT file_id, session_id FROM files"
+                )
+            columns = {
+                row["name"]
+                for row in self._conn.execute("PRAGMA table_info(files)")
+            }
+            if "pinned" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE files ADD COLUMN pinned INTEGER NOT NULL"
+                    " DEFAULT 0"
+                )
+
+    def add_file(
+        self,
+        file_id: str,
+        file_type: str,
+        session_id: str,
+        size_bytes: int,
+        file_path: Optional[str] = None,
+        metadata_path: Optional[str] = None,
+        created_at: Optional[float] = None,
+    ) -> None:
+        """
+        Record a stored file, updating it if it is already catalogued
+
+        The session is linked to the file in addition to the sessions that
+        stored it before.
+
+        Args:
+            file_id: Image or PDF reference ID
+            file_type: "image" or "pdf"
+            session_id: Session that stored the file
+            size_bytes: Size on disk
+            file_path: Path of the stored file
+            metadata_path: Path of its JSON metadata
+            created_at: Creation time, defaults to now
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO files (
+                    file_id, file_type, session_id, size_bytes, file_path,
+                    metadata_path, created_at, last_access
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(file_id) DO UPDATE SET
+                    size_bytes = excluded.size_bytes,
+                    file_path = excluded.file_path,
+                    metadata_path = excluded.metadata_path,
+                    last_access = excluded.last_access
+                """,
+                (
+                    file_id,
+                    file_type,
+                    session_id,
+                    size_bytes,
+                    file_path,
+                    metadata_path,
+                    created_at or now,
+                    now,
+                ),
+            )
+            self._conn.execute(
+                "INSERT OR IGNORE INTO file_sessions (file_id, session_id)"
+                " VALUES (?, ?)",
+                (file_id, session_id),
+            )
+
+    def update_size(self, file_id: str, size_bytes: int) -> None:
+        """Update the recorded size of a file"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE files SET size_bytes = ? WHERE file_id = ?",
+                (size_bytes, file_id),
+            )
+
+    def touch(self, file_id: str) -> None:
+        """Record an access to a file"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE files SET last_access = ? WHERE file_id = ?",
+                (time.time(), file_id),
+            )
+
+    def get_file(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """Get the catalog entry of a file"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM files WHERE file_id = ?", (file_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def remove_file(self, file_id: str) -> None:
+        """Remove a file from the catalog"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM files WHERE file_id = ?", (file_id,)
+            )
+
+    def get_session_files(self, session_id: str) -> List[Dict[str, Any]]:
+        """Get the catalog entries of all files stored by a session"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT files.* FROM files JOIN file_sessions USING (file_id)"
+                " WHERE file_sessions.session_id = ?",
+                (session_id,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def release_session_files(self, session_id: str) -> List[Dict[str, Any]]:
+        """
+        Unlink a session from its files
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            Catalog entries of the files no other session uses anymore
+        """
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                """
+                SELECT files.* FROM files JOIN file_sessions USING (file_id)
+                WHERE file_sessions.session_id = ?
+                  AND NOT EXISTS (
+                      SELECT 1 FROM file_sessions AS other
+                      WHERE other.file_id = files.file_id
+                        AND other.session_id != ?
+                  )
+                """,
+                (session_id, session_id),
+            ).fetchall()
+            self._conn.execute(
+                "DELETE FROM file_sessions WHERE session_id = ?",
+                (session_id,),
+            )
+        return [dict(row) for row in rows]
+
+    def get_session_usage(
+        self, session_id: str, file_type: str
+    ) -> Tuple[int, int]:
+        """
+        Get the number and total size of a session's files of one type
+
+        Returns:
+            Tuple of (count, size in bytes)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0)"
+                " FROM files JOIN file_sessions USING (file_id)"
+                " WHERE file_sessions.session_id = ? AND file_type = ?",
+                (session_id, file_type),
+            ).fetchone()
+        return row[0], row[1]
+
+    def get_total_size(self) -> int:
+        """Get the running total size of all catalogued files"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM catalog_state WHERE key = 'total_size'"
+            ).fetchone()
+        return row[0] if row else 0
+
+    def set_pinned(self, file_id: str, pinned: bool) -> None:
+        """Pin a file so eviction never removes it, or unpin it"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE files SET pinned = ? WHERE file_id = ?",
+                (int(pinned), file_id),
+            )
+
+    def mark_session_active(self, session_id: str) -> None:
+        """Record that a session is live; the files it uses are pinned"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO sessions (session_id, last_seen) VALUES (?, ?)
+                ON CONFLICT(session_id) DO UPDATE SET
+                    last_seen = excluded.last_seen
+                """,
+                (session_id, time.time()),
+            )
+
+    def find_expired(
+        self, accessed_before: float, live_since: float, limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Find unpinned files not accessed since a cutoff
+
+        Args:
+            accessed_before: Files last accessed before this time qualify
+            live_since: Sessions seen after this time pin the files they use
+            limit: Maximum number of files to return
+
+        Returns:
+            Catalog entries, least recently accessed first
+        """
+        return self._find_evictable(
+            "last_access < ?", (accessed_before,), live_since, limit
+        )
+
+    def find_least_recent(
+        self, live_since: float, limit: int
+    ) -> List[Dict[str, Any]]:
+        """Find the least recently accessed unpinned files"""
+        return self._find_evictable("1", (), live_since, limit)
+
+    def find_session_least_recent(
+        self, session_id: str, live_since: float, limit: int
+    ) -> List[Dict[str, Any]]:
+        """Find the least recently accessed unpinned files of a session"""
+        return self._find_evictable(
+            "file_id IN (SELECT file_id FROM file_sessions"
+            " WHERE session_id = ?)",
+            (session_id,),
+            live_since,
+            limit,
+        )
+
+    def _find_evictable(
+        self,
+        condition: str,
+        params: Tuple[Any, ...],
+        live_since: float,
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """Query unpinned files no live session uses, LRU first"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT * FROM files
+                WHERE {condition} AND pinned = 0
+                  AND NOT {_USED_BY_LIVE_SESSION}
+                ORDER BY last_access LIMIT ?
+                """,
+                (*params, live_since, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_sessions_over_quota(
+        self, quota_bytes: int
+    ) -> List[Tuple[str, int]]:
+        """
+        Find sessions whose stored files exceed a size quota
+
+        Returns:
+            List of (session_id, size in bytes), largest first
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT file_sessions.session_id, SUM(size_bytes) AS size"
+                " FROM files JOIN file_sessions USING (file_id)"
+                " GROUP BY file_sessions.session_id HAVING size > ?"
+                " ORDER BY size DESC",
+                (quota_bytes,),
+            ).fetchall()
+        return [(row[0], row[1]) for row in rows]
+
+    def prune_sessions(self, seen_before: float) -> None:
+        """Forget sessions not seen since a cutoff"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM sessions WHERE last_seen < ?", (seen_before,)
+            )
+
+    def import_json_metadata(self, metadata_dir: Path) -> int:
+        """
+        Import existing JSON metadata files into the catalog (one-shot)
+
+        Runs only once per catalog; later calls return immediately. Files
+        already in the catalog are left unchanged.
+
+        Args:
+            metadata_dir: Directory holding the *.json metadata files
+
+        Returns:
+            Number of files imported
+        """
+        with self._lock:
+            done = self._conn.execute(
+                "SELECT value FROM catalog_state WHERE key = 'json_imported'"
+            ).fetchone()
+        if done:
+            return 0
+
+        rows = []
+        for metadata_path in Path(metadata_dir).glob("*.json"):
+            try:
+                metadata = json.loads(metadata_path.read_text())
+            except (json.JSONDecodeError, IOError) as e:
+                logger.debug(f"Skipping metadata file {metadata_path}: {e}")
+                continue
+
+            if "image_id" in metadata:
+                file_id, file_type = metadata["image_id"], "image"
+            elif "pdf_id" in metadata:
+                file_id, file_type = metadata["pdf_id"], "pdf"
+            else:
+                continue
+
+            created_at = metadata_path.stat().st_mtime
+            rows.append(
+                (
+                    file_id,
+                    file_type,
+                    metadata.get("session_id", ""),
+                    metadata.get("size_bytes", 0),
+                    metadata.get("file_path"),
+                    str(metadata_path),
+                    created_at,
+                    created_at,
+                )
+            )
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT OR IGNORE INTO files (
+                    file_id, file_type, session_id, size_bytes, file_path,
+                    metadata_path, created_at, last_access
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO file_sessions (file_id, session_id)"
+                " VALUES (?, ?)",
+                [(row[0], row[2]) for row in rows],
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO catalog_state (key, value)"
+                " VALUES ('json_imported', 1)"
+            )
+
+        if rows:
+            logger.info(f"Imported {len(rows)} metadata files into catalog")
+        return len(rows)
@@ -6,14 +6,30 @@ keeping only references in session state to avoid memory issues.
 """
 
 import base64
-import hashlib
 import json
 import logging
+import os
+import time
+import uuid
 from pathlib import Path
-from typing import Any, Dict, Optional
-
+from typing import Any, Dict, List, Optional
+
+from services.file_cache import FileCache
+from services.file_catalog import FileCatalog
+from services.paged_pdf_store import (
+    PAGED_PDF_SUFFIX,
+    read_paged_pdf,
+    read_paged_pdf_metadata,
+    read_paged_pdf_pages,
+    write_paged_pdf,
+)
+from services.storage_eviction import StorageEvictionEngine
 from utils.config import config
 from utils.exceptions import FileProcessingError, MemoryLimitError
+from utils.executor_pool import shared_executor_pool
+from utils.image_derivatives import DERIVATIVE_PRESETS, render_derivative
+from utils.image_upload import ProcessedImage
+from utils.upload_spool import hash_text
 
 logger = logging.getLogger(__name__)
 
@@ -43,17 +59,32 @@ class FileStorageService:
 
         self.storage_path = Path(storage_path)
         self._ensure_storage_dirs()
+        self.catalog = FileCatalog(self.storage_path / "catalog.db")
+        self.catalog.import_json_metadata(self.metadata_dir)
+        self._session_heartbeats: Dict[str, float] = {}
+        self._last_touch: Dict[str, float] = {}
+
+        # Recently read files are served from memory
+        self.cache = FileCache(config.storage.HOT_CACHE_MAX_BYTES)
+
+        # Evict stored files in the background, off the upload path
+        self.eviction = StorageEvictionEngine(self.catalog, self._delete_file)
+        if config.storage.EVICTION_ENABLED:
+            self.eviction.start()
+
         self._initialized = True
 
     def _ensure_storage_dirs(self):
         """Ensure storage directories exist"""
         try:
             self.images_dir = self.storage_path / "images"
+            self.derivatives_dir = self.images_dir / "derivatives"
             self.pdfs_dir = self.storage_path / "pdfs"
             self.metadata_dir = self.storage_path / "metadata"
 
             for dir_path in [
                 self.images_dir,
+                self.derivatives_dir,
                 self.pdfs_dir,
                 self.metadata_dir,
             ]:
@@ -86,8 +117,8 @@ class FileStorageService:
             Image reference ID
         """
         try:
-            # Generate unique ID based on content hash
-            image_hash = hashlib.md5(image_data.encode()).hexdigest()[:12]
+            # Generate unique ID based on content hash, hashed in chunks
+            image_hash = hash_text(image_data)[:12]
             image_id = f"{config.session.IMAGE_ID_PREFIX}{image_hash}"
 
             # Check storage limits
@@ -111,6 +142,11 @@ class FileStorageService:
 
             metadata_path = self.metadata_dir / f"{image_id}.json"
             metadata_path.write_text(json.dumps(metadata, indent=2))
+            self._catalog_file(
+                image_id, "image", session_id, image_path, metadata_path
+            )
+            self.cache.invalidate(image_id)
+            self._schedule_derivatives(image_id, image_path)
 
             logger.info(f"Stored image {image_id} for session {session_id}")
             return image_id
@@ -130,52 +166,200 @@ class FileStorageService:
             Dict with image data and metadata, or None if not found
         """
         try:
-            # Load metadata
-            metadata_path = self.metadata_dir / f"{image_id}.json"
-            if not metadata_path.exists():
+            entry = self._load_image(image_id)
+            if not entry:
                 return None
+            return {**entry["metadata"], "image_data": entry["base64"]}
 
-            metadata = json.loads(metadata_path.read_text())
+        except Exception as e:
+            logger.error(f"Failed to retrieve image {image_id}: {e}")
+            return None
 
-            # Load image data
-            image_path = Path(metadata["file_path"])
-            if image_path.exists():
-                image_bytes = image_path.read_bytes()
-                metadata["image_data"] = base64.b64encode(image_bytes).decode()
-            else:
-                logger.warning(f"Image file not found: {image_path}")
-                return None
+    def get_image_bytes(self, image_id: str) -> Optional[bytes]:
+        """
+        Retrieve the raw bytes of an image without base64 encoding
 
-            return metadata
+        Args:
+            image_id: Image reference ID
+
+        Returns:
+            Image file content, or None if not found
+        """
+        try:
+            entry = self._load_image(image_id)
+            return entry["raw"] if entry else None
 
         except Exception as e:
             logger.error(f"Failed to retrieve image {image_id}: {e}")
             return None
 
+    def _load_image(self, image_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load an image through the hot cache
+
+        Returns:
+            Dict with the image metadata, raw bytes and base64 form, or None
+            if not found
+        """
+        entry = self.cache.get("image", image_id)
+        if entry:
+            self._record_access(image_id)
+            return entry
+
+        # Load metadata
+        metadata_path = self.metadata_dir / f"{image_id}.json"
+        if not metadata_path.exists():
+            return None
+
+        metadata = json.loads(metadata_path.read_text())
+
+        # Load image data
+        image_path = Path(metadata["file_path"])
+        if not image_path.exists():
+            logger.warning(f"Image file not found: {image_path}")
+            return None
+
+        image_bytes = image_path.read_bytes()
+        image_base64 = base64.b64encode(image_bytes).decode()
+        entry = {
+            "metadata": metadata,
+            "raw": image_bytes,
+            "base64": image_base64,
+        }
+        self.cache.put(
+            "image", image_id, entry, len(image_bytes) + len(image_base64)
+        )
+        self._record_access(image_id)
+        return entry
+
+    def get_image_derivative(
+        self, image_id: str, preset: str
+    ) -> Optional[bytes]:
+        """
+        Retrieve a resized derivative of a stored image
+
+        Derivatives are rendered in the background when the image is
+        stored; one that is still missing is rendered and persisted now.
+
+        Args:
+            image_id: Image reference ID
+            preset: Derivative preset name ("thumbnail", "display" or "vlm")
+
+        Returns:
+            Encoded derivative image, or None if the image is not found
+        """
+        try:
+            derivative = self.cache.get(preset, image_id)
+            if derivative:
+                self._record_access(image_id)
+                return derivative
+
+            derivative_path = self._derivative_path(image_id, preset)
+            if derivative_path.exists():
+                derivative = derivative_path.read_bytes()
+            else:
+                original = self.get_image_bytes(image_id)
+                if original is None:
+                    return None
+                derivative = self._write_derivative(
+                    derivative_path, original, preset
+                )
+                self._update_image_size(image_id)
+
+            self.cache.put(preset, image_id, derivative, len(derivative))
+            self._record_access(image_id)
+            return derivative
+
+        except Exception as e:
+            logger.error(
+                f"Failed to retrieve {preset} derivative of {image_id}: {e}"
+            )
+            return None
+
+    def _derivative_path(self, image_id: str, preset: str) -> Path:
+        """Path of an image derivative, keyed by image ID and preset"""
+        extension = DERIVATIVE_PRESETS[preset].extension
+        return self.derivatives_dir / f"{image_id}.{preset}{extension}"
+
+    def _schedule_derivatives(self, image_id: str, image_path: Path):
+        """Render missing derivatives of a stored image in the background"""
+        if all(
+            self._derivative_path(image_id, preset).exists()
+            for preset in DERIVATIVE_PRESETS
+        ):
+            return
+        shared_executor_pool.submit(
+            self._generate_derivatives, image_id, image_path
+        )
+
+    def _generate_derivatives(self, image_id: str, image_path: Path):
+        """Render and persist all derivatives of an image"""
+        try:
+            original = image_path.read_bytes()
+            for preset in DERIVATIVE_PRESETS:
+                derivative_path = self._derivative_path(image_id, preset)
+                if not derivative_path.exists():
+                    self._write_derivative(derivative_path, original, preset)
+            self._update_image_size(image_id)
+            logger.debug(f"Generated derivatives of image {image_id}")
+        except Exception as e:
+            logger.warning(
+                f"Failed to generate derivatives of image {image_id}: {e}"
+            )
+
+    @staticmethod
+    def _write_derivative(
+        derivative_path: Path, original: bytes, preset: str
+    ) -> bytes:
+        """Render a derivative and move it into place atomically"""
+        derivative = render_derivative(original, preset)
+        tmp_path = derivative_path.with_name(
+            f"{derivative_path.name}.{uuid.uuid4().hex}.tmp"
+        )
+        tmp_path.write_bytes(derivative)
+        os.replace(tmp_path, derivative_path)
+        return derivative
+
+    def _update_image_size(self, image_id: str):
+        """Record an image's size on disk including its derivatives"""
+        entry = self.catalog.get_file(image_id)
+        if not entry or not entry.get("file_path"):
+            return
+        image_path = Path(entry["file_path"])
+        if not image_path.exists():
+            return
+        size_bytes = image_path.stat().st_size + sum(
+            path.stat().st_size
+            for path in self.derivatives_dir.glob(f"{image_id}.*")
+        )
+        self.catalog.update_size(image_id, size_bytes)
+
     def store_uploaded_image(
-        self, image_data: str, filename: str, file_type: str, session_id: str
+        self, image: ProcessedImage, session_id: str
     ) -> str:
         """
         Store uploaded image externally and return reference ID
 
+        The upload has already been resized and hashed by the image
+        controller, so its bytes are written as is.
+
         Args:
-            image_data: Base64 encoded image data
-            filename: Original image filename
-            file_type: MIME type of the image
+            image: Processed upload
             session_id: Session identifier
 
         Returns:
             Image reference ID
         """
         try:
+            filename = image.filename
+            file_type = image.file_type
             logger.debug(
                 f"Storing uploaded image: {filename}, type: {file_type},"
-                f" base64 length: {len(image_data)}"
+                f" size: {image.size_bytes} bytes"
             )
 
-            # Generate unique ID based on content hash
-            image_hash = hashlib.md5(image_data.encode()).hexdigest()[:12]
-            image_id = f"uploaded_img_{image_hash}"
+            # Content-based ID from the digest computed during processing
+            image_id = f"uploaded_img_{image.sha256[:12]}"
 
             # Check storage limits
             self._check_storage_limits(session_id, "images")
@@ -194,12 +378,11 @@ class FileStorageService:
 
             # Save image file
             image_path = self.images_dir / f"{image_id}{extension}"
+            size_bytes = image.size_bytes
             if not image_path.exists():
-                image_bytes = base64.b64decode(image_data)
-                image_path.write_bytes(image_bytes)
+                image_path.write_bytes(image.image_bytes)
                 logger.debug(
-                    f"Saved image file: {image_path}, size:"
-                    f" {len(image_bytes)} bytes"
+                    f"Saved image file: {image_path}, size: {size_bytes} bytes"
                 )
 
             # Save metadata
@@ -209,14 +392,17 @@ class FileStorageService:
                 "file_type": file_type,
                 "session_id": session_id,
                 "file_path": str(image_path),
-                "size_bytes": len(
-                    base64.b64decode(image_data)
-                ),  # Use actual bytes size, not base64 size
+                "size_bytes": size_bytes,  # Actual bytes, not base64 size
                 "upload_type": "user_uploaded",
             }
 
             metadata_path = self.metadata_dir / f"{image_id}.json"
             metadata_path.write_text(json.dumps(metadata, indent=2))
+            self._catalog_file(
+                image_id, "image", session_id, image_path, metadata_path
+            )
+            self.cache.invalidate(image_id)
+            self._schedule_derivatives(image_id, image_path)
 
             logger.info(
                 f"Stored uploaded image {image_id} ({filename}), size:"
@@ -239,23 +425,10 @@ class FileStorageService:
             Dict with image data and metadata, or None if not found
         """
         try:
-            # Load metadata
-            metadata_path = self.metadata_dir / f"{image_id}.json"
-            if not metadata_path.exists():
+            entry = self._load_image(image_id)
+            if not entry:
                 return None
-
-            metadata = json.loads(metadata_path.read_text())
-
-            # Load image data
-            image_path = Path(metadata["file_path"])
-            if image_path.exists():
-                image_bytes = image_path.read_bytes()
-                metadata["image_data"] = base64.b64encode(image_bytes).decode()
-            else:
-                logger.warning(f"Uploaded image file not found: {image_path}")
-                return None
-
-            return metadata
+            return {**entry["metadata"], "image_data": entry["base64"]}
 
         except Exception as e:
             logger.error(f"Failed to retrieve uploaded image {image_id}: {e}")
@@ -284,14 +457,15 @@ class FileStorageService:
             # Check storage limits
             self._check_storage_limits(session_id, "pdfs")
 
-            # Save PDF data
-            pdf_path = self.pdfs_dir / f"{pdf_id}.json"
+            # Save PDF data in the paged binary format
+            pdf_path = self._pdf_path(pdf_id)
             logger.debug(f"Storing PDF at: {pdf_path}")
-            pdf_path.write_text(json.dumps(pdf_data, indent=2))
-            logger.debug(
-                f"PDF stored successfully at: {pdf_path}, exists:"
-                f" {pdf_path.exists()}"
-            )
+            pages = pdf_data.get("pages", [])
+            metadata = {
+                key: value for key, value in pdf_data.items() if key != "pages"
+            }
+            metadata["filename"] = filename
+            size_bytes = write_paged_pdf(pdf_path, metadata, pages)
 
             # Save metadata
             metadata = {
@@ -299,12 +473,16 @@ class FileStorageService:
                 "filename": filename,
                 "session_id": session_id,
                 "file_path": str(pdf_path),
-                "total_pages": len(pdf_data.get("pages", [])),
-                "size_bytes": len(json.dumps(pdf_data)),
+                "total_pages": len(pages),
+                "size_bytes": size_bytes,
             }
 
             metadata_path = self.metadata_dir / f"{pdf_id}_meta.json"
             metadata_path.write_text(json.dumps(metadata, indent=2))
+            self._catalog_file(
+                pdf_id, "pdf", session_id, pdf_path, metadata_path
+            )
+            self.cache.invalidate(pdf_id)
 
             logger.info(f"Stored PDF {pdf_id} for session {session_id}")
             return pdf_id
@@ -315,7 +493,10 @@ class FileStorageService:
 
     def get_pdf(self, pdf_id: str) -> Optional[Dict[str, Any]]:
         """
-        Retrieve PDF data
+        Retrieve PDF data with all pages
+
+        Callers needing only the filename or a few pages should use
+        get_pdf_metadata or get_pdf_pages instead.
 
         Args:
             pdf_id: PDF reference ID
@@ -324,51 +505,25 @@ class FileStorageService:
             PDF data or None if not found
         """
         try:
-            pdf_path = self.pdfs_dir / f"{pdf_id}.json"
-            logger.debug(f"Looking for PDF at: {pdf_path}")
-            if not pdf_path.exists():
-                logger.warning(f"PDF file not found: {pdf_path}")
-                # List available PDFs for debugging
-                available_pdfs = list(self.pdfs_dir.glob("*.json"))
-                logger.debug(
-                    "Available PDFs in storage:"
-                    f" {[p.name for p in available_pdfs]}"
-                )
+            pdf_data = self.cache.get("pdf", pdf_id)
+            if pdf_data:
+                self._record_access(pdf_id)
+                # Copy so callers can modify the result freely
+                return {**pdf_data, "pages": list(pdf_data["pages"])}
+
+            pdf_path = self._find_pdf(pdf_id)
+            if not pdf_path:
                 return None
 
-            pdf_data = json.loads(pdf_path.read_text())
-
-            # Load metadata and merge filename into pdf_data
-            metadata_path = self.metadata_dir / f"{pdf_id}_meta.json"
-            if metadata_path.exists():
-                metadata = json.loads(metadata_path.read_text())
-                # Add filename from metadata to pdf_data
-                filename = metadata.get("filename", "")
-                if not filename:
-                    # If no filename in metadata, try to derive from PDF data or use a default
-                    filename = pdf_data.get("filename", f"{pdf_id}.pdf")
-                    logger.warning(
-                        f"No filename in metadata for {pdf_id}, using:"
-                        f" {filename}"
-                    )
-
-                pdf_data["filename"] = filename
-                # Add total_pages from metadata to pdf_data
-                total_pages = metadata.get("total_pages", 0)
-                pdf_data["total_pages"] = total_pages
-                # Optionally add other metadata fields if needed
-                pdf_data["pdf_id"] = metadata.get("pdf_id", pdf_id)
-            else:
-                # If no metadata, ensure we still have a filename
-                if "filename" not in pdf_data or not pdf_data["filename"]:
-                    pdf_data["filename"] = f"{pdf_id}.pdf"
-                    logger.warning(
-                        f"No metadata found for {pdf_id}, using filename:"
-                        f" {pdf_data['filename']}"
-                    )
-                pdf_data["pdf_id"] = pdf_id
-                # Calculate total_pages from pages if metadata not available
-                pdf_data["total_pages"] = len(pdf_data.get("pages", []))
+            pdf_data = read_paged_pdf(pdf_path)
+            self._record_access(pdf_id)
+            self._fill_pdf_metadata(pdf_id, pdf_data)
+            self.cache.put(
+                "pdf",
+                pdf_id,
+                {**pdf_data, "pages": list(pdf_data["pages"])},
+                self._estimate_pdf_size(pdf_data),
+            )
 
             logger.debug(
                 f"Retrieved PDF {pdf_id} with filename:"
@@ -380,6 +535,75 @@ class FileStorageService:
             logger.error(f"Failed to retrieve PDF {pdf_id}: {e}")
             return None
 
+    def get_pdf_metadata(self, pdf_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve PDF metadata without loading any page
+
+        Args:
+            pdf_id: PDF reference ID
+
+        Returns:
+            PDF fields other than the pages (pdf_id, filename, total_pages,
+            char_count, ...) or None if not found
+        """
+        try:
+            pdf_path = self._find_pdf(pdf_id)
+            if not pdf_path:
+                return None
+
+            metadata = read_paged_pdf_metadata(pdf_path)
+            self._record_access(pdf_id)
+            return self._fill_pdf_metadata(pdf_id, metadata)
+
+        except Exception as e:
+            logger.error(f"Failed to retrieve PDF metadata {pdf_id}: {e}")
+            return None
+
+    def get_pdf_page(
+        self, pdf_id: str, page_number: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve a single PDF page
+
+        Args:
+            pdf_id: PDF reference ID
+            page_number: 1-based position of the page in the document
+
+        Returns:
+            Page dictionary or None if not found
+        """
+        pages = self.get_pdf_pages(pdf_id, range(page_number, page_number + 1))
+        return pages[0] if pages else None
+
+    def get_pdf_pages(
+        self, pdf_id: str, page_numbers: range
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve a range of PDF pages, reading only those pages
+
+        Args:
+            pdf_id: PDF reference ID
+            page_numbers: 1-based page positions, e.g. range(1, 11) for the
+                first ten pages; positions past the end are skipped
+
+        Returns:
+            Page dictionaries, empty if the PDF is not found
+        """
+        try:
+            pdf_path = self._find_pdf(pdf_id)
+            if not pdf_path:
+                return []
+
+            pages = read_paged_pdf_pages(
+                pdf_path, (number - 1 for number in page_numbers)
+            )
+            self._record_access(pdf_id)
+            return pages
+
+        except Exception as e:
+            logger.error(f"Failed to retrieve pages of PDF {pdf_id}: {e}")
+            return []
+
     def update_pdf(self, pdf_id: str, pdf_data: Dict[str, Any]) -> bool:
         """
         Update existing PDF data
@@ -392,25 +616,30 @@ class FileStorageService:
             True if successful, False otherwise
         """
         try:
-            pdf_path = self.pdfs_dir / f"{pdf_id}.json"
-            if not pdf_path.exists():
+            pdf_path = self._find_pdf(pdf_id)
+            if not pdf_path:
                 logger.error(f"PDF {pdf_id} not found for update")
                 return False
 
-            # Remove metadata fields from pdf_data before storing
-            # (they should remain in the metadata file only)
-            pdf_data_to_store = pdf_data.copy()
-            pdf_data_to_store.pop("filename", None)
-            pdf_data_to_store.pop("pdf_id", None)
-
-            # Update the PDF data
-            pdf_path.write_text(json.dumps(pdf_data_to_store, indent=2))
+            # Keep stored fields such as the filename unless overridden
+            metadata = read_paged_pdf_metadata(pdf_path)
+            metadata.pop("char_count", None)
+            metadata.update(
+                (key, value)
+                for key, value in pdf_data.items()
+                if key not in ("pages", "total_pages", "char_count")
+            )
+            size_bytes = write_paged_pdf(
+                pdf_path, metadata, pdf_data.get("pages", [])
+            )
+            self.catalog.update_size(pdf_id, size_bytes)
+            self.cache.invalidate(pdf_id)
 
             # Update metadata with new size
             metadata_path = self.metadata_dir / f"{pdf_id}_meta.json"
             if metadata_path.exists():
                 metadata = json.loads(metadata_path.read_text())
-                metadata["size_bytes"] = len(json.dumps(pdf_data_to_store))
+                metadata["size_bytes"] = size_bytes
                 metadata_path.write_text(json.dumps(metadata, indent=2))
 
             logger.info(f"Updated PDF {pdf_id}")
@@ -420,6 +649,89 @@ class FileStorageService:
             logger.error(f"Failed to update PDF {pdf_id}: {e}")
             return False
 
+    def _pdf_path(self, pdf_id: str) -> Path:
+        """Path of a PDF stored in the paged format"""
+        return self.pdfs_dir / f"{pdf_id}{PAGED_PDF_SUFFIX}"
+
+    def _find_pdf(self, pdf_id: str) -> Optional[Path]:
+        """
+        Locate a stored PDF, converting a legacy JSON document if needed
+
+        Args:
+            pdf_id: PDF reference ID
+
+        Returns:
+            Path of the paged file or None if the PDF is not stored
+        """
+        pdf_path = self._pdf_path(pdf_id)
+        if pdf_path.exists():
+            return pdf_path
+
+        legacy_path = self.pdfs_dir / f"{pdf_id}.json"
+        if not legacy_path.exists():
+            logger.warning(f"PDF file not found: {pdf_path}")
+            return None
+
+        self._convert_legacy_pdf(pdf_id, legacy_path, pdf_path)
+        return pdf_path
+
+    def _convert_legacy_pdf(
+        self, pdf_id: str, legacy_path: Path, pdf_path: Path
+    ):
+        """Rewrite a PDF stored as indented JSON in the paged format"""
+        pdf_data = json.loads(legacy_path.read_text())
+        metadata_path = self.metadata_dir / f"{pdf_id}_meta.json"
+        metadata = {}
+        if metadata_path.exists():
+            metadata = json.loads(metadata_path.read_text())
+
+        pdf_data["pdf_id"] = pdf_id
+        if metadata.get("filename"):
+            pdf_data["filename"] = metadata["filename"]
+        pages = pdf_data.pop("pages", [])
+        size_bytes = write_paged_pdf(pdf_path, pdf_data, pages)
+        legacy_path.unlink(missing_ok=True)
+
+        if metadata:
+            metadata["file_path"] = str(pdf_path)
+            metadata["size_bytes"] = size_bytes
+            metadata_path.write_text(json.dumps(metadata, indent=2))
+
+        entry = self.catalog.get_file(pdf_id)
+        if entry:
+            self.catalog.add_file(
+                file_id=pdf_id,
+                file_type="pdf",
+                session_id=entry["session_id"],
+                size_bytes=size_bytes,
+                file_path=str(pdf_path),
+                metadata_path=entry["metadata_path"],
+                created_at=entry["created_at"],
+            )
+        logger.info(f"Converted legacy JSON PDF {pdf_id} to paged format")
+
+    @staticmethod
+    def _estimate_pdf_size(pdf_data: Dict[str, Any]) -> int:
+        """Approximate the memory held by loaded PDF data"""
+        return sum(
+            len(page.get("text", "") or "") + 256
+            for page in pdf_data.get("pages", [])
+        )
+
+    @staticmethod
+    def _fill_pdf_metadata(
+        pdf_id: str, pdf_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Ensure the pdf_id and filename fields are set"""
+        pdf_data["pdf_id"] = pdf_id
+        if not pdf_data.get("filename"):
+            pdf_data["filename"] = f"{pdf_id}.pdf"
+            logger.warning(
+                f"No filename stored for {pdf_id}, using:"
+                f" {pdf_data['filename']}"
+            )
+        return pdf_data
+
     def cleanup_session(self, session_id: str):
         """
         Clean up all files for a session
@@ -428,20 +740,11 @@ class FileStorageService:
             session_id: Session identifier
         """
         try:
-            # Find all metadata files for this session
-            for metadata_file in self.metadata_dir.glob("*.json"):
+            # Files are shared by content, so only delete those no other
+            # session uses
+            for entry in self.catalog.release_session_files(session_id):
                 try:
-                    metadata = json.loads(metadata_file.read_text())
-                    if metadata.get("session_id") == session_id:
-                        # Remove associated files
-                        if "file_path" in metadata:
-                            file_path = Path(metadata["file_path"])
-                            if file_path.exists():
-                                file_path.unlink()
-
-                        # Remove metadata
-                        metadata_file.unlink()
-
+                    self._delete_file(entry)
                 except Exception as e:
                     logger.warning(f"Error cleaning up file: {e}")
 
@@ -450,6 +753,89 @@ class FileStorageService:
         except Exception as e:
             logger.error(f"Failed to cleanup session {session_id}: {e}")
 
+    def mark_session_active(self, session_id: str):
+        """
+        Record that a session is live so eviction keeps its files
+
+        Heartbeats are written at most once a minute per session.
+
+        Args:
+            session_id: Session identifier
+        """
+        now = time.time()
+        if now - self._session_heartbeats.get(session_id, 0) < 60:
+            return
+        self._session_heartbeats[session_id] = now
+        try:
+            self.catalog.mark_session_active(session_id)
+        except Exception as e:
+            logger.debug(f"Could not record session heartbeat: {e}")
+
+    def pin_file(self, file_id: str, pinned: bool = True):
+        """
+        Pin a stored file so eviction never removes it, or unpin it
+
+        Args:
+            file_id: Image or PDF reference ID
+            pinned: Whether the file is pinned
+        """
+        self.catalog.set_pinned(file_id, pinned)
+
+    def get_storage_metrics(self) -> Dict[str, Any]:
+        """
+        Get eviction metrics and current storage usage
+
+        Returns:
+            Dictionary of eviction metrics including bytes reclaimed and
+            eviction pass latency, plus hot cache hit ratios
+        """
+        return {
+            **self.eviction.get_metrics(),
+            "hot_cache": self.cache.get_stats(),
+        }
+
+    def _record_access(self, file_id: str):
+        """Record a read in the catalog, at most once a minute per file"""
+        now = time.time()
+        if now - self._last_touch.get(file_id, 0) < 60:
+            return
+        self._last_touch[file_id] = now
+        self.catalog.touch(file_id)
+
+    def _catalog_file(
+        self,
+        file_id: str,
+        file_type: str,
+        session_id: str,
+        file_path: Path,
+        metadata_path: Path,
+    ):
+        """Record a stored file in the catalog with its size on disk"""
+        self.catalog.add_file(
+            file_id=file_id,
+            file_type=file_type,
+            session_id=session_id,
+            size_bytes=file_path.stat().st_size,
+            file_path=str(file_path),
+            metadata_path=str(metadata_path),
+        )
+
+    def _delete_file(self, entry: Dict[str, Any]):
+        """
+        Delete a catalogued file, its metadata and its catalog entry
+
+        Args:
+            entry: Catalog entry of the file
+        """
+        for path in (entry.get("file_path"), entry.get("metadata_path")):
+            if path:
+                Path(path).unlink(missing_ok=True)
+        for path in self.derivatives_dir.glob(f"{entry['file_id']}.*"):
+            path.unlink(missing_ok=True)
+        self.catalog.remove_file(entry["file_id"])
+        self.cache.invalidate(entry["file_id"])
+        self._last_touch.pop(entry["file_id"], None)
+
     def _check_storage_limits(self, session_id: str, file_type: str):
         """
         Check storage limits for a session
@@ -461,44 +847,19 @@ class FileStorageService:
         Raises:
             MemoryLimitError: If limits are exceeded
         """
-        # Use a more efficient approach with early termination
-        count = 0
-        total_size = 0
-
         # Define limits upfront
         max_count = (
             config.session.MAX_IMAGES_IN_SESSION
             if file_type == "images"
             else config.session.MAX_PDFS_IN_SESSION
         )
-        max_size = 100 * 1024 * 1024  # 100MB
+        max_size = config.storage.SESSION_QUOTA_BYTES
 
         try:
-            for metadata_file in self.metadata_dir.glob("*.json"):
-                try:
-                    # Read file only if we haven't exceeded limits
-                    if count >= max_count or total_size > max_size:
-                        break
-
-                    metadata = json.loads(metadata_file.read_text())
-
-                    # Skip if not for this session
-                    if metadata.get("session_id") != session_id:
-                        continue
-
-                    # Check file type and update counters
-                    if file_type == "images" and "image_id" in metadata:
-                        count += 1
-                        total_size += metadata.get("size_bytes", 0)
-                    elif file_type == "pdfs" and "pdf_id" in metadata:
-                        count += 1
-                        total_size += metadata.get("size_bytes", 0)
-
-                except (json.JSONDecodeError, IOError) as e:
-                    logger.debug(
-                        f"Error reading metadata file {metadata_file}: {e}"
-                    )
-                    continue
+            # Indexed lookup instead of reading every metadata file
+            count, total_size = self.catalog.get_session_usage(
+                session_id, "image" if file_type == "images" else "pdf"
+            )
 
             # Check limits
             if count >= max_count:
@@ -506,7 +867,13 @@ class FileStorageService:
                     f"{file_type.title()} limit exceeded: {count}/{max_count}"
                 )
 
-            if total_size > max_size:
+            # The eviction engine trims sessions over quota in the
+            # background; refuse only when it is disabled
+            if (
+                not config.storage.EVICTION_ENABLED
+                and max_size
+                and total_size > max_size
+            ):
                 raise MemoryLimitError(
                     f"Storage limit exceeded: {total_size / (1024*1024):.1f}MB"
                 )
@@ -0,0 +1,489 @@
+"""
+Image Generation Client
+
+Shared client for the image generation and image editing endpoints. Requests
+reuse pooled keep-alive connections instead of opening a TCP and TLS
+connection per image:
+
+- Sync callers, e.g. tools running in the executor pool, share one
+  thread-safe httpx.Client; async callers get an httpx.AsyncClient per
+  event loop, like the async LLM clients, so tools on the background loop
+  share its client until the loop shuts down
+- Identical in-flight requests (same endpoint, credentials and payload, so
+  the same prompt and seed) are coalesced into one upstream call
+- At most MAX_CONCURRENT_REQUESTS requests run at once, and waiting for a
+  free slot counts against each request's timeout budget
+
+Generated images are returned as the base64 string the endpoint sent, so
+callers can store them directly without a PIL round trip.
+"""
+
+import asyncio
+import base64
+import hashlib
+import io
+import json
+import logging
+import re
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+from openai import OpenAI
+from utils.config import config as app_config
+
+logger = logging.getLogger(__name__)
+
+DATA_URI_PREFIX_PATTERN = re.compile(r"^data:image/[^;]+;base64,")
+
+# Seconds between checks for a free slot while an async caller waits
+_SLOT_POLL_INTERVAL = 0.05
+
+
+def strip_data_uri(image_b64: str) -> str:
+    """Remove a data URI prefix such as "data:image/png;base64," if present"""
+    return DATA_URI_PREFIX_PATTERN.sub("", image_b64, count=1)
+
+
+class ImageGenerationClient:
+    """Pooled, coalescing and concurrency-bounded image generation client"""
+
+    _instance: Optional["ImageGenerationClient"] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        gen_config = app_config.image_generation
+        self._limits = httpx.Limits(
+            max_connections=gen_config.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=gen_config.HTTP_MAX_CONNECTIONS,
+            keepalive_expiry=gen_config.HTTP_KEEPALIVE_EXPIRY,
+        )
+        self._lock = threading.Lock()
+        self._client: Optional[httpx.Client] = None
+        # Async clients per event loop: loop -> httpx.AsyncClient
+        self._async_clients: "weakref.WeakKeyDictionary" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._openai_clients: Dict[str, OpenAI] = {}
+        self._slots = threading.BoundedSemaphore(
+            gen_config.MAX_CONCURRENT_REQUESTS
+        )
+        self._in_flight: Dict[str, Future] = {}
+        self._stats = {
+            "requests": 0,
+            "coalesced": 0,
+            "errors": 0,
+            "active": 0,
+            "total_slot_wait_ms": 0.0,
+            "max_slot_wait_ms": 0.0,
+        }
+        self._initialized = True
+        logger.debug("Image generation client instance created")
+
+    # Clients
+
+    def _get_client(self) -> httpx.Client:
+        """Get the shared sync HTTP client, creating it on first use"""
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(limits=self._limits)
+            return self._client
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Get the async HTTP client of the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = httpx.AsyncClient(limits=self._limits)
+                self._async_clients[loop] = client
+            return client
+
+    async def aclose_loop_client(self) -> None:
+        """
+        Close the async HTTP client bound to the running event loop
+
+        The background event loop calls this when it shuts down.
+        """
+        with self._lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def get_openai_client(self, api_key: str) -> OpenAI:
+        """
+        Get an OpenAI client for an API key, sharing the pooled connections
+
+        Args:
+            api_key: OpenAI API key
+
+        Returns:
+            Cached OpenAI client
+        """
+        key = hashlib.sha256(api_key.encode()).hexdigest()
+        http_client = self._get_client()
+        with self._lock:
+            if key not in self._openai_clients:
+                self._openai_clients[key] = OpenAI(
+                    api_key=api_key,
+                    http_client=http_client,
+                    timeout=app_config.image_generation.REQUEST_TIMEOUT,
+                )
+            return self._openai_clients[key]
+
+    # Coalescing, slots and timeout budget
+
+    @staticmethod
+    def _request_key(*parts: Any) -> str:
+        """Key identifying identical requests"""
+        return hashlib.sha256(
+            json.dumps(parts, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        """Join an in-flight request, returning (future, is_leader)"""
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._stats["coalesced"] += 1
+                return future, False
+            future = Future()
+            self._in_flight[key] = future
+            self._stats["requests"] += 1
+            return future, True
+
+    def _settle(
+        self,
+        key: str,
+        future: Future,
+        result: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Publish the leader's outcome to coalesced callers"""
+        with self._lock:
+            self._in_flight.pop(key, None)
+            if error is not None:
+                self._stats["errors"] += 1
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _record_slot(self, waited: float) -> None:
+        """Record a request taking a slot after waiting for it"""
+        waited_ms = waited * 1000
+        with self._lock:
+            self._stats["active"] += 1
+            self._stats["total_slot_wait_ms"] += waited_ms
+            self._stats["max_slot_wait_ms"] = max(
+                self._stats["max_slot_wait_ms"], waited_ms
+            )
+
+    def _release_slot(self) -> None:
+        """Give a slot back"""
+        with self._lock:
+            self._stats["active"] -= 1
+        self._slots.release()
+
+    def _acquire_slot(self, deadline: float) -> None:
+        """Wait for a free slot within the budget"""
+        start = time.monotonic()
+        if not self._slots.acquire(timeout=max(deadline - start, 0)):
+            raise TimeoutError("No image generation slot became free in time")
+        self._record_slot(time.monotonic() - start)
+
+    async def _acquire_slot_async(self, deadline: float) -> None:
+        """Wait for a free slot within the budget without blocking the loop"""
+        start = time.monotonic()
+        while not self._slots.acquire(blocking=False):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(
+                    "No image generation slot became free in time"
+                )
+            await asyncio.sleep(_SLOT_POLL_INTERVAL)
+        self._record_slot(time.monotonic() - start)
+
+    @staticmethod
+    def _http_timeout(deadline: float) -> httpx.Timeout:
+        """HTTP timeout covering what is left of the budget"""
+        remaining = max(deadline - time.monotonic(), 0.001)
+        connect = app_config.image_generation.CONNECT_TIMEOUT
+        return httpx.Timeout(remaining, connect=min(connect, remaining))
+
+    def _run(
+        self,
+        key: str,
+        call: Callable[[float], Any],
+        timeout: Optional[float],
+    ) -> Any:
+        """
+        Run a request once per key, holding a slot, within a time budget
+
+        Args:
+            key: Request key for coalescing
+            call: Function performing the request, given the deadline
+            timeout: Total budget in seconds
+
+        Returns:
+            Result of the call, shared with coalesced callers
+        """
+        timeout = timeout or app_config.image_generation.REQUEST_TIMEOUT
+        deadline = time.monotonic() + timeout
+        future, leader = self._join(key)
+        if not leader:
+            logger.info("Joined identical in-flight image request")
+            return future.result(timeout=timeout)
+
+        try:
+            self._acquire_slot(deadline)
+            try:
+                result = call(deadline)
+            finally:
+                self._release_slot()
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        self._settle(key, future, result=result)
+        return result
+
+    async def _arun(
+        self,
+        key: str,
+        call: Callable[[float], Any],
+        timeout: Optional[float],
+    ) -> Any:
+        """Async counterpart of _run; call returns an awaitable"""
+        timeout = timeout or app_config.image_generation.REQUEST_TIMEOUT
+        deadline = time.monotonic() + timeout
+        future, leader = self._join(key)
+        if not leader:
+            logger.info("Joined identical in-flight image request")
+            # Shielded so a timeout here does not cancel the shared request
+            return await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)), timeout
+            )
+
+        try:
+            await self._acquire_slot_async(deadline)
+            try:
+                result = await call(deadline)
+            finally:
+                self._release_slot()
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        self._settle(key, future, result=result)
+        return result
+
+    # JSON endpoints
+
+    def post_json(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        POST a JSON payload to an image endpoint
+
+        Args:
+            url: Endpoint URL
+            payload: JSON request body
+            headers: Request headers, including authorization
+            timeout: Total budget in seconds, defaults to REQUEST_TIMEOUT
+
+        Returns:
+            Decoded JSON response body
+
+        Raises:
+            httpx.HTTPError: If the request fails
+            TimeoutError: If the budget runs out waiting for a slot
+        """
+
+        def call(deadline: float) -> Any:
+            response = self._get_client().post(
+                url,
+                json=payload,
+                headers=headers,
+                timeout=self._http_timeout(deadline),
+            )
+            response.raise_for_status()
+            return response.json()
+
+        return self._run(
+            self._request_key(url, headers, payload), call, timeout
+        )
+
+    async def apost_json(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Async counterpart of post_json"""
+
+        async def call(deadline: float) -> Any:
+            response = await self._get_async_client().post(
+                url,
+                json=payload,
+                headers=headers,
+                timeout=self._http_timeout(deadline),
+            )
+            response.raise_for_status()
+            return response.json()
+
+        return await self._arun(
+            self._request_key(url, headers, payload), call, timeout
+        )
+
+    def generate_image(
+        self,
+        invoke_url: str,
+        payload: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """
+        Generate an image with an endpoint returning base64 artifacts
+
+        Args:
+            invoke_url: Endpoint URL
+            payload: Generation parameters, e.g. prompt, seed and size
+            headers: Request headers, including authorization
+            timeout: Total budget in seconds
+
+        Returns:
+            Base64 encoded image as returned by the endpoint
+        """
+        body = self.post_json(invoke_url, payload, headers, timeout)
+        return strip_data_uri(body["artifacts"][0]["base64"])
+
+    async def agenerate_image(
+        self,
+        invoke_url: str,
+        payload: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """Async counterpart of generate_image"""
+        body = await self.apost_json(invoke_url, payload, headers, timeout)
+        return strip_data_uri(body["artifacts"][0]["base64"])
+
+    # OpenAI image API
+
+    def generate_openai_image(
+        self,
+        api_key: str,
+        prompt: str,
+        size: str,
+        timeout: Optional[float] = None,
+    ) -> Optional[str]:
+        """
+        Generate an image with the OpenAI image API
+
+        Args:
+            api_key: OpenAI API key
+            prompt: Image prompt
+            size: OpenAI size string, e.g. "1024x1024"
+            timeout: Total budget in seconds
+
+        Returns:
+            Base64 encoded image, or None if the response held no image
+        """
+        client = self.get_openai_client(api_key)
+
+        def call(deadline: float) -> Optional[str]:
+            response = client.with_options(
+                timeout=max(deadline - time.monotonic(), 0.001)
+            ).images.generate(
+                model="gpt-image-1",
+                prompt=prompt,
+                n=1,
+                size=size,
+                moderation="low",
+            )
+            return response.data[0].b64_json if response.data else None
+
+        key = self._request_key("openai-generate", api_key, prompt, size)
+        return self._run(key, call, timeout)
+
+    def edit_openai_image(
+        self,
+        api_key: str,
+        image_b64: str,
+        prompt: str,
+        timeout: Optional[float] = None,
+    ) -> Optional[str]:
+        """
+        Edit an image with the OpenAI image API
+
+        Args:
+            api_key: OpenAI API key
+            image_b64: Base64 encoded input image
+            prompt: Edit instructions
+            timeout: Total budget in seconds
+
+        Returns:
+            Base64 encoded image, or None if the response held no image
+        """
+        client = self.get_openai_client(api_key)
+
+        def call(deadline: float) -> Optional[str]:
+            image_file = io.BytesIO(base64.b64decode(image_b64))
+            image_file.name = "edit_image.png"  # OpenAI requires a filename
+            response = client.with_options(
+                timeout=max(deadline - time.monotonic(), 0.001)
+            ).images.edit(
+                model="gpt-image-1",
+                image=image_file,
+                prompt=prompt,
+                n=1,
+                input_fidelity="high",
+                quality="high",
+            )
+            return response.data[0].b64_json if response.data else None
+
+        key = self._request_key(
+            "openai-edit",
+            api_key,
+            hashlib.sha256(image_b64.encode()).hexdigest(),
+            prompt,
+        )
+        return self._run(key, call, timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get client statistics
+
+        Returns:
+            Dictionary with upstream request, coalesced and error counts,
+            requests currently holding a slot and slot wait times
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._in_flight)
+            stats["event_loops"] = len(self._async_clients)
+        stats["max_concurrent_requests"] = (
+            app_config.image_generation.MAX_CONCURRENT_REQUESTS
+        )
+        stats["avg_slot_wait_ms"] = stats["total_slot_wait_ms"] / (
+            stats["requests"] or 1
+        )
+        return stats
+
+
+# Global instance
+image_generation_client = ImageGenerationClient()
@@ -3,18 +3,135 @@ LLM Client Service
 
 This service provides the appropriate LLM client based on the requested type.
 It ensures tools get the correct client for their configured LLM type.
+
+Async clients are pooled per event loop: an httpx.AsyncClient is bound to the
+loop that first uses it, so each running loop gets its own set of clients
+which are reused for as long as the loop lives and torn down when it closes.
 """
 
+import asyncio
 import logging
-from typing import Literal, Optional
+import threading
+import time
+import weakref
+from typing import Any, Dict, Literal, Optional, Tuple
 
 import httpx
 from models.chat_config import ChatConfig
 from openai import AsyncOpenAI, OpenAI
+from utils.config import config as app_config
 
 logger = logging.getLogger(__name__)
 
 
+class ConnectionPoolStats:
+    """Thread-safe connection pool counters for one LLM type"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.clients_created = 0
+        self.clients_closed = 0
+
+    def record_request(self, new_connection: bool, wait_ms: float) -> None:
+        """Record a completed request"""
+        with self._lock:
+            self.requests += 1
+            if new_connection:
+                self.new_connections += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def record_client(self, created: bool) -> None:
+        """Record a client being created or closed"""
+        with self._lock:
+            if created:
+                self.clients_created += 1
+            else:
+                self.clients_closed += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a copy of the counters with derived rates"""
+        with self._lock:
+            reused = self.requests - self.new_connections
+            requests = self.requests or 1
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reuse_rate": reused / requests,
+                "avg_wait_ms": self.total_wait_ms / requests,
+                "max_wait_ms": self.max_wait_ms,
+                "clients_created": self.clients_created,
+                "clients_closed": self.clients_closed,
+            }
+
+
+class InstrumentedAsyncTransport(httpx.AsyncHTTPTransport):
+    """
+    Async transport that records connection reuse and pool wait time
+
+    Uses httpcore trace events: a TCP connect event means the request needed
+    a new connection, and the time until the request headers are sent, minus
+    any connect time, is the time spent waiting on the pool.
+    """
+
+    def __init__(self, stats: ConnectionPoolStats, **kwargs):
+        super().__init__(**kwargs)
+        self._stats = stats
+
+    def connection_counts(self) -> Dict[str, int]:
+        """Count open and idle connections in the underlying pool"""
+        connections = getattr(self._pool, "connections", [])
+        idle = sum(
+            1
+            for connection in connections
+            if getattr(connection, "is_idle", lambda: False)()
+        )
+        return {"open_connections": len(connections), "idle_connections": idle}
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        start = time.perf_counter()
+        timing = {"connect_start": None, "connect_end": None, "sent": None}
+        outer_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: Dict[str, Any]):
+            now = time.perf_counter()
+            if event_name == "connection.connect_tcp.started":
+                timing["connect_start"] = now
+            elif event_name in (
+                "connection.connect_tcp.complete",
+                "connection.start_tls.complete",
+            ):
+                timing["connect_end"] = now
+            elif (
+                event_name.endswith("send_request_headers.started")
+                and timing["sent"] is None
+            ):
+                timing["sent"] = now
+            if outer_trace is not None:
+                result = outer_trace(event_name, info)
+                if asyncio.iscoroutine(result):
+                    await result
+
+        request.extensions["trace"] = trace
+        try:
+            return await super().handle_async_request(request)
+        finally:
+            new_connection = timing["connect_start"] is not None
+            sent = timing["sent"] or time.perf_counter()
+            wait = sent - start
+            if new_connection:
+                wait -= (timing["connect_end"] or sent) - timing[
+                    "connect_start"
+                ]
+            self._stats.record_request(new_connection, max(wait, 0.0) * 1000)
+
+
 class LLMClientService:
     """Service for providing LLM clients based on type"""
 
@@ -32,7 +149,14 @@ class LLMClientService:
 
         self._config: Optional[ChatConfig] = None
         self._clients = {}
-        self._async_clients = {}
+        # Async clients per event loop: loop -> {llm_type: (client, transport)}
+        self._async_clients: "weakref.WeakKeyDictionary" = (
+            weakref.WeakKeyDictionary()
+        )
+        # Clients used outside of a running event loop
+        self._loopless_async_clients = {}
+        self._async_clients_lock = threading.Lock()
+        self._pool_stats: Dict[str, ConnectionPoolStats] = {}
         self._initialized = True
         logger.debug("LLM Client Service instance created")
 
@@ -53,17 +177,38 @@ class LLMClientService:
 
         self._config = config
         self._clients = {}  # Clear any cached clients
-        self._async_clients = {}  # Clear any cached async clients
+        with self._async_clients_lock:
+            # Clear any cached async clients
+            self._async_clients = weakref.WeakKeyDictionary()
+            self._loopless_async_clients = {}
         logger.info("LLM Client Service initialized")
 
-    def _create_async_http_client(self) -> httpx.AsyncClient:
+    def _get_pool_stats(self, llm_type: str) -> ConnectionPoolStats:
+        """Get the pool statistics for an LLM type"""
+        with self._async_clients_lock:
+            if llm_type not in self._pool_stats:
+                self._pool_stats[llm_type] = ConnectionPoolStats()
+            return self._pool_stats[llm_type]
+
+    def _create_async_http_client(
+        self, stats: ConnectionPoolStats
+    ) -> Tuple[httpx.AsyncClient, InstrumentedAsyncTransport]:
         """Create an async HTTP client configured for concurrent requests"""
-        return httpx.AsyncClient(
-            limits=httpx.Limits(
-                max_keepalive_connections=20,  # Keep connections alive
-                max_connections=100,  # Allow many concurrent connections
-                keepalive_expiry=30,  # Keep connections alive for 30 seconds
+        llm_config = app_config.llm
+        limits = httpx.Limits(
+            # Keep connections alive
+            max_keepalive_connections=(
+                llm_config.HTTP_MAX_KEEPALIVE_CONNECTIONS
             ),
+            # Allow many concurrent connections
+            max_connections=llm_config.HTTP_MAX_CONNECTIONS,
+            # Keep idle connections alive for reuse across requests
+            keepalive_expiry=llm_config.HTTP_KEEPALIVE_EXPIRY,
+        )
+        transport = InstrumentedAsyncTransport(stats, limits=limits)
+        client = httpx.AsyncClient(
+            transport=transport,
+            limits=limits,
             timeout=httpx.Timeout(
                 connect=30.0,  # 30 seconds to connect
                 read=300.0,  # 5 minutes to read response (for long LLM calls)
@@ -71,6 +216,95 @@ class LLMClientService:
                 pool=10.0,  # 10 seconds to get connection from pool
             ),
         )
+        return client, transport
+
+    def _get_loop_clients(self) -> Dict[str, Any]:
+        """
+        Get the async client cache for the running event loop
+
+        Entries of loops that have been closed are dropped on the way.
+
+        Returns:
+            Mapping of llm_type to (client, transport) for the current loop
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self._loopless_async_clients
+
+        with self._async_clients_lock:
+            for closed_loop in [
+                other for other in self._async_clients if other.is_closed()
+            ]:
+                stale = self._async_clients.pop(closed_loop)
+                for llm_type in stale:
+                    self._pool_stats[llm_type].record_client(created=False)
+                logger.debug(
+                    f"Dropped {len(stale)} async LLM client(s) of a closed"
+                    " event loop"
+                )
+
+            if loop not in self._async_clients:
+                self._async_clients[loop] = {}
+            return self._async_clients[loop]
+
+    async def aclose_loop_clients(self) -> None:
+        """
+        Close the async clients bound to the running event loop
+
+        The background event loop calls this when it shuts down. Call it
+        also before a short-lived event loop (e.g. from asyncio.run)
+        finishes so its connections are closed cleanly.
+        """
+        loop = asyncio.get_running_loop()
+        with self._async_clients_lock:
+            loop_clients = self._async_clients.pop(loop, {})
+
+        for llm_type, (client, _) in loop_clients.items():
+            try:
+                await client.close()
+            except Exception as e:
+                logger.debug(f"Error closing async {llm_type} client: {e}")
+            self._get_pool_stats(llm_type).record_client(created=False)
+
+        if loop_clients:
+            logger.debug(
+                f"Closed {len(loop_clients)} async LLM client(s) for event"
+                " loop"
+            )
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool statistics for the async clients
+
+        Returns:
+            Dictionary with per-LLM-type request counts, connection reuse
+            rate, pool wait times and currently open connections, plus the
+            number of event loops holding clients
+        """
+        with self._async_clients_lock:
+            transports = [
+                (llm_type, transport)
+                for loop_clients in list(self._async_clients.values())
+                + [self._loopless_async_clients]
+                for llm_type, (_, transport) in loop_clients.items()
+            ]
+            live_loops = len(self._async_clients)
+            llm_types = list(self._pool_stats)
+
+        per_type = {
+            llm_type: {
+                **self._get_pool_stats(llm_type).snapshot(),
+                "open_connections": 0,
+                "idle_connections": 0,
+            }
+            for llm_type in llm_types
+        }
+        for llm_type, transport in transports:
+            for key, count in transport.connection_counts().items():
+                per_type[llm_type][key] += count
+
+        return {"event_loops": live_loops, "clients": per_type}
 
     def get_client(
         self, llm_type: Literal["fast", "llm", "intelligent", "vlm"]
@@ -161,13 +395,15 @@ class LLMClientService:
                     f" auto-initialize: {e}"
                 )
 
-        # Check cache first
-        if llm_type in self._async_clients:
-            return self._async_clients[llm_type]
+        # Check the cache of the running event loop first
+        loop_clients = self._get_loop_clients()
+        if llm_type in loop_clients:
+            return loop_clients[llm_type][0]
 
         # Create new async client based on type with optimized HTTP client
         try:
-            http_client = self._create_async_http_client()
+            stats = self._get_pool_stats(llm_type)
+            http_client, transport = self._create_async_http_client(stats)
 
             if llm_type == "fast":
                 client = AsyncOpenAI(
@@ -196,8 +432,9 @@ class LLMClientService:
             else:
                 raise ValueError(f"Invalid LLM type: {llm_type}")
 
-            # Cache the client
-            self._async_clients[llm_type] = client
+            # Cache the client for this event loop
+            loop_clients[llm_type] = (client, transport)
+            stats.record_client(created=True)
             logger.debug(
                 f"Created {llm_type} async LLM client with concurrent"
                 " connection support"
@@ -5,17 +5,30 @@ This is a simplified LLM service that orchestrates the focused services
 for streaming, parsing, and tool execution.
 """
 
+import asyncio
 import logging
-from typing import Any, AsyncGenerator, Dict, List, Optional
+import time
+from contextlib import contextmanager
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from models.chat_config import ChatConfig
 from services.conversation_context_service import ConversationContextService
 from services.response_parsing_service import ResponseParsingService
-from services.streaming_service import StreamingService
+from services.streaming_service import StreamingService, ToolSelectionStream
 from services.tool_execution_service import ToolExecutionService
 from tools.registry import get_all_tool_definitions
 from tools.tool_llm_config import DEFAULT_LLM_TYPE, get_tool_llm_type
 from utils.config import config
+from utils.token_counter import get_token_counter
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +54,12 @@ class LLMService:
         # For backward compatibility
         self.last_tool_responses = []
 
+        # Per-stage timings (ms) of the most recent turn
+        self.last_stage_timings: Dict[str, float] = {}
+
+        # Context generation left running while a text answer streams
+        self._pending_context_tasks: Set[asyncio.Task] = set()
+
     def _get_model_for_type(self, model_type: str) -> str:
         """
         Get the appropriate model name for a given model type
@@ -69,6 +88,9 @@ class LLMService:
         """
         Generate streaming response with tool support
 
+        Per-stage timings of the turn are logged and kept in
+        ``last_stage_timings``.
+
         Args:
             messages: Conversation messages
             model: Model name
@@ -77,31 +99,76 @@ class LLMService:
         Yields:
             Response chunks or tool results
         """
+        stage_timings: Dict[str, float] = {}
+        self.last_stage_timings = stage_timings
+        turn_start = time.perf_counter()
+
         try:
-            # Apply sliding window to messages
-            windowed_messages = self._apply_sliding_window(messages)
+            async for chunk in self._generate_response_chunks(
+                messages, model, model_type, stage_timings
+            ):
+                if "first_chunk" not in stage_timings:
+                    stage_timings["first_chunk"] = (
+                        time.perf_counter() - turn_start
+                    ) * 1000
+                yield chunk
+        finally:
+            stage_timings["total"] = (time.perf_counter() - turn_start) * 1000
+            self._log_stage_timings(stage_timings)
+
+    async def _generate_response_chunks(
+        self,
+        messages: List[Dict[str, Any]],
+        model: str,
+        model_type: str,
+        stage_timings: Dict[str, float],
+    ) -> AsyncGenerator[str, None]:
+        """
+        Run the response pipeline for a turn
 
-            # Check token count and truncate if necessary
-            max_tokens = config.llm.MAX_CONTEXT_TOKENS
-            estimated_tokens = self._count_message_tokens(windowed_messages)
+        Args:
+            messages: Conversation messages
+            model: Model name
+            model_type: Type of model to use
+            stage_timings: Dictionary collecting per-stage timings (ms)
 
-            if estimated_tokens > max_tokens:
-                logger.warning(
-                    f"Message tokens ({estimated_tokens}) exceed limit"
-                    f" ({max_tokens}). Truncating..."
-                )
-                windowed_messages, was_truncated = self._truncate_messages(
-                    windowed_messages, max_tokens
+        Yields:
+            Response chunks or tool results
+        """
+        try:
+            with self._timed_stage(stage_timings, "prepare"):
+                # Apply sliding window to messages
+                windowed_messages = self._apply_sliding_window(messages)
+
+                # Check token count and truncate if necessary
+                max_tokens = config.llm.MAX_CONTEXT_TOKENS
+                estimated_tokens = self._count_message_tokens(
+                    windowed_messages
                 )
 
-                if was_truncated:
-                    # Yield a warning message to the user
-                    yield (
-                        "\n⚠️ **Note:** The conversation history was truncated"
-                        " to fit within the model's context limit. Some older"
-                        " messages may have been removed.\n\n"
+                was_truncated = False
+                if estimated_tokens > max_tokens:
+                    logger.warning(
+                        f"Message tokens ({estimated_tokens}) exceed limit"
+                        f" ({max_tokens}). Truncating..."
+                    )
+                    windowed_messages, was_truncated = self._truncate_messages(
+                        windowed_messages, max_tokens
                     )
 
+            if was_truncated:
+                # Yield a warning message to the user
+                yield (
+                    "\n⚠️ **Note:** The conversation history was truncated"
+                    " to fit within the model's context limit. Some older"
+                    " messages may have been removed.\n\n"
+                )
+
+            # Whether older conversation messages are missing from the prompt
+            history_trimmed = self._count_conversation_messages(
+                windowed_messages
+            ) < self._count_conversation_messages(messages)
+
             # Get current user message for context injection
             current_user_message = ""
             for msg in reversed(windowed_messages):
@@ -121,23 +188,6 @@ class LLMService:
                         current_user_message = str(content)
                     break
 
-            # Inject conversation context automatically
-            windowed_messages = (
-                self.conversation_context_service.inject_conversation_context(
-                    windowed_messages, current_user_message
-                )
-            )
-
-            # PDF context is now automatically injected by ChatService
-
-            # Filter messages to ensure LLM compatibility
-            windowed_messages = self._filter_messages_for_llm(
-                windowed_messages
-            )
-
-            # Get tool definitions
-            tools = get_all_tool_definitions()
-
             # Check if the user message is an acknowledgment
             from tools.tool_descriptions import (
                 extract_actual_request,
@@ -150,121 +200,104 @@ class LLMService:
                 if is_user_acknowledging
                 else None
             )
+            skip_tool_selection = is_user_acknowledging and not actual_request
 
-            # If it's just an acknowledgment, don't use tools
-            if is_user_acknowledging and not actual_request:
-                logger.info(
-                    "User message is an acknowledgment - skipping tool"
-                    " selection"
-                )
-                # Stream response without tools
-                async for chunk in self.streaming_service.stream_completion(
-                    windowed_messages, model, model_type, tools=None
-                ):
-                    yield chunk
-                return
-
-            # Insert the guidance right before tool selection
-            windowed_messages_with_guidance = windowed_messages
-
-            # Add PDF-specific guidance if a PDF is active
-            from services.session_state import get_active_pdf_id
-            from utils.pdf_upload_handler import get_active_pdf_info
+            # Get tool definitions
+            tools = get_all_tool_definitions()
 
-            pdf_id = get_active_pdf_id()
-            if pdf_id:
-                pdf_info = get_active_pdf_info()
-                if pdf_info:
-                    # Add a system message about the active PDF
-                    from utils.system_prompts import prompt_manager
+            # A streamed tool selection can answer directly when it is made
+            # by the same model that would generate the response
+            stream_text_answers = (
+                config.llm.STREAMING_TOOL_SELECTION
+                and self._get_model_for_type(
+                    get_tool_llm_type("tool_selection")
+                )
+                == model
+            )
 
-                    pdf_guidance = {
-                        "role": "system",
-                        "content": (
-                            prompt_manager.get_context_prompt(
-                                "pdf_active", filename=pdf_info["filename"]
-                            ).replace(
-                                f"{pdf_info['filename']}",
-                                f"'{pdf_info['filename']}'",
-                            )
-                        ),
-                    }
-                    # Insert at the beginning after any existing system messages
-                    windowed_messages_with_guidance = windowed_messages.copy()
-                    # Find where to insert (after existing system messages)
-                    insert_idx = 0
-                    for i, msg in enumerate(windowed_messages_with_guidance):
-                        if msg.get("role") != "system":
-                            insert_idx = i
-                            break
-                        insert_idx = i + 1
-                    windowed_messages_with_guidance.insert(
-                        insert_idx, pdf_guidance
+            if (
+                config.llm.PARALLEL_CONTEXT_AND_TOOL_SELECTION
+                and not skip_tool_selection
+            ):
+                # Run tool selection speculatively while the conversation
+                # context is generated
+                (
+                    windowed_messages,
+                    tool_calls,
+                    text_stream,
+                    tools,
+                    pdf_info,
+                ) = await self._select_tools_with_speculative_context(
+                    windowed_messages,
+                    current_user_message,
+                    tools,
+                    history_trimmed,
+                    stream_text_answers,
+                    stage_timings,
+                )
+            else:
+                # Inject conversation context automatically
+                context_service = self.conversation_context_service
+                with self._timed_stage(stage_timings, "conversation_context"):
+                    windowed_messages = await asyncio.to_thread(
+                        context_service.inject_conversation_context,
+                        windowed_messages,
+                        current_user_message,
+                        context_service.get_session_key(),
                     )
 
-            # Force PDF assistant tool when a PDF is active
-            tool_choice = "required"
-            if pdf_id and pdf_info:
-                # Check if pdf_assistant is in the available tools
-                pdf_tool = next(
-                    (
-                        t
-                        for t in tools
-                        if t.get("function", {}).get("name") == "pdf_assistant"
-                    ),
-                    None,
+                # PDF context is now automatically injected by ChatService
+
+                # Filter messages to ensure LLM compatibility
+                windowed_messages = self._filter_messages_for_llm(
+                    windowed_messages
                 )
-                if pdf_tool:
+
+                # If it's just an acknowledgment, don't use tools
+                if skip_tool_selection:
                     logger.info(
-                        f"Active PDF detected: '{pdf_info['filename']}'."
-                        " Forcing pdf_assistant tool."
+                        "User message is an acknowledgment - skipping tool"
+                        " selection"
                     )
-                    # Force specific tool
-                    tool_choice = {
-                        "type": "function",
-                        "function": {"name": "pdf_assistant"},
-                    }
-                    # Put pdf_assistant first in the list to prioritize it
-                    tools = [pdf_tool] + [
-                        t
-                        for t in tools
-                        if t.get("function", {}).get("name") != "pdf_assistant"
-                    ]
-                else:
-                    logger.error(
-                        "pdf_assistant tool not found in available tools! PDF"
-                        " functionality will not function."
+                    # Stream response without tools
+                    stream = self.streaming_service.stream_completion(
+                        windowed_messages, model, model_type, tools=None
                     )
-                    # Fall back to context injection only
+                    async for chunk in stream:
+                        yield chunk
+                    return
 
-            # First, get non-streaming response to check for tool calls
-            tool_selection_model_type = get_tool_llm_type("tool_selection")
-            tool_selection_model = self._get_model_for_type(
-                tool_selection_model_type
-            )
-            response = await self.streaming_service.sync_completion(
-                windowed_messages_with_guidance,
-                tool_selection_model,
-                tool_selection_model_type,
-                tools=tools,
-                tool_choice=tool_choice,
-                stream=False,  # Use non-streaming for tool selection
-            )
+                selection_messages, tools, tool_choice, pdf_info = (
+                    self._prepare_tool_selection(
+                        windowed_messages, tools, stream_text_answers
+                    )
+                )
+                with self._timed_stage(stage_timings, "tool_selection"):
+                    tool_calls, text_stream = await self._select_tools(
+                        selection_messages,
+                        tools,
+                        tool_choice,
+                        allow_text_stream=(
+                            stream_text_answers and pdf_info is None
+                        ),
+                    )
 
-            # Parse response for content and tool calls
-            content, tool_calls = self.parsing_service.parse_response(response)
+            if text_stream is not None:
+                # The selection model answered directly - keep streaming it
+                logger.info(
+                    "No tool calls selected, streaming tool selection answer"
+                )
+                with self._timed_stage(stage_timings, "response"):
+                    async for chunk in text_stream.text_chunks():
+                        yield chunk
+                return
 
             # If there are tool calls, execute them and stream the response
             logger.info(f"All tool calls: {tool_calls}")
 
             # Special handling when PDF is active but no PDF tool was selected
-            if (
-                pdf_id
-                and pdf_info
-                and not any(
-                    tc.get("name") == "pdf_assistant"
-                    for tc in (tool_calls or [])
-                )
+            if pdf_info and not any(
+                tc.get("name") == "pdf_assistant" for tc in (tool_calls or [])
             ):
                 # Only force if pdf_assistant was available in the tools list
                 pdf_tool_available = any(
@@ -290,23 +323,27 @@ class LLMService:
                 # Log which tools were selected (without arguments to avoid logging base64 data)
                 tool_names = [tc.get("name", "unknown") for tc in tool_calls]
                 logger.info(
-                    f"Tool selection ({tool_selection_model_type} model):"
+                    "Tool selection"
+                    f" ({get_tool_llm_type('tool_selection')} model):"
                     f" {', '.join(tool_names)}"
                 )
 
                 # Stream chunks from tool handling
-                async for chunk in self._handle_tool_calls(
-                    tool_calls, windowed_messages, model, model_type
-                ):
-                    yield chunk
+                with self._timed_stage(stage_timings, "tools_and_response"):
+                    async for chunk in self._handle_tool_calls(
+                        tool_calls, windowed_messages, model, model_type
+                    ):
+                        yield chunk
 
             else:
                 # Fallback to streaming if no tool calls
                 logger.info("No tool calls found, streaming response")
-                async for chunk in self.streaming_service.stream_completion(
-                    windowed_messages, model, model_type, tools=None
-                ):
-                    yield chunk
+                with self._timed_stage(stage_timings, "response"):
+                    stream = self.streaming_service.stream_completion(
+                        windowed_messages, model, model_type, tools=None
+                    )
+                    async for chunk in stream:
+                        yield chunk
 
         except Exception as e:
             logger.error(f"Error generating response: {e}")
@@ -318,6 +355,398 @@ class LLMService:
             else:
                 yield f"Error: {str(e)}"
 
+    async def _select_tools_with_speculative_context(
+        self,
+        windowed_messages: List[Dict[str, Any]],
+        current_user_message: str,
+        tools: List[Dict[str, Any]],
+        history_trimmed: bool,
+        stream_text_answers: bool,
+        stage_timings: Dict[str, float],
+    ) -> Tuple[
+        List[Dict[str, Any]],
+        Optional[List[Dict[str, Any]]],
+        Optional[ToolSelectionStream],
+        List[Dict[str, Any]],
+        Optional[Dict[str, Any]],
+    ]:
+        """
+        Run tool selection concurrently with conversation context generation
+
+        Tool selection starts immediately on a prompt carrying the session's
+        cached conversation summary. Once the up-to-date summary is ready,
+        selection is re-run only if the new summary materially changes the
+        prompt.
+
+        Args:
+            windowed_messages: Windowed conversation messages
+            current_user_message: The user's current query
+            tools: Tool definitions
+            history_trimmed: Whether older messages were dropped from the
+                prompt
+            stream_text_answers: Whether a direct text answer from the
+                selection model may be streamed to the user
+            stage_timings: Dictionary collecting per-stage timings (ms)
+
+        Returns:
+            Tuple of (messages with fresh context, tool calls, text answer
+            stream, tools, active PDF info)
+        """
+        context_service = self.conversation_context_service
+        # Resolve the session here - the context is generated in a worker
+        # thread without access to Streamlit session state
+        session_key = context_service.get_session_key()
+
+        speculative_messages = self._filter_messages_for_llm(
+            context_service.inject_cached_conversation_context(
+                windowed_messages, session_key
+            )
+        )
+        selection_messages, selection_tools, tool_choice, pdf_info = (
+            self._prepare_tool_selection(
+                speculative_messages, tools, stream_text_answers
+            )
+        )
+
+        parallel_start = time.perf_counter()
+        context_task = asyncio.create_task(
+            self._timed_coroutine(
+                asyncio.to_thread(
+                    context_service.inject_conversation_context,
+                    windowed_messages,
+                    current_user_message,
+                    session_key,
+                ),
+                stage_timings,
+                "conversation_context",
+            )
+        )
+        selection_task = asyncio.create_task(
+            self._timed_coroutine(
+                self._select_tools(
+                    selection_messages,
+                    selection_tools,
+                    tool_choice,
+                    allow_text_stream=(
+                        stream_text_answers and pdf_info is None
+                    ),
+                ),
+                stage_timings,
+                "tool_selection",
+            )
+        )
+
+        try:
+            done, _ = await asyncio.wait(
+                {context_task, selection_task},
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if selection_task in done and not history_trimmed:
+                tool_calls, text_stream = selection_task.result()
+                if text_stream is not None:
+                    # The fresh context cannot change this answer (see
+                    # _context_materially_changed), so start streaming now
+                    # and let the summary finish in the background
+                    self._pending_context_tasks.add(context_task)
+                    context_task.add_done_callback(
+                        self._pending_context_tasks.discard
+                    )
+                    return (
+                        speculative_messages,
+                        None,
+                        text_stream,
+                        selection_tools,
+                        pdf_info,
+                    )
+
+            context_messages, (tool_calls, text_stream) = await asyncio.gather(
+                context_task, selection_task
+            )
+        except BaseException:
+            context_task.cancel()
+            selection_task.cancel()
+            raise
+
+        stage_timings["context_and_selection"] = (
+            time.perf_counter() - parallel_start
+        ) * 1000
+
+        context_messages = self._filter_messages_for_llm(context_messages)
+
+        if self._context_materially_changed(
+            context_service.get_context_message(speculative_messages),
+            context_service.get_context_message(context_messages),
+            history_trimmed,
+        ):
+            logger.info(
+                "Conversation context changed the prompt materially -"
+                " re-running tool selection"
+            )
+            if text_stream is not None:
+                await text_stream.aclose()
+            selection_messages, selection_tools, tool_choice, pdf_info = (
+                self._prepare_tool_selection(
+                    context_messages, tools, stream_text_answers
+                )
+            )
+            with self._timed_stage(stage_timings, "tool_selection_rerun"):
+                tool_calls, text_stream = await self._select_tools(
+                    selection_messages,
+                    selection_tools,
+                    tool_choice,
+                    allow_text_stream=(
+                        stream_text_answers and pdf_info is None
+                    ),
+                )
+
+        return (
+            context_messages,
+            tool_calls,
+            text_stream,
+            selection_tools,
+            pdf_info,
+        )
+
+    def _context_materially_changed(
+        self,
+        speculative_context: Optional[str],
+        fresh_context: Optional[str],
+        history_trimmed: bool,
+    ) -> bool:
+        """
+        Decide whether a fresh conversation context invalidates tool selection
+
+        The summary is derived from the conversation, so while every message
+        is still in the prompt it adds no information for tool selection.
+        Only when older messages were dropped can the summary carry context
+        the speculative selection did not see.
+
+        Args:
+            speculative_context: Context used for speculative selection
+            fresh_context: Up-to-date context
+            history_trimmed: Whether older messages were dropped
+
+        Returns:
+            True if tool selection should be re-run
+        """
+        if not fresh_context or fresh_context == speculative_context:
+            return False
+        if not history_trimmed:
+            return False
+        if not speculative_context:
+            return True
+
+        speculative_words = set(speculative_context.lower().split())
+        fresh_words = set(fresh_context.lower().split())
+        similarity = len(speculative_words & fresh_words) / max(
+            len(speculative_words | fresh_words), 1
+        )
+        return similarity < config.llm.SPECULATIVE_SELECTION_MIN_SIMILARITY
+
+    def _prepare_tool_selection(
+        self,
+        windowed_messages: List[Dict[str, Any]],
+        tools: List[Dict[str, Any]],
+        stream_text_answers: bool,
+    ) -> Tuple[
+        List[Dict[str, Any]],
+        List[Dict[str, Any]],
+        Any,
+        Optional[Dict[str, Any]],
+    ]:
+        """
+        Add PDF guidance and determine the tool choice for tool selection
+
+        Args:
+            windowed_messages: Messages for tool selection
+            tools: Tool definitions
+            stream_text_answers: Whether a direct text answer from the
+                selection model may be streamed to the user
+
+        Returns:
+            Tuple of (messages with guidance, tools, tool choice, active PDF
+            info or None)
+        """
+        # Insert the guidance right before tool selection
+        windowed_messages_with_guidance = windowed_messages
+
+        # Add PDF-specific guidance if a PDF is active
+        from services.session_state import get_active_pdf_id
+        from utils.pdf_upload_handler import get_active_pdf_info
+
+        pdf_info = None
+        pdf_id = get_active_pdf_id()
+        if pdf_id:
+            pdf_info = get_active_pdf_info()
+            if pdf_info:
+                # Add a system message about the active PDF
+                from utils.system_prompts import prompt_manager
+
+                pdf_guidance = {
+                    "role": "system",
+                    "content": (
+                        prompt_manager.get_context_prompt(
+                            "pdf_active", filename=pdf_info["filename"]
+                        ).replace(
+                            f"{pdf_info['filename']}",
+                            f"'{pdf_info['filename']}'",
+                        )
+                    ),
+                }
+                # Insert at the beginning after any existing system messages
+                windowed_messages_with_guidance = windowed_messages.copy()
+                # Find where to insert (after existing system messages)
+                insert_idx = 0
+                for i, msg in enumerate(windowed_messages_with_guidance):
+                    if msg.get("role") != "system":
+                        insert_idx = i
+                        break
+                    insert_idx = i + 1
+                windowed_messages_with_guidance.insert(
+                    insert_idx, pdf_guidance
+                )
+
+        # Let the model answer directly when its text answer can be
+        # streamed to the user; otherwise a tool call is required
+        tool_choice = "auto" if stream_text_answers else "required"
+
+        # Force PDF assistant tool when a PDF is active
+        if pdf_info:
+            # Check if pdf_assistant is in the available tools
+            pdf_tool = next(
+                (
+                    t
+                    for t in tools
+                    if t.get("function", {}).get("name") == "pdf_assistant"
+                ),
+                None,
+            )
+            if pdf_tool:
+                logger.info(
+                    f"Active PDF detected: '{pdf_info['filename']}'."
+                    " Forcing pdf_assistant tool."
+                )
+                # Force specific tool
+                tool_choice = {
+                    "type": "function",
+                    "function": {"name": "pdf_assistant"},
+                }
+                # Put pdf_assistant first in the list to prioritize it
+                tools = [pdf_tool] + [
+                    t
+                    for t in tools
+                    if t.get("function", {}).get("name") != "pdf_assistant"
+                ]
+            else:
+                logger.error(
+                    "pdf_assistant tool not found in available tools! PDF"
+                    " functionality will not function."
+                )
+                # Fall back to context injection only
+
+        return windowed_messages_with_guidance, tools, tool_choice, pdf_info
+
+    async def _select_tools(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: List[Dict[str, Any]],
+        tool_choice: Any,
+        allow_text_stream: bool = False,
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[ToolSelectionStream]]:
+        """
+        Ask the tool selection model which tools to call
+
+        Args:
+            messages: Messages for tool selection (including guidance)
+            tools: Tool definitions
+            tool_choice: Tool choice passed to the API
+            allow_text_stream: Stream the selection and hand back a direct
+                text answer instead of discarding it
+
+        Returns:
+            Tuple of (parsed tool calls or None, text answer stream or None)
+        """
+        tool_selection_model_type = get_tool_llm_type("tool_selection")
+        tool_selection_model = self._get_model_for_type(
+            tool_selection_model_type
+        )
+
+        if allow_text_stream:
+            selection_stream = (
+                await self.streaming_service.stream_tool_selection(
+                    messages,
+                    tool_selection_model,
+                    tool_selection_model_type,
+                    tools=tools,
+                    tool_choice=tool_choice,
+                )
+            )
+            if not await selection_stream.detect():
+                return None, selection_stream
+            response = await selection_stream.collect()
+            _, tool_calls = self.parsing_service.parse_response(response)
+            return tool_calls, None
+
+        response = await self.streaming_service.sync_completion(
+            messages,
+            tool_selection_model,
+            tool_selection_model_type,
+            tools=tools,
+            tool_choice=tool_choice,
+            stream=False,  # Use non-streaming for tool selection
+        )
+
+        # Parse response for content and tool calls
+        _, tool_calls = self.parsing_service.parse_response(response)
+        return tool_calls, None
+
+    @staticmethod
+    def _count_conversation_messages(messages: List[Dict[str, Any]]) -> int:
+        """Count user and assistant messages"""
+        return sum(
+            1 for msg in messages if msg.get("role") not in ["system", "tool"]
+        )
+
+    @staticmethod
+    @contextmanager
+    def _timed_stage(stage_timings: Dict[str, float], stage: str):
+        """Record the wall-clock duration (ms) of a pipeline stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stage_timings[stage] = (time.perf_counter() - start) * 1000
+
+    @staticmethod
+    async def _timed_coroutine(
+        coroutine: Awaitable[Any], stage_timings: Dict[str, float], stage: str
+    ) -> Any:
+        """Await a coroutine, recording its wall-clock duration (ms)"""
+        start = time.perf_counter()
+        try:
+            return await coroutine
+        finally:
+            stage_timings[stage] = (time.perf_counter() - start) * 1000
+
+    def _log_stage_timings(self, stage_timings: Dict[str, float]) -> None:
+        """Log per-stage timings of a turn"""
+        if not stage_timings:
+            return
+
+        summary = ", ".join(
+            f"{stage}={duration:.0f}ms"
+            for stage, duration in stage_timings.items()
+        )
+        if "context_and_selection" in stage_timings:
+            saved = (
+                stage_timings.get("conversation_context", 0.0)
+                + stage_timings.get("tool_selection", 0.0)
+                - stage_timings["context_and_selection"]
+                - stage_timings.get("tool_selection_rerun", 0.0)
+            )
+            summary += f" (parallel selection saved ~{saved:.0f}ms)"
+        logger.info(f"Turn stage timings: {summary}")
+
     async def _handle_tool_calls(
         self,
         tool_calls: List[Dict[str, Any]],
@@ -409,20 +838,20 @@ class LLMService:
 
                 # Limit tool response content based on configured max tokens
                 max_tool_tokens = config.llm.MAX_TOOL_RESPONSE_TOKENS
-                # Use the same token estimation as elsewhere in the code (4 chars = 1 token)
-                max_tool_content_chars = max_tool_tokens * 4
+                tool_tokens = self._estimate_tokens(tool_content)
 
-                if len(tool_content) > max_tool_content_chars:
+                if tool_tokens > max_tool_tokens:
                     logger.warning(
                         f"Tool '{tool_name}' response too long"
                         f" ({len(tool_content)} chars,"
-                        f" ~{self._estimate_tokens(tool_content)} tokens)."
-                        f" Truncating to {max_tool_content_chars} characters"
-                        f" (~{max_tool_tokens} tokens)."
+                        f" ~{tool_tokens} tokens)."
+                        f" Truncating to ~{max_tool_tokens} tokens."
                     )
                     # Keep first part of content and add truncation notice
                     tool_content = (
-                        tool_content[:max_tool_content_chars]
+                        get_token_counter().truncate(
+                            tool_content, max_tool_tokens
+                        )
                         + "\n\n[Tool response truncated due to length. First"
                         f" ~{max_tool_tokens} tokens shown.]"
                     )
@@ -473,15 +902,16 @@ class LLMService:
                     content = response.get("content", "")
                     # Apply same truncation logic for consistency
                     max_tool_tokens = config.llm.MAX_TOOL_RESPONSE_TOKENS
-                    max_tool_content_chars = max_tool_tokens * 4
 
-                    if len(content) > max_tool_content_chars:
+                    if self._estimate_tokens(content) > max_tool_tokens:
                         logger.warning(
                             f"Direct response tool '{tool_name}' content too"
                             " long. Truncating for message history."
                         )
                         content = (
-                            content[:max_tool_content_chars]
+                            get_token_counter().truncate(
+                                content, max_tool_tokens
+                            )
                             + "\n\n[Content truncated]"
                         )
 
@@ -649,42 +1079,49 @@ class LLMService:
 
     def _estimate_tokens(self, text: str) -> int:
         """
-        Estimate token count from text using character-based approximation
+        Count the tokens of a text with the shared token counter
 
         Args:
-            text: Text to estimate tokens for
+            text: Text to count tokens for
 
         Returns:
-            Estimated token count
+            Token count, exact with a bundled tokenizer and estimated
+            otherwise
         """
-        # Rough estimation: ~4 characters per token
-        # This is a reasonable approximation for English text
-        return len(text) // 4
+        return get_token_counter().count(text)
 
-    def _count_message_tokens(self, messages: List[Dict[str, Any]]) -> int:
+    def _message_tokens(self, message: Dict[str, Any]) -> int:
         """
-        Count total estimated tokens in messages
+        Count the tokens of a single message
 
         Args:
-            messages: List of message dictionaries
+            message: Message dictionary
 
         Returns:
-            Total estimated token count
+            Token count of the message
         """
-        total_tokens = 0
-        for message in messages:
-            # Count role tokens (roughly 1 token)
-            total_tokens += 1
+        # Role token and message structure (<|im_start|>, <|im_end|> etc.)
+        tokens = 4
+
+        # History messages are counted again on every turn, so their
+        # counts are cached by content
+        content = message.get("content", "")
+        if isinstance(content, str):
+            tokens += get_token_counter().count_cached(content)
+
+        return tokens
 
-            # Count content tokens
-            content = message.get("content", "")
-            if isinstance(content, str):
-                total_tokens += self._estimate_tokens(content)
+    def _count_message_tokens(self, messages: List[Dict[str, Any]]) -> int:
+        """
+        Count total tokens in messages
 
-            # Add some overhead for message structure
-            total_tokens += 3  # <|im_start|>, <|im_end|> etc.
+        Args:
+            messages: List of message dictionaries
 
-        return total_tokens
+        Returns:
+            Total token count
+        """
+        return sum(self._message_tokens(message) for message in messages)
 
     def _truncate_messages(
         self, messages: List[Dict[str, Any]], max_tokens: int
@@ -740,13 +1177,11 @@ class LLMService:
                 f" Truncating user message."
             )
             truncated_content = latest_user_msg["content"]
-            while self._estimate_tokens(truncated_content) > (
-                max_tokens - system_tokens - response_buffer - 100
-            ):
-                # Remove 25% of the content
-                truncated_content = truncated_content[
-                    : int(len(truncated_content) * 0.75)
-                ]
+            if isinstance(truncated_content, str):
+                truncated_content = get_token_counter().truncate(
+                    truncated_content,
+                    max_tokens - system_tokens - response_buffer - 100,
+                )
 
             latest_user_msg = {
                 **latest_user_msg,
@@ -757,23 +1192,30 @@ class LLMService:
             }
             return system_messages + [latest_user_msg], True
 
-        # Build message list from most recent, keeping within token limit
-        selected_messages = [latest_user_msg]
+        # Find the oldest message to keep by summing token counts from the
+        # most recent message back (excluding latest user message) until
+        # the next one would not fit
+        first_kept = len(non_system_messages)
         selected_tokens = latest_user_tokens
-
-        # Add messages from most recent to oldest (excluding latest user message)
         for i in range(len(non_system_messages) - 1, -1, -1):
             if i == latest_user_idx:
                 continue
 
-            msg = non_system_messages[i]
-            msg_tokens = self._count_message_tokens([msg])
-
-            if selected_tokens + msg_tokens > available_tokens:
+            selected_tokens += self._message_tokens(non_system_messages[i])
+            if selected_tokens > available_tokens:
                 break
 
-            selected_messages.insert(0, msg)
-            selected_tokens += msg_tokens
+            first_kept = i
+
+        # Keep the messages from there in order, the latest user message last
+        selected_messages = [
+            msg
+            for i, msg in enumerate(
+                non_system_messages[first_kept:], first_kept
+            )
+            if i != latest_user_idx
+        ]
+        selected_messages.append(latest_user_msg)
 
         # Check if we truncated
         was_truncated = len(selected_messages) < len(non_system_messages)
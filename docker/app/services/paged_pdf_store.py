@@ -0,0 +1,165 @@
+"""
+Paged PDF Store
+
+Binary on-disk format for extracted PDF documents. A file holds a small
+header with the document metadata and an index of page offsets, followed by
+one zlib-compressed JSON blob per page:
+
+    magic (8 bytes) | header length (4 bytes, big-endian) | header JSON
+    | page 1 | page 2 | ...
+
+Page offsets are relative to the end of the header, so reading the metadata
+or a range of pages only touches the bytes it needs instead of parsing the
+whole document.
+"""
+
+import json
+import os
+import struct
+import uuid
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+MAGIC = b"PDFPAGE1"
+PAGED_PDF_SUFFIX = ".pdfpages"
+
+_HEADER_LENGTH = struct.Struct(">I")
+_COMPRESSION_LEVEL = 6
+
+
+def write_paged_pdf(
+    path: Path, metadata: Dict[str, Any], pages: List[Dict[str, Any]]
+) -> int:
+    """
+    Write a PDF document in the paged format
+
+    The file is written next to its destination and moved into place so
+    readers never see a partially written document.
+
+    Args:
+        path: Destination file path
+        metadata: Document fields other than the pages
+        pages: Page dictionaries, each usually holding "page" and "text"
+
+    Returns:
+        Size of the written file in bytes
+    """
+    blobs = []
+    index = []
+    offset = 0
+    char_count = 0
+    for page in pages:
+        blob = zlib.compress(
+            json.dumps(page, separators=(",", ":")).encode("utf-8"),
+            _COMPRESSION_LEVEL,
+        )
+        blobs.append(blob)
+        index.append([offset, len(blob)])
+        offset += len(blob)
+        char_count += len(page.get("text", "") or "")
+
+    header_metadata = dict(metadata)
+    header_metadata["total_pages"] = len(pages)
+    header_metadata.setdefault("char_count", char_count)
+    header = json.dumps(
+        {"metadata": header_metadata, "pages": index},
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    # Unique per writer, since several processes can store the same
+    # content-addressed document at once
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(_HEADER_LENGTH.pack(len(header)))
+            f.write(header)
+            for blob in blobs:
+                f.write(blob)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return path.stat().st_size
+
+
+def _read_header(f) -> Tuple[Dict[str, Any], List[List[int]], int]:
+    """Read the header from an open file, returning the data start offset"""
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a paged PDF file")
+    (header_length,) = _HEADER_LENGTH.unpack(f.read(_HEADER_LENGTH.size))
+    header = json.loads(f.read(header_length))
+    data_start = len(MAGIC) + _HEADER_LENGTH.size + header_length
+    return header["metadata"], header["pages"], data_start
+
+
+def read_paged_pdf_metadata(path: Path) -> Dict[str, Any]:
+    """
+    Read only the header metadata of a paged PDF file
+
+    Args:
+        path: File path
+
+    Returns:
+        Document metadata including total_pages and char_count
+    """
+    with open(path, "rb") as f:
+        metadata, _, _ = _read_header(f)
+    return metadata
+
+
+def read_paged_pdf_pages(
+    path: Path, positions: Iterable[int]
+) -> List[Dict[str, Any]]:
+    """
+    Read selected pages of a paged PDF file
+
+    The byte span covering the requested pages is read in one go and only
+    the requested pages are decompressed.
+
+    Args:
+        path: File path
+        positions: Zero-based page positions; out-of-range ones are skipped
+
+    Returns:
+        Page dictionaries in the order requested
+    """
+    with open(path, "rb") as f:
+        _, index, data_start = _read_header(f)
+        wanted = [p for p in positions if 0 <= p < len(index)]
+        if not wanted:
+            return []
+
+        span_start = index[min(wanted)][0]
+        last_offset, last_length = index[max(wanted)]
+        f.seek(data_start + span_start)
+        span = f.read(last_offset + last_length - span_start)
+
+    pages = []
+    for position in wanted:
+        offset, length = index[position]
+        start = offset - span_start
+        pages.append(json.loads(zlib.decompress(span[start : start + length])))
+    return pages
+
+
+def read_paged_pdf(path: Path) -> Dict[str, Any]:
+    """
+    Read a whole paged PDF file
+
+    Args:
+        path: File path
+
+    Returns:
+        Document metadata with the "pages" list
+    """
+    with open(path, "rb") as f:
+        metadata, index, _ = _read_header(f)
+        data = f.read()
+
+    pages = [
+        json.loads(zlib.decompress(data[offset : offset + length]))
+        for offset, length in index
+    ]
+    return {**metadata, "pages": pages}
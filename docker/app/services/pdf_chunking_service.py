@@ -2,22 +2,107 @@
 PDF Chunking Service
 
 This service handles intelligent chunking of PDF documents with embeddings
-for efficient retrieval and query processing. Uses a simplified approach
-that's compatible with MilvusClient's auto-schema generation.
+for efficient retrieval and query processing. Chunks are stored in Milvus
+with an explicit schema so searches, deletes and statistics can filter on
+the scalar pdf_id field server-side.
 """
 
+import asyncio
 import hashlib
 import json
 import logging
+import random
+import re
 from typing import Any, Dict, List, Optional
 
 from models.chat_config import ChatConfig
-from openai import OpenAI
-from pymilvus import MilvusClient
+from openai import AsyncOpenAI, OpenAI
+from pymilvus import DataType, MilvusClient
 from utils.config import config
+from utils.embedding_cache import embedding_cache
+from utils.executor_pool import get_shared_executor
 
 logger = logging.getLogger(__name__)
 
+# Milvus VARCHAR lengths are limited in bytes
+MAX_TEXT_BYTES = 65535
+MAX_PDF_ID_LENGTH = 128
+MAX_PAGES_PER_CHUNK = 1024
+
+# Fields required by the current collection schema
+SCHEMA_FIELDS = {"id", "vector", "text", "pdf_id", "chunk_index", "pages"}
+
+PARTITION_MODES = ("none", "partition_key", "per_document")
+
+
+def pdf_id_filter(pdf_id: str) -> str:
+    """
+    Build a Milvus filter expression matching one PDF
+
+    Args:
+        pdf_id: The PDF identifier
+
+    Returns:
+        Filter expression on the scalar pdf_id field
+    """
+    # json.dumps quotes and escapes the value for the expression parser
+    return f"pdf_id == {json.dumps(pdf_id)}"
+
+
+def pdf_partition_name(pdf_id: str) -> str:
+    """
+    Get the per-document partition name for a PDF
+
+    Args:
+        pdf_id: The PDF identifier
+
+    Returns:
+        Valid Milvus partition name derived from the pdf_id
+    """
+    name = re.sub(r"[^A-Za-z0-9_]", "_", pdf_id)
+    if not re.match(r"[A-Za-z_]", name):
+        name = f"p_{name}"
+    return name[:255]
+
+
+def generate_chunk_id(pdf_id: str, text: str, occurrence: int = 0) -> int:
+    """
+    Derive a stable 63-bit chunk ID from the PDF and chunk content
+
+    Unlike hash(), this is identical across processes and restarts, so the
+    same chunk always maps to the same primary key and can be upserted.
+
+    Args:
+        pdf_id: The PDF identifier
+        text: Chunk text
+        occurrence: How many identical chunk texts precede this one
+
+    Returns:
+        Positive integer that fits in Milvus INT64
+    """
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    digest = hashlib.sha256(
+        f"{pdf_id}:{text_hash}:{occurrence}".encode("utf-8")
+    ).digest()
+    return int.from_bytes(digest[:8], "big") & (2**63 - 1)
+
+
+def assign_chunk_ids(chunks: List[Dict[str, Any]], pdf_id: str) -> None:
+    """Set a deterministic "id" on each chunk in place"""
+    occurrences: Dict[str, int] = {}
+    for chunk in chunks:
+        occurrence = occurrences.get(chunk["text"], 0)
+        occurrences[chunk["text"]] = occurrence + 1
+        chunk["id"] = generate_chunk_id(pdf_id, chunk["text"], occurrence)
+
+
+def _truncate_utf8(text: str, max_bytes: int) -> str:
+    """Truncate text so its UTF-8 encoding fits in max_bytes"""
+    encoded = text.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return text
+    return encoded[:max_bytes].decode("utf-8", errors="ignore")
+
 
 class PDFChunkingService:
     """Service for intelligent PDF chunking with embeddings"""
@@ -35,14 +120,27 @@ class PDFChunkingService:
             api_key=config.env.EMBEDDING_API_KEY,
         )
         self.embedding_model = config.env.EMBEDDING_MODEL
+        self.embedding_batch_size = max(
+            1, config.file_processing.PDF_EMBEDDING_BATCH_SIZE
+        )
+        self.embedding_max_concurrency = max(
+            1, config.file_processing.PDF_EMBEDDING_MAX_CONCURRENCY
+        )
 
         # Initialize Milvus client
         self.collection_name = "pdf_chunks"
         self.embedding_dim = 2048
+        self.partition_mode = config.file_processing.PDF_MILVUS_PARTITION_MODE
+        if self.partition_mode not in PARTITION_MODES:
+            logger.warning(
+                f"Unknown PDF_MILVUS_PARTITION_MODE '{self.partition_mode}',"
+                " using 'none'"
+            )
+            self.partition_mode = "none"
         self._initialize_milvus()
 
     def _initialize_milvus(self):
-        """Initialize Milvus with simplified approach"""
+        """Initialize Milvus and the pdf_chunks collection"""
         try:
             # Ensure database exists
             self._ensure_database_exists()
@@ -55,22 +153,20 @@ class PDFChunkingService:
 
             # Check if collection exists
             if not self.milvus_client.has_collection(self.collection_name):
-                logger.info(f"Creating collection '{self.collection_name}'...")
-
-                # Use the simplest possible creation method
-                # MilvusClient will auto-generate schema on first insert
-                self.milvus_client.create_collection(
-                    collection_name=self.collection_name,
-                    dimension=self.embedding_dim,
-                    metric_type="L2",
-                    consistency_level="Strong",
-                )
-                logger.info(f"Created collection: {self.collection_name}")
+                self._create_collection()
+            elif not self._has_current_schema():
+                self.migrate_legacy_collection()
             else:
                 logger.info(
                     f"Collection '{self.collection_name}' already exists"
                 )
 
+            # Finish a migration that was interrupted
+            if self.milvus_client.has_collection(self._legacy_collection_name):
+                self.migrate_legacy_collection()
+
+            self._resolve_partition_mode()
+
             # Try to load collection
             try:
                 self.milvus_client.load_collection(
@@ -86,6 +182,266 @@ class PDFChunkingService:
             logger.error(f"Failed to initialize Milvus: {e}")
             self.milvus_client = None
 
+    @property
+    def _legacy_collection_name(self) -> str:
+        """Name the legacy collection is moved to while migrating"""
+        return f"{self.collection_name}_legacy"
+
+    def _build_schema(self):
+        """Build the explicit pdf_chunks collection schema"""
+        schema = MilvusClient.create_schema(
+            auto_id=False, enable_dynamic_field=False
+        )
+        schema.add_field("id", DataType.INT64, is_primary=True)
+        schema.add_field(
+            "vector", DataType.FLOAT_VECTOR, dim=self.embedding_dim
+        )
+        schema.add_field("text", DataType.VARCHAR, max_length=MAX_TEXT_BYTES)
+        schema.add_field(
+            "pdf_id",
+            DataType.VARCHAR,
+            max_length=MAX_PDF_ID_LENGTH,
+            is_partition_key=self.partition_mode == "partition_key",
+        )
+        schema.add_field("chunk_index", DataType.INT64)
+        schema.add_field(
+            "pages",
+            DataType.ARRAY,
+            element_type=DataType.INT64,
+            max_capacity=MAX_PAGES_PER_CHUNK,
+        )
+        # Remaining descriptive fields (filename, total_chunks) as JSON
+        schema.add_field(
+            "metadata", DataType.VARCHAR, max_length=MAX_TEXT_BYTES
+        )
+        return schema
+
+    def _build_index_params(self):
+        """Build the vector and scalar index definitions"""
+        index_params = MilvusClient.prepare_index_params()
+        index_params.add_index(
+            field_name="vector", index_type="AUTOINDEX", metric_type="L2"
+        )
+        index_params.add_index(field_name="pdf_id", index_type="INVERTED")
+        return index_params
+
+    def _create_collection(self):
+        """Create the pdf_chunks collection with its explicit schema"""
+        logger.info(f"Creating collection '{self.collection_name}'...")
+        extra_kwargs = {}
+        if self.partition_mode == "partition_key":
+            extra_kwargs["num_partitions"] = (
+                config.file_processing.PDF_MILVUS_NUM_PARTITIONS
+            )
+        self.milvus_client.create_collection(
+            collection_name=self.collection_name,
+            schema=self._build_schema(),
+            index_params=self._build_index_params(),
+            consistency_level="Strong",
+            **extra_kwargs,
+        )
+        logger.info(
+            f"Created collection: {self.collection_name} (partition mode:"
+            f" {self.partition_mode})"
+        )
+
+    def _resolve_partition_mode(self):
+        """
+        Align the partition mode with the existing collection layout
+
+        Whether pdf_id is a partition key is fixed when the collection is
+        created, so an existing collection wins over the configured mode.
+        """
+        description = self.milvus_client.describe_collection(
+            collection_name=self.collection_name
+        )
+        has_partition_key = any(
+            field.get("is_partition_key")
+            for field in description["fields"]
+            if field["name"] == "pdf_id"
+        )
+
+        if has_partition_key and self.partition_mode != "partition_key":
+            logger.warning(
+                f"Collection '{self.collection_name}' uses pdf_id as"
+                " partition key, ignoring partition mode"
+                f" '{self.partition_mode}'"
+            )
+            self.partition_mode = "partition_key"
+        elif not has_partition_key and self.partition_mode == "partition_key":
+            logger.warning(
+                f"Collection '{self.collection_name}' was created without a"
+                " partition key; recreate it to use partition_key mode"
+            )
+            self.partition_mode = "none"
+
+    def _get_document_partitions(self, pdf_id: str) -> Optional[List[str]]:
+        """
+        Get the partitions to search for a PDF
+
+        Returns:
+            The PDF's partition in per_document mode if it exists, otherwise
+            None to search the whole collection (pruned by the pdf_id filter
+            in partition_key mode)
+        """
+        if self.partition_mode != "per_document":
+            return None
+        partition_name = pdf_partition_name(pdf_id)
+        if self.milvus_client.has_partition(
+            collection_name=self.collection_name,
+            partition_name=partition_name,
+        ):
+            return [partition_name]
+        return None
+
+    def _write_chunks(
+        self, entities: List[Dict[str, Any]], upsert: bool = False
+    ) -> None:
+        """
+        Insert or upsert chunk rows, routed to per-document partitions
+
+        Args:
+            entities: Rows matching the pdf_chunks schema
+            upsert: Whether to upsert instead of insert
+        """
+        client = self.milvus_client
+        write = client.upsert if upsert else client.insert
+        if self.partition_mode != "per_document":
+            write(collection_name=self.collection_name, data=entities)
+            return
+
+        by_pdf: Dict[str, List[Dict[str, Any]]] = {}
+        for entity in entities:
+            by_pdf.setdefault(entity["pdf_id"], []).append(entity)
+
+        for pdf_id, rows in by_pdf.items():
+            partition_name = pdf_partition_name(pdf_id)
+            if not self.milvus_client.has_partition(
+                collection_name=self.collection_name,
+                partition_name=partition_name,
+            ):
+                self.milvus_client.create_partition(
+                    collection_name=self.collection_name,
+                    partition_name=partition_name,
+                )
+                try:
+                    self.milvus_client.load_partitions(
+                        collection_name=self.collection_name,
+                        partition_names=[partition_name],
+                    )
+                except Exception as e:
+                    logger.debug(f"Could not load partition: {e}")
+            write(
+                collection_name=self.collection_name,
+                data=rows,
+                partition_name=partition_name,
+            )
+
+    def _has_current_schema(self) -> bool:
+        """Check whether the collection has all current schema fields"""
+        description = self.milvus_client.describe_collection(
+            collection_name=self.collection_name
+        )
+        field_names = {field["name"] for field in description["fields"]}
+        return SCHEMA_FIELDS.issubset(field_names)
+
+    def migrate_legacy_collection(self, batch_size: int = 500) -> int:
+        """
+        Migrate an auto-schema pdf_chunks collection to the explicit schema
+
+        The old collection is renamed, a new one is created with the current
+        schema, and rows are copied over with pdf_id, chunk_index and pages
+        taken from their JSON metadata. Rows are upserted by primary key, so
+        an interrupted migration is resumed on the next start.
+
+        Args:
+            batch_size: Number of rows copied per round trip
+
+        Returns:
+            Number of rows migrated
+        """
+        legacy_name = self._legacy_collection_name
+        if not self.milvus_client.has_collection(legacy_name):
+            logger.info(
+                f"Migrating collection '{self.collection_name}' to the"
+                " explicit schema"
+            )
+            self.milvus_client.rename_collection(
+                old_name=self.collection_name, new_name=legacy_name
+            )
+        if not self.milvus_client.has_collection(self.collection_name):
+            self._create_collection()
+
+        self.milvus_client.load_collection(collection_name=legacy_name)
+        iterator = self.milvus_client.query_iterator(
+            collection_name=legacy_name,
+            batch_size=batch_size,
+            output_fields=["id", "vector", "text", "metadata"],
+        )
+
+        migrated = 0
+        try:
+            while True:
+                rows = iterator.next()
+                if not rows:
+                    break
+                entities = []
+                for row in rows:
+                    metadata = json.loads(row.get("metadata") or "{}")
+                    entities.append(
+                        self._build_chunk_entity(
+                            chunk_id=row["id"],
+                            embedding=row["vector"],
+                            text=row.get("text", ""),
+                            pdf_id=metadata.get("pdf_id", ""),
+                            filename=metadata.get("filename", "Unknown"),
+                            chunk_index=metadata.get("chunk_index", 0),
+                            pages=metadata.get("pages", []),
+                            total_chunks=metadata.get("total_chunks", 0),
+                        )
+                    )
+                self._write_chunks(entities, upsert=True)
+                migrated += len(entities)
+        finally:
+            iterator.close()
+
+        self.milvus_client.drop_collection(collection_name=legacy_name)
+        logger.info(
+            f"Migrated {migrated} chunks to collection"
+            f" '{self.collection_name}'"
+        )
+        return migrated
+
+    def _build_chunk_entity(
+        self,
+        chunk_id: int,
+        embedding: List[float],
+        text: str,
+        pdf_id: str,
+        filename: str,
+        chunk_index: int,
+        pages: List[int],
+        total_chunks: int,
+    ) -> Dict[str, Any]:
+        """Build a row matching the pdf_chunks schema"""
+        return {
+            "id": chunk_id,
+            "vector": embedding,
+            "text": _truncate_utf8(text[:60000], MAX_TEXT_BYTES),
+            "pdf_id": pdf_id,
+            "chunk_index": chunk_index,
+            "pages": list(pages)[:MAX_PAGES_PER_CHUNK],
+            "metadata": json.dumps(
+                {
+                    "pdf_id": pdf_id,
+                    "filename": filename,
+                    "chunk_index": chunk_index,
+                    "pages": pages,
+                    "total_chunks": total_chunks,
+                }
+            ),
+        }
+
     def _ensure_database_exists(self):
         """Ensure database exists"""
         try:
@@ -139,39 +495,30 @@ class PDFChunkingService:
 
         # Create chunks
         chunks = self._create_simple_chunks(pages, pdf_id)
+        assign_chunk_ids(chunks, pdf_id)
+
+        # Create embeddings in batches
+        embeddings = self._create_embeddings(
+            [chunk["text"] for chunk in chunks]
+        )
 
         # Prepare data for insertion
         data_to_insert = []
 
-        for i, chunk in enumerate(chunks):
-            # Create embedding
-            embedding = self._create_embedding(chunk["text"])
+        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
             if not embedding:
                 continue
 
-            # Generate unique int64 ID
-            # Use hash of pdf_id and chunk_index to ensure uniqueness
-            id_str = f"{pdf_id}_{i}"
-            chunk_id = abs(hash(id_str)) % (10**15)  # Ensure it fits in int64
-
-            # Prepare simplified data structure
-            # Use the fields that MilvusClient auto-schema expects
-            chunk_data = {
-                "id": chunk_id,
-                "vector": (
-                    embedding
-                ),  # MilvusClient often expects 'vector' not 'embedding'
-                "text": chunk["text"][:60000],  # Limit text size
-                "metadata": json.dumps(
-                    {
-                        "pdf_id": pdf_id,
-                        "filename": filename,
-                        "chunk_index": i,
-                        "pages": chunk["pages"],
-                        "total_chunks": len(chunks),
-                    }
-                ),
-            }
+            chunk_data = self._build_chunk_entity(
+                chunk_id=chunk["id"],
+                embedding=embedding,
+                text=chunk["text"],
+                pdf_id=pdf_id,
+                filename=filename,
+                chunk_index=i,
+                pages=chunk["pages"],
+                total_chunks=len(chunks),
+            )
 
             data_to_insert.append(chunk_data)
 
@@ -192,10 +539,8 @@ class PDFChunkingService:
                     f" {total_text_size // len(data_to_insert):,} chars"
                 )
 
-                # Insert all at once
-                self.milvus_client.insert(
-                    collection_name=self.collection_name, data=data_to_insert
-                )
+                # Upsert all at once; IDs are stable across re-ingestion
+                self._write_chunks(data_to_insert, upsert=True)
 
                 logger.info(
                     f"✅ Successfully stored {len(data_to_insert)} chunks for"
@@ -229,14 +574,7 @@ class PDFChunkingService:
                     pass  # Ignore if already loaded
 
                 # Update session state to indicate Milvus upload complete
-                import streamlit as st
-
-                if hasattr(st, "session_state"):
-                    st.session_state.pdf_milvus_upload_complete = True
-                    st.session_state.pdf_milvus_upload_filename = filename
-                    st.session_state.pdf_milvus_upload_chunks = len(
-                        data_to_insert
-                    )
+                self._mark_upload_complete(filename, len(data_to_insert))
 
                 return True
             except Exception as e:
@@ -246,6 +584,21 @@ class PDFChunkingService:
             logger.warning("⚠️ No chunks to store in Milvus")
             return False
 
+    def _mark_upload_complete(self, filename: str, chunk_count: int):
+        """Flag the Milvus upload in session state when run from a script"""
+        try:
+            import streamlit as st
+            from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+            # Background ingestion threads have no session to update
+            if get_script_run_ctx() is None:
+                return
+            st.session_state.pdf_milvus_upload_complete = True
+            st.session_state.pdf_milvus_upload_filename = filename
+            st.session_state.pdf_milvus_upload_chunks = chunk_count
+        except Exception as e:
+            logger.debug(f"Could not update session state: {e}")
+
     def _create_simple_chunks(
         self, pages: List[Dict[str, Any]], pdf_id: str
     ) -> List[Dict[str, Any]]:
@@ -314,6 +667,11 @@ class PDFChunkingService:
 
     def _create_embedding(self, text: str) -> Optional[List[float]]:
         """Create embedding for text"""
+        if embedding_cache:
+            cached = embedding_cache.get(self.embedding_model, "passage", text)
+            if cached:
+                return cached
+
         try:
             response = self.embedding_client.embeddings.create(
                 model=self.embedding_model,
@@ -325,11 +683,161 @@ class PDFChunkingService:
                     "truncate": "END",
                 },
             )
-            return response.data[0].embedding
+            embedding = response.data[0].embedding
+            if embedding_cache:
+                embedding_cache.put(
+                    self.embedding_model, "passage", text, embedding
+                )
+            return embedding
         except Exception as e:
             logger.error(f"Error creating embedding: {e}")
             return None
 
+    def _create_embeddings(
+        self, texts: List[str]
+    ) -> List[Optional[List[float]]]:
+        """
+        Create passage embeddings for many texts using batched requests
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embeddings in the same order as texts, None where a batch failed
+        """
+        if not texts:
+            return []
+
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        if embedding_cache:
+            embeddings = embedding_cache.get_many(
+                self.embedding_model, "passage", texts
+            )
+
+        missing = [i for i, vector in enumerate(embeddings) if not vector]
+        if len(missing) < len(texts):
+            logger.info(
+                f"Embedding cache provided {len(texts) - len(missing)} of"
+                f" {len(texts)} embeddings"
+            )
+        if not missing:
+            return embeddings
+
+        # Embed each distinct missing text once
+        missing_texts = list(dict.fromkeys(texts[i] for i in missing))
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            created = asyncio.run(self._create_embeddings_async(missing_texts))
+        else:
+            # Called from inside an event loop, run on a separate thread
+            future = get_shared_executor().submit(
+                asyncio.run, self._create_embeddings_async(missing_texts)
+            )
+            created = future.result()
+
+        if embedding_cache:
+            embedding_cache.put_many(
+                self.embedding_model, "passage", missing_texts, created
+            )
+
+        created_by_text = dict(zip(missing_texts, created))
+        for i in missing:
+            embeddings[i] = created_by_text[texts[i]]
+        return embeddings
+
+    async def _create_embeddings_async(
+        self, texts: List[str]
+    ) -> List[Optional[List[float]]]:
+        """
+        Embed texts in batches with a bounded number of requests in flight
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embeddings in the same order as texts, None where a batch failed
+        """
+        batches = [
+            texts[start : start + self.embedding_batch_size]
+            for start in range(0, len(texts), self.embedding_batch_size)
+        ]
+        semaphore = asyncio.Semaphore(self.embedding_max_concurrency)
+
+        logger.info(
+            f"Creating {len(texts)} embeddings in {len(batches)} batches"
+            f" (batch size {self.embedding_batch_size}, concurrency"
+            f" {self.embedding_max_concurrency})"
+        )
+
+        # The client is scoped to this event loop and closed with it
+        async with AsyncOpenAI(
+            base_url=config.env.EMBEDDING_ENDPOINT,
+            api_key=config.env.EMBEDDING_API_KEY,
+        ) as client:
+            results = await asyncio.gather(
+                *(
+                    self._embed_batch(client, batch, semaphore)
+                    for batch in batches
+                )
+            )
+
+        return [embedding for batch in results for embedding in batch]
+
+    async def _embed_batch(
+        self,
+        client: AsyncOpenAI,
+        batch: List[str],
+        semaphore: asyncio.Semaphore,
+    ) -> List[Optional[List[float]]]:
+        """
+        Embed one batch of texts, retrying with exponential backoff
+
+        Args:
+            client: Async embeddings client
+            batch: Texts in this batch
+            semaphore: Semaphore bounding concurrent requests
+
+        Returns:
+            Embeddings for the batch, all None if every attempt failed
+        """
+        max_retries = config.file_processing.PDF_EMBEDDING_MAX_RETRIES
+        backoff = config.file_processing.PDF_EMBEDDING_RETRY_BACKOFF
+
+        for attempt in range(max_retries + 1):
+            try:
+                async with semaphore:
+                    response = await client.embeddings.create(
+                        model=self.embedding_model,
+                        input=batch,
+                        encoding_format="float",
+                        extra_body={
+                            "input_type": "passage",
+                            "encoding_format": "float",
+                            "truncate": "END",
+                        },
+                    )
+                data = sorted(response.data, key=lambda item: item.index)
+                if len(data) != len(batch):
+                    raise ValueError(
+                        f"Expected {len(batch)} embeddings, got {len(data)}"
+                    )
+                return [item.embedding for item in data]
+            except Exception as e:
+                if attempt == max_retries:
+                    logger.error(
+                        f"Error creating embeddings for batch of {len(batch)}"
+                        f" after {attempt + 1} attempts: {e}"
+                    )
+                    return [None] * len(batch)
+
+                delay = backoff * (2**attempt) * (1 + random.random() / 2)
+                logger.warning(
+                    f"Embedding batch failed (attempt {attempt + 1}), retrying"
+                    f" in {delay:.1f}s: {e}"
+                )
+                await asyncio.sleep(delay)
+
     def _generate_pdf_id(self, filename: str) -> str:
         """Generate unique ID for PDF"""
         return hashlib.md5(filename.encode()).hexdigest()[:16]
@@ -347,35 +855,28 @@ class PDFChunkingService:
             if not query_embedding:
                 return []
 
-            # Search
+            # Search only this PDF's chunks
             results = self.milvus_client.search(
                 collection_name=self.collection_name,
                 data=[query_embedding],
-                limit=limit * 2,  # Get more to filter
-                output_fields=["id", "text", "metadata"],
+                filter=pdf_id_filter(pdf_id),
+                limit=limit,
+                output_fields=["id", "text", "pages", "chunk_index"],
+                partition_names=self._get_document_partitions(pdf_id),
             )
 
             if not results or not results[0]:
                 return []
 
-            # Filter by pdf_id and format results
-            relevant_chunks = []
-            for hit in results[0]:
-                metadata = json.loads(hit["entity"].get("metadata", "{}"))
-                if metadata.get("pdf_id") == pdf_id:
-                    relevant_chunks.append(
-                        {
-                            "text": hit["entity"].get("text", ""),
-                            "pages": metadata.get("pages", []),
-                            "chunk_index": metadata.get("chunk_index", 0),
-                            "score": hit["distance"],
-                        }
-                    )
-
-                    if len(relevant_chunks) >= limit:
-                        break
-
-            return relevant_chunks
+            return [
+                {
+                    "text": hit["entity"].get("text", ""),
+                    "pages": list(hit["entity"].get("pages") or []),
+                    "chunk_index": hit["entity"].get("chunk_index", 0),
+                    "score": hit["distance"],
+                }
+                for hit in results[0]
+            ]
 
         except Exception as e:
             logger.error(f"Error searching chunks: {e}")
@@ -391,31 +892,82 @@ class PDFChunkingService:
             return 0
 
         try:
-            # Get all chunks for this PDF
-            # Use JSON field access
-            all_results = self.milvus_client.query(
-                collection_name=self.collection_name,
-                filter=f'metadata["pdf_id"] == "{pdf_id}"',
-                output_fields=["id"],
-            )
-
-            if all_results:
-                ids_to_delete = [r["id"] for r in all_results]
-                # Delete by primary key IDs
-                self.milvus_client.delete(
-                    collection_name=self.collection_name, ids=ids_to_delete
+            partitions = self._get_document_partitions(pdf_id)
+            if partitions:
+                # Dropping the document's partition removes all its chunks
+                deleted = self._count_chunks(pdf_id, partitions)
+                self.milvus_client.release_partitions(
+                    collection_name=self.collection_name,
+                    partition_names=partitions,
+                )
+                self.milvus_client.drop_partition(
+                    collection_name=self.collection_name,
+                    partition_name=partitions[0],
                 )
                 logger.info(
-                    f"Deleted {len(ids_to_delete)} chunks for PDF: {pdf_id}"
+                    f"Dropped partition with {deleted} chunks for PDF:"
+                    f" {pdf_id}"
                 )
-                return len(ids_to_delete)
+                return deleted
 
-            return 0
+            # Filtered delete, pruned to one partition in partition_key mode
+            result = self.milvus_client.delete(
+                collection_name=self.collection_name,
+                filter=pdf_id_filter(pdf_id),
+            )
+            deleted = (
+                result.get("delete_count", 0)
+                if isinstance(result, dict)
+                else len(result or [])
+            )
+            if deleted:
+                logger.info(f"Deleted {deleted} chunks for PDF: {pdf_id}")
+            return deleted
 
         except Exception as e:
             logger.error(f"Error deleting chunks: {e}")
             return 0
 
+    def get_chunk_index_map(self, pdf_id: str) -> Dict[int, int]:
+        """
+        Get the stored chunk IDs of a PDF with their chunk indexes
+
+        Args:
+            pdf_id: The PDF identifier
+
+        Returns:
+            Mapping of chunk ID to chunk_index
+        """
+        if not self.milvus_client:
+            return {}
+
+        results = self.milvus_client.query(
+            collection_name=self.collection_name,
+            filter=pdf_id_filter(pdf_id),
+            output_fields=["id", "chunk_index"],
+            partition_names=self._get_document_partitions(pdf_id),
+            limit=16384,
+        )
+        return {row["id"]: row["chunk_index"] for row in results}
+
+    def delete_chunks(self, chunk_ids: List[int]) -> int:
+        """
+        Delete chunks by primary key
+
+        Args:
+            chunk_ids: IDs of the chunks to delete
+
+        Returns:
+            Number of chunks deleted
+        """
+        if not chunk_ids or not self.milvus_client:
+            return 0
+
+        self.milvus_client.delete(
+            collection_name=self.collection_name, ids=list(chunk_ids)
+        )
+        return len(chunk_ids)
+
     # Compatibility methods to match original interface
     def chunk_pdf_document(
         self, pdf_data: Dict[str, Any]
@@ -430,6 +982,8 @@ class PDFChunkingService:
         logger.info(f"Creating chunks for {filename} ({len(pages)} pages)")
         chunks = self._create_simple_chunks(pages, pdf_id)
 
+        assign_chunk_ids(chunks, pdf_id)
+
         # Add metadata to match original format
         for i, chunk in enumerate(chunks):
             chunk["chunk_index"] = i
@@ -449,41 +1003,36 @@ class PDFChunkingService:
         # Get PDF info from first chunk
         pdf_id = chunks[0].get("pdf_id")
         filename = chunks[0].get("filename", "Unknown")
+        if any("id" not in chunk for chunk in chunks):
+            assign_chunk_ids(chunks, pdf_id)
 
         logger.info(
             f"📤 Starting Milvus upload for {filename}:"
             f" {len(chunks)} pre-chunked segments"
         )
 
+        # Create embeddings in batches
+        embeddings = self._create_embeddings(
+            [chunk["text"] for chunk in chunks]
+        )
+
         # Prepare data for insertion
         data_to_insert = []
 
-        for chunk in chunks:
-            # Create embedding
-            embedding = self._create_embedding(chunk["text"])
+        for chunk, embedding in zip(chunks, embeddings):
             if not embedding:
                 continue
 
-            # Generate unique int64 ID
-            # Use hash of pdf_id and chunk_index to ensure uniqueness
-            id_str = f"{pdf_id}_{chunk['chunk_index']}"
-            chunk_id = abs(hash(id_str)) % (10**15)  # Ensure it fits in int64
-
-            # Prepare data in simplified format
-            chunk_data = {
-                "id": chunk_id,
-                "vector": embedding,
-                "text": chunk["text"][:60000],  # Limit text size
-                "metadata": json.dumps(
-                    {
-                        "pdf_id": pdf_id,
-                        "filename": filename,
-                        "chunk_index": chunk["chunk_index"],
-                        "pages": chunk["pages"],
-                        "total_chunks": chunk.get("total_chunks", len(chunks)),
-                    }
-                ),
-            }
+            chunk_data = self._build_chunk_entity(
+                chunk_id=chunk["id"],
+                embedding=embedding,
+                text=chunk["text"],
+                pdf_id=pdf_id,
+                filename=filename,
+                chunk_index=chunk["chunk_index"],
+                pages=chunk["pages"],
+                total_chunks=chunk.get("total_chunks", len(chunks)),
+            )
 
             data_to_insert.append(chunk_data)
 
@@ -493,10 +1042,8 @@ class PDFChunkingService:
                     f"📊 Uploading {len(data_to_insert)} embeddings to Milvus"
                 )
 
-                # Insert all at once
-                self.milvus_client.insert(
-                    collection_name=self.collection_name, data=data_to_insert
-                )
+                # Upsert all at once; IDs are stable across re-ingestion
+                self._write_chunks(data_to_insert, upsert=True)
 
                 logger.info(
                     f"✅ Successfully stored {len(data_to_insert)} chunks for"
@@ -517,14 +1064,7 @@ class PDFChunkingService:
                     pass  # Ignore if already loaded
 
                 # Update session state to indicate Milvus upload complete
-                import streamlit as st
-
-                if hasattr(st, "session_state"):
-                    st.session_state.pdf_milvus_upload_complete = True
-                    st.session_state.pdf_milvus_upload_filename = filename
-                    st.session_state.pdf_milvus_upload_chunks = len(
-                        data_to_insert
-                    )
+                self._mark_upload_complete(filename, len(data_to_insert))
 
                 return True
             except Exception as e:
@@ -534,41 +1074,74 @@ class PDFChunkingService:
             logger.warning("⚠️ No chunks to store in Milvus")
             return False
 
-    def get_pdf_chunk_info(self, pdf_id: str) -> Dict[str, Any]:
-        """Get information about chunks for a PDF"""
-        if not self.milvus_client:
-            return {"error": "Milvus client not initialized"}
+    def _count_chunks(
+        self, pdf_id: str, partitions: Optional[List[str]] = None
+    ) -> int:
+        """
+        Count a PDF's chunks without fetching them
 
-        try:
-            # Query all chunks for this PDF
-            # Use JSON field access
-            all_results = self.milvus_client.query(
+        Uses partition statistics for per-document partitions and a
+        server-side count(*) otherwise.
+        """
+        if partitions:
+            stats = self.milvus_client.get_partition_stats(
                 collection_name=self.collection_name,
-                filter=f'metadata["pdf_id"] == "{pdf_id}"',
-                output_fields=["id", "metadata"],
-                limit=1000,
+                partition_name=partitions[0],
             )
+            return int(stats.get("row_count", 0))
 
-            if all_results:
-                total_chunks = len(all_results)
-                all_pages = set()
+        result = self.milvus_client.query(
+            collection_name=self.collection_name,
+            filter=pdf_id_filter(pdf_id),
+            output_fields=["count(*)"],
+        )
+        return int(result[0]["count(*)"]) if result else 0
 
-                for result in all_results:
-                    metadata = json.loads(result.get("metadata", "{}"))
-                    pages = metadata.get("pages", [])
-                    all_pages.update(pages)
+    def get_pdf_chunk_info(
+        self, pdf_id: str, include_pages: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Get information about chunks for a PDF
 
-                # Get first chunk metadata for type
-                json.loads(all_results[0].get("metadata", "{}"))
+        Args:
+            pdf_id: The PDF identifier
+            include_pages: Whether to also fetch the pages covered, which
+                reads every chunk's pages field
 
-                return {
-                    "pdf_id": pdf_id,
-                    "total_chunks": total_chunks,
-                    "pages_covered": sorted(all_pages),
-                    "chunk_type": "sliding_window",
-                }
-            else:
-                return {"pdf_id": pdf_id, "total_chunks": 0}
+        Returns:
+            Dictionary with the chunk count and partition layout
+        """
+        if not self.milvus_client:
+            return {"error": "Milvus client not initialized"}
+
+        try:
+            partitions = self._get_document_partitions(pdf_id)
+            total_chunks = self._count_chunks(pdf_id, partitions)
+            if not total_chunks:
+                return {"pdf_id": pdf_id, "total_chunks": 0, "chunk_count": 0}
+
+            info = {
+                "pdf_id": pdf_id,
+                "total_chunks": total_chunks,
+                "chunk_count": total_chunks,
+                "chunk_type": "sliding_window",
+                "partition_mode": self.partition_mode,
+                "partition": partitions[0] if partitions else None,
+            }
+
+            if include_pages:
+                all_pages = set()
+                for result in self.milvus_client.query(
+                    collection_name=self.collection_name,
+                    filter=pdf_id_filter(pdf_id),
+                    output_fields=["pages"],
+                    partition_names=partitions,
+                    limit=16384,
+                ):
+                    all_pages.update(result.get("pages") or [])
+                info["pages_covered"] = sorted(all_pages)
+
+            return info
 
         except Exception as e:
             logger.error(f"Error getting chunk info: {e}")
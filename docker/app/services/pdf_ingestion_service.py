@@ -5,12 +5,13 @@ Handles the ingestion of PDF documents into the system, including:
 – Content-based ID generation for deduplication
 – Storage coordination with FileStorageService
 – Chunking coordination with PDFChunkingService
-– Safe to call multiple times; if pdf_id already exists, chunks are replaced.
+– Safe to call multiple times; if pdf_id already exists, only changed
+  chunks are embedded and upserted and stale chunks are removed.
 """
 
 import logging
 import uuid
-from typing import Any, BinaryIO, Dict
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
 
 from models.chat_config import ChatConfig
 from services.file_storage_service import FileStorageService
@@ -19,6 +20,10 @@ from utils.pdf_id_generator import generate_pdf_id, get_existing_pdf_info
 
 logger = logging.getLogger(__name__)
 
+# Called as progress_callback(stage, info) with stage one of "store", "chunk",
+# "embed" or "index" and info holding pdf_id, completed and total counts
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+
 
 class PDFIngestionService:
     """
@@ -44,6 +49,7 @@ class PDFIngestionService:
         session_id: str,
         pdf_content: BinaryIO = None,
         check_existing: bool = True,
+        progress_callback: Optional[ProgressCallback] = None,
     ) -> Dict[str, Any]:
         """Ingest PDF data (already extracted by NVIngest) and return ingestion
         metadata.
@@ -54,9 +60,11 @@ class PDFIngestionService:
             filename: Original filename.
             session_id: User session identifier (for storage scoping).
             pdf_content: Optional PDF file content for content-based ID
-                        generation.
+                        generation when pdf_data carries no pdf_id.
             check_existing: Whether to check if PDF already exists (enables
                            deduplication).
+            progress_callback: Optional callback receiving stage progress;
+                chunks become searchable group by group during "index".
 
         Returns:
             Dict containing pdf_id, total_pages, char_count, chunk_count.
@@ -80,8 +88,13 @@ class PDFIngestionService:
             "Processing %s chars across %s pages", total_chars, len(pages)
         )
 
-        # 2. Generate content-based pdf_id if possible
-        if pdf_content:
+        # 2. Generate content-based pdf_id if possible, reusing the ID
+        # FileController derived from the digest computed while spooling
+        content_based_id = bool(pdf_data.get("pdf_id") or pdf_content)
+        if pdf_data.get("pdf_id"):
+            pdf_id = pdf_data["pdf_id"]
+            logger.info(f"Using content-based ID from extraction: {pdf_id}")
+        elif pdf_content:
             pdf_id = generate_pdf_id(pdf_content, filename)
             logger.info(f"Generated content-based ID: {pdf_id}")
         else:
@@ -93,28 +106,15 @@ class PDFIngestionService:
 
         # 3. Check if PDF already exists and handle based on configuration
         pdf_exists = False
-        if pdf_content:
+        if content_based_id:
             existing_info = get_existing_pdf_info(pdf_id, self.file_storage)
             if existing_info:
                 if check_existing:
                     # Configuration says to re-upload existing PDFs
                     logger.info(
-                        f"PDF already exists: {pdf_id} - will replace it"
+                        f"PDF already exists: {pdf_id} - will update it"
                     )
                     pdf_exists = True
-                    # Delete existing chunks from Milvus before re-ingesting
-                    try:
-                        deleted = self.chunking_service.delete_pdf_chunks(
-                            pdf_id
-                        )
-                        logger.info(
-                            f"Deleted {deleted} existing chunks for PDF "
-                            f"{pdf_id}"
-                        )
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to delete existing chunks: {e}"
-                        )
                 else:
                     # Configuration says to skip existing PDFs
                     logger.info(
@@ -145,12 +145,12 @@ class PDFIngestionService:
         }
 
         # Store via FileStorageService
+        self._report_progress(progress_callback, "store", pdf_id, 0, 1)
         self.file_storage.store_pdf(filename, storage_data, session_id)
+        self._report_progress(progress_callback, "store", pdf_id, 1, 1)
 
-        # 5. Chunk and store in vector database
-        chunking_success = self.chunking_service.chunk_and_store_pdf(
-            storage_data
-        )
+        # 5. Chunk and store changed chunks in vector database
+        chunking_success = self._sync_chunks(storage_data, progress_callback)
 
         if not chunking_success:
             raise RuntimeError(
@@ -180,6 +180,102 @@ class PDFIngestionService:
             "skipped_existing": False,
         }
 
+    @staticmethod
+    def _report_progress(
+        progress_callback: Optional[ProgressCallback],
+        stage: str,
+        pdf_id: str,
+        completed: int,
+        total: int,
+    ) -> None:
+        """Send stage progress to the callback, never failing ingestion."""
+        if not progress_callback:
+            return
+        try:
+            progress_callback(
+                stage,
+                {"pdf_id": pdf_id, "completed": completed, "total": total},
+            )
+        except Exception as e:
+            logger.debug(f"Progress callback failed: {e}")
+
+    def _sync_chunks(
+        self,
+        storage_data: Dict[str, Any],
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> bool:
+        """Embed and upsert only new or moved chunks, then drop stale ones.
+
+        Chunk IDs are derived from the pdf_id and chunk text, so chunks that
+        are already stored at the same position are left untouched. Changed
+        chunks are embedded and indexed in groups, so the first chunks are
+        searchable before the whole document is done.
+
+        Args:
+            storage_data: PDF data with pdf_id, filename and pages.
+            progress_callback: Optional callback receiving stage progress.
+
+        Returns:
+            True if the vector store matches the new chunks.
+        """
+        pdf_id = storage_data["pdf_id"]
+        self._report_progress(progress_callback, "chunk", pdf_id, 0, 1)
+        chunks = self.chunking_service.chunk_pdf_document(storage_data)
+        if not chunks:
+            logger.warning("No chunks created for PDF %s", pdf_id)
+            return False
+        self._report_progress(progress_callback, "chunk", pdf_id, 1, 1)
+
+        try:
+            existing = self.chunking_service.get_chunk_index_map(pdf_id)
+        except Exception as e:
+            logger.warning(f"Could not read existing chunks for {pdf_id}: {e}")
+            existing = {}
+
+        changed: List[Dict[str, Any]] = [
+            chunk
+            for chunk in chunks
+            if existing.get(chunk["id"]) != chunk["chunk_index"]
+        ]
+        stale_ids = set(existing) - {chunk["id"] for chunk in chunks}
+
+        logger.info(
+            "PDF %s: %s chunks, %s new or changed, %s unchanged, %s stale",
+            pdf_id,
+            len(chunks),
+            len(changed),
+            len(chunks) - len(changed),
+            len(stale_ids),
+        )
+
+        # One group keeps every concurrent embedding batch busy
+        group_size = (
+            self.chunking_service.embedding_batch_size
+            * self.chunking_service.embedding_max_concurrency
+        )
+        for start in range(0, len(changed), group_size):
+            group = changed[start : start + group_size]
+            self._report_progress(
+                progress_callback, "embed", pdf_id, start, len(changed)
+            )
+            if not self.chunking_service.store_chunks_with_embeddings(group):
+                return False
+            self._report_progress(
+                progress_callback,
+                "index",
+                pdf_id,
+                start + len(group),
+                len(changed),
+            )
+
+        if stale_ids:
+            try:
+                self.chunking_service.delete_chunks(list(stale_ids))
+            except Exception as e:
+                logger.warning(f"Failed to delete stale chunks: {e}")
+
+        return True
+
     def _ensure_pdf_links_collection(self):
         """Ensure the PDF links collection exists in Milvus"""
         try:
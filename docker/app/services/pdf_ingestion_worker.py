@@ -0,0 +1,240 @@
+"""
+PDF Ingestion Worker
+
+Runs PDF ingestion in the background on the shared executor pool so uploads
+no longer block the Streamlit script run and survive browser reconnects.
+Each job moves through the extract, store, chunk, embed and index stages and
+records its progress in a thread-safe registry that the UI polls.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from models.chat_config import ChatConfig
+from utils.config import config
+from utils.executor_pool import shared_executor_pool
+from utils.upload_spool import SpooledUpload
+
+logger = logging.getLogger(__name__)
+
+INGESTION_STAGES = ("extract", "store", "chunk", "embed", "index")
+
+# Share of overall progress at which each stage starts and ends
+_STAGE_SPANS = {
+    "extract": (0.0, 0.3),
+    "store": (0.3, 0.35),
+    "chunk": (0.35, 0.4),
+    "embed": (0.4, 1.0),
+    "index": (0.4, 1.0),
+}
+
+_STAGE_MESSAGES = {
+    "extract": "Extracting text",
+    "store": "Storing document",
+    "chunk": "Chunking text",
+    "embed": "Creating embeddings",
+    "index": "Indexing chunks",
+}
+
+
+@dataclass
+class IngestionJob:
+    """Progress of one background PDF ingestion"""
+
+    job_id: str
+    filename: str
+    session_id: str
+    status: str = "queued"  # queued, running, completed, error
+    stage: Optional[str] = None
+    progress: float = 0.0
+    message: str = "Queued"
+    pdf_id: Optional[str] = None
+    indexed_chunks: int = 0
+    total_chunks: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+
+class PDFIngestionWorker:
+    """Background PDF ingestion with pollable per-stage progress"""
+
+    def __init__(self):
+        self._jobs: Dict[str, IngestionJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        upload: SpooledUpload,
+        session_id: str,
+        check_existing: bool = True,
+    ) -> str:
+        """
+        Queue a PDF for background ingestion
+
+        The worker takes ownership of the spooled upload and deletes it once
+        the job finishes.
+
+        Args:
+            upload: PDF spooled to disk with its content digest
+            session_id: Session the upload belongs to
+            check_existing: Whether to re-ingest PDFs that already exist
+
+        Returns:
+            Job ID to poll with get_job
+        """
+        self._prune_finished_jobs()
+
+        job = IngestionJob(
+            job_id=uuid.uuid4().hex,
+            filename=upload.name,
+            session_id=session_id,
+        )
+        with self._lock:
+            self._jobs[job.job_id] = job
+
+        shared_executor_pool.submit(
+            self._run, job.job_id, upload, check_existing
+        )
+        logger.info(
+            f"Queued background ingestion of {upload.name} ({job.job_id})"
+        )
+        return job.job_id
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a snapshot of a job's progress
+
+        Args:
+            job_id: ID returned by submit
+
+        Returns:
+            Job fields as a dictionary, or None if unknown
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return asdict(job) if job else None
+
+    def get_session_jobs(self, session_id: str) -> List[Dict[str, Any]]:
+        """Get snapshots of all jobs for a session, oldest first"""
+        with self._lock:
+            jobs = [
+                asdict(job)
+                for job in self._jobs.values()
+                if job.session_id == session_id
+            ]
+        return sorted(jobs, key=lambda job: job["created_at"])
+
+    def _update(self, job_id: str, **changes) -> None:
+        """Apply changes to a job under the lock"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job:
+                return
+            for name, value in changes.items():
+                setattr(job, name, value)
+            job.updated_at = time.time()
+
+    def _update_stage(
+        self, job_id: str, stage: str, completed: int = 0, total: int = 1
+    ) -> None:
+        """Record progress within a stage"""
+        start, end = _STAGE_SPANS[stage]
+        fraction = completed / total if total else 1.0
+        message = _STAGE_MESSAGES[stage]
+        if stage in ("embed", "index"):
+            message = f"{message} ({completed}/{total})"
+        self._update(
+            job_id,
+            status="running",
+            stage=stage,
+            progress=start + (end - start) * fraction,
+            message=message,
+        )
+
+    def _run(self, job_id: str, upload: SpooledUpload, check_existing: bool):
+        """Run all ingestion stages for a job"""
+        # Imported here to keep the worker importable without Milvus
+        from controllers.file_controller import FileController
+        from services.pdf_ingestion_service import PDFIngestionService
+
+        job = self.get_job(job_id)
+        if not job:
+            upload.cleanup()
+            return
+
+        try:
+            chat_config = ChatConfig.from_environment()
+
+            self._update_stage(job_id, "extract")
+            success, pdf_data = FileController(chat_config).process_pdf_upload(
+                upload
+            )
+            if not success:
+                raise RuntimeError(
+                    pdf_data.get("error", "Failed to extract PDF text")
+                )
+            self._update_stage(job_id, "extract", 1, 1)
+
+            def on_progress(stage: str, info: Dict[str, Any]) -> None:
+                self._update_stage(
+                    job_id, stage, info["completed"], info["total"]
+                )
+                changes = {"pdf_id": info["pdf_id"]}
+                if stage == "index":
+                    changes["indexed_chunks"] = info["completed"]
+                    changes["total_chunks"] = info["total"]
+                self._update(job_id, **changes)
+
+            # pdf_data carries the content-based ID from the spool digest
+            result = PDFIngestionService(chat_config).ingest(
+                pdf_data=pdf_data,
+                filename=job["filename"],
+                session_id=job["session_id"],
+                check_existing=check_existing,
+                progress_callback=on_progress,
+            )
+
+            self._update(
+                job_id,
+                status="completed",
+                stage=None,
+                progress=1.0,
+                message="Completed",
+                pdf_id=result["pdf_id"],
+                result=result,
+            )
+            logger.info(
+                f"Background ingestion of {job['filename']} completed"
+                f" ({job_id})"
+            )
+
+        except Exception as e:
+            logger.error(
+                f"Background ingestion of {job['filename']} failed: {e}",
+                exc_info=True,
+            )
+            self._update(job_id, status="error", message=str(e), error=str(e))
+        finally:
+            upload.cleanup()
+
+    def _prune_finished_jobs(self) -> None:
+        """Forget finished jobs older than the retention period"""
+        cutoff = time.time() - config.file_processing.PDF_INGESTION_JOB_TTL
+        with self._lock:
+            for job_id in [
+                job_id
+                for job_id, job in self._jobs.items()
+                if job.status in ("completed", "error")
+                and job.updated_at < cutoff
+            ]:
+                del self._jobs[job_id]
+
+
+# Global worker instance shared by all sessions in this process
+pdf_ingestion_worker = PDFIngestionWorker()
@@ -17,6 +17,7 @@ from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
 from models.chat_config import ChatConfig
+from services.pdf_chunking_service import pdf_id_filter, pdf_partition_name
 from tools.retriever import EmbeddingCreator, SearchConfig, SimilaritySearch
 from utils.config import config as app_config
 
@@ -43,7 +44,7 @@ class PDFSearchConfig(SearchConfig):
         output_fields: List[str] = None,
     ):
         if output_fields is None:
-            output_fields = ["id", "text", "metadata"]
+            output_fields = ["id", "text", "pages", "metadata"]
 
         super().__init__(
             collection_name=collection_name,
@@ -128,55 +129,41 @@ class PDFQueryServiceV2:
         )
         logger.debug("Generated embedding for query")
 
-        # Update search config to filter by pdf_id
-        # Note: Milvus doesn't support JSON field filtering directly in community edition
-        # So we'll search all and filter manually (keeping existing behavior)
-        search_results = self.milvus.search(embedding_response)
+        # Search only this PDF's chunks via the scalar pdf_id field
+        search_results = self.milvus.search(
+            embedding_response,
+            filter=pdf_id_filter(pdf_id),
+            partition_names=self._get_partition_names(pdf_id),
+        )
 
         if not search_results or not search_results[0]:
             logger.info("No search results found for query")
             return {"chunks": [], "used": False, "formatted_context": ""}
 
-        # Process results - filter by pdf_id and convert to PDFChunkMatch
+        # Convert results to PDFChunkMatch
         matches: List[PDFChunkMatch] = []
-        for result in search_results[0]:
+        for result in search_results[0][:limit]:
             # Extract entity data
             entity = result.get("entity", result)
 
-            # Get metadata and check pdf_id
-            metadata_str = entity.get("metadata", "{}")
-            try:
-                metadata = json.loads(metadata_str)
-                if metadata.get("pdf_id") != pdf_id:
-                    continue
-
-                # Extract page range from metadata
-                pages = metadata.get("pages", [])
-                if pages:
-                    page_range = (
-                        f"{pages[0]}-{pages[-1]}"
-                        if len(pages) > 1
-                        else str(pages[0])
-                    )
-                else:
-                    page_range = "unknown"
-
-                # Create match object
-                matches.append(
-                    PDFChunkMatch(
-                        chunk_id=str(entity.get("id", "")),
-                        page_range=page_range,
-                        text=entity.get("text", ""),
-                        distance=result.get("distance", 0.0),
-                    )
+            pages = list(entity.get("pages") or [])
+            if pages:
+                page_range = (
+                    f"{pages[0]}-{pages[-1]}"
+                    if len(pages) > 1
+                    else str(pages[0])
                 )
-
-                if len(matches) >= limit:
-                    break
-
-            except json.JSONDecodeError as e:
-                logger.warning(f"Failed to parse metadata: {e}")
-                continue
+            else:
+                page_range = "unknown"
+
+            matches.append(
+                PDFChunkMatch(
+                    chunk_id=str(entity.get("id", "")),
+                    page_range=page_range,
+                    text=entity.get("text", ""),
+                    distance=result.get("distance", 0.0),
+                )
+            )
 
         logger.info(
             "PDFQueryService: found %d matches for pdf_id '%s'",
@@ -225,6 +212,24 @@ class PDFQueryServiceV2:
             "unique_chunks": unique_count,
         }
 
+    def _get_partition_names(self, pdf_id: str) -> Optional[List[str]]:
+        """Get the PDF's own partition when using per-document partitions"""
+        if (
+            app_config.file_processing.PDF_MILVUS_PARTITION_MODE
+            != "per_document"
+        ):
+            return None
+        partition_name = pdf_partition_name(pdf_id)
+        try:
+            if self.milvus.client.has_partition(
+                collection_name=self.search_config.collection_name,
+                partition_name=partition_name,
+            ):
+                return [partition_name]
+        except Exception as e:
+            logger.debug(f"Could not check partition {partition_name}: {e}")
+        return None
+
     def update_search_config(self, **kwargs) -> None:
         """
         Update search configuration parameters.
@@ -0,0 +1,202 @@
+"""
+Storage Eviction Engine
+
+Keeps FileStorageService within its configured bounds by evicting stored
+images and PDFs in a background thread:
+
+1. Files not accessed within the max age (TTL)
+2. Least recently used files of sessions over their quota
+3. Least recently used files while the total size exceeds the cap
+
+Files explicitly pinned are never evicted, and neither are files used by
+any session seen recently, so live conversations keep the images and
+documents they reference even when an idle session shares them. Sessions
+over their quota are trimmed once they are no longer live.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from services.file_catalog import FileCatalog
+from utils.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class StorageEvictionEngine:
+    """Incremental background eviction with metrics"""
+
+    def __init__(
+        self,
+        catalog: FileCatalog,
+        delete_file: Callable[[Dict[str, Any]], None],
+    ):
+        """
+        Initialize the eviction engine
+
+        Args:
+            catalog: Catalog of stored files
+            delete_file: Callback deleting a file given its catalog entry
+        """
+        self.catalog = catalog
+        self._delete_file = delete_file
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "passes": 0,
+            "files_evicted": 0,
+            "bytes_reclaimed": 0,
+            "evicted_by_reason": {"ttl": 0, "session_quota": 0, "size_cap": 0},
+            "last_pass_ms": 0.0,
+            "max_pass_ms": 0.0,
+            "errors": 0,
+        }
+
+    def start(self) -> None:
+        """Start the background eviction thread if not already running"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="storage_eviction", daemon=True
+        )
+        self._thread.start()
+        logger.info("Started storage eviction thread")
+
+    def stop(self) -> None:
+        """Stop the background eviction thread"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        """Run eviction passes until stopped"""
+        interval = config.storage.EVICTION_INTERVAL_SECONDS
+        while not self._stop_event.wait(interval):
+            try:
+                self.run_pass()
+            except Exception as e:
+                with self._metrics_lock:
+                    self._metrics["errors"] += 1
+                logger.error(f"Storage eviction pass failed: {e}")
+
+    def run_pass(self) -> int:
+        """
+        Run one bounded eviction pass
+
+        At most EVICTION_BATCH_SIZE files are evicted per pass so a large
+        backlog is worked off incrementally.
+
+        Returns:
+            Number of files evicted
+        """
+        storage_config = config.storage
+        start = time.perf_counter()
+        now = time.time()
+        live_since = now - storage_config.LIVE_SESSION_SECONDS
+        budget = storage_config.EVICTION_BATCH_SIZE
+        evicted = 0
+
+        # 1. Files past their max age
+        if storage_config.MAX_AGE_SECONDS > 0:
+            expired = self.catalog.find_expired(
+                now - storage_config.MAX_AGE_SECONDS, live_since, budget
+            )
+            evicted += self._evict(expired, "ttl")
+
+        # 2. Sessions over their quota
+        quota = storage_config.SESSION_QUOTA_BYTES
+        if quota > 0:
+            for session_id, size in self.catalog.get_sessions_over_quota(
+                quota
+            ):
+                if evicted >= budget:
+                    break
+                candidates = self.catalog.find_session_least_recent(
+                    session_id, live_since, budget - evicted
+                )
+                evicted += self._evict(
+                    self._take_until_freed(candidates, size - quota),
+                    "session_quota",
+                )
+
+        # 3. Total size cap
+        cap = storage_config.MAX_TOTAL_BYTES
+        excess = self.catalog.get_total_size() - cap
+        if cap > 0 and excess > 0 and evicted < budget:
+            candidates = self.catalog.find_least_recent(
+                live_since, budget - evicted
+            )
+            evicted += self._evict(
+                self._take_until_freed(candidates, excess), "size_cap"
+            )
+
+        self.catalog.prune_sessions(live_since)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._metrics_lock:
+            self._metrics["passes"] += 1
+            self._metrics["last_pass_ms"] = elapsed_ms
+            self._metrics["max_pass_ms"] = max(
+                self._metrics["max_pass_ms"], elapsed_ms
+            )
+        if evicted:
+            logger.info(
+                f"Storage eviction pass evicted {evicted} files in"
+                f" {elapsed_ms:.1f}ms"
+            )
+        return evicted
+
+    @staticmethod
+    def _take_until_freed(
+        candidates: List[Dict[str, Any]], bytes_needed: int
+    ) -> List[Dict[str, Any]]:
+        """Take LRU candidates until enough bytes would be freed"""
+        selected = []
+        freed = 0
+        for entry in candidates:
+            if freed >= bytes_needed:
+                break
+            selected.append(entry)
+            freed += entry["size_bytes"]
+        return selected
+
+    def _evict(self, entries: List[Dict[str, Any]], reason: str) -> int:
+        """Delete files and record metrics"""
+        evicted = 0
+        reclaimed = 0
+        for entry in entries:
+            try:
+                self._delete_file(entry)
+            except Exception as e:
+                logger.warning(f"Could not evict {entry['file_id']}: {e}")
+                continue
+            evicted += 1
+            reclaimed += entry["size_bytes"]
+            logger.debug(f"Evicted {entry['file_id']} ({reason})")
+
+        with self._metrics_lock:
+            self._metrics["files_evicted"] += evicted
+            self._metrics["bytes_reclaimed"] += reclaimed
+            self._metrics["evicted_by_reason"][reason] += evicted
+        return evicted
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get eviction metrics
+
+        Returns:
+            Dictionary with pass count, files evicted (total and by reason),
+            bytes reclaimed, pass latency and current total stored size
+        """
+        with self._metrics_lock:
+            metrics = {
+                **self._metrics,
+                "evicted_by_reason": dict(self._metrics["evicted_by_reason"]),
+            }
+        metrics["total_size"] = self.catalog.get_total_size()
+        return metrics
@@ -6,6 +6,7 @@ a simplified approach that avoids complex threading patterns.
 """
 
 import logging
+from types import SimpleNamespace
 from typing import Any, AsyncGenerator, Dict, List, Optional
 
 from models.chat_config import ChatConfig
@@ -181,147 +182,395 @@ class StreamingService:
             )
 
             # Collect chunks to build complete response
-            collected_content = ""
-            collected_tool_calls = {}
-            finish_reason = None
-            response_id = None
-            response_model = model
-            created_time = None
-
+            accumulator = CompletionAccumulator(model)
             async for chunk in response_stream:
-                # Collect response metadata from first chunk
-                if response_id is None and hasattr(chunk, "id"):
-                    response_id = chunk.id
-                if created_time is None and hasattr(chunk, "created"):
-                    created_time = chunk.created
-                if hasattr(chunk, "model"):
-                    response_model = chunk.model
-
-                if chunk.choices:
-                    choice = chunk.choices[0]
-
-                    # Collect content
-                    if (
-                        hasattr(choice.delta, "content")
-                        and choice.delta.content
-                    ):
-                        collected_content += choice.delta.content
-
-                    # Collect tool calls
-                    if (
-                        hasattr(choice.delta, "tool_calls")
-                        and choice.delta.tool_calls
-                    ):
-                        for tool_call_delta in choice.delta.tool_calls:
-                            # Handle index - might be None for single calls
-                            idx = getattr(tool_call_delta, "index", 0)
-                            if idx is None:
-                                idx = 0
-
-                            if idx not in collected_tool_calls:
-                                collected_tool_calls[idx] = {
-                                    "id": "",
-                                    "type": "function",
-                                    "function": {"name": "", "arguments": ""},
-                                }
-
-                            tc = collected_tool_calls[idx]
-
-                            # Update ID if provided
-                            if (
-                                hasattr(tool_call_delta, "id")
-                                and tool_call_delta.id
-                            ):
-                                tc["id"] = tool_call_delta.id
-
-                            # Update function details
-                            if hasattr(tool_call_delta, "function"):
-                                func = tool_call_delta.function
-
-                                # Update name if provided (only comes once)
-                                if (
-                                    hasattr(func, "name")
-                                    and func.name is not None
-                                ):
-                                    tc["function"]["name"] = func.name
-
-                                # Append arguments if provided
-                                if (
-                                    hasattr(func, "arguments")
-                                    and func.arguments is not None
-                                ):
-                                    # Log each argument chunk for debugging
-                                    logger.debug(
-                                        "Tool call %d (%s) - appending "
-                                        "arguments chunk: %s (length: %d)",
-                                        idx,
-                                        tc["function"]["name"] or "unknown",
-                                        repr(func.arguments),
-                                        len(tc["function"]["arguments"]),
-                                    )
-                                    tc["function"][
-                                        "arguments"
-                                    ] += func.arguments
-
-                    # Get finish reason
-                    if (
-                        hasattr(choice, "finish_reason")
-                        and choice.finish_reason
-                    ):
-                        finish_reason = choice.finish_reason
-
-            # Build response object that mimics the non-streaming
-            # response structure. This allows the parsing service
-            # to work without modification
-            from types import SimpleNamespace
-
-            # Convert collected tool calls to list
-            tool_calls_list = []
-            for idx in sorted(collected_tool_calls.keys()):
-                tc = collected_tool_calls[idx]
-                # Log the collected arguments for debugging
-                if tc["function"]["arguments"]:
-                    logger.debug(
-                        "Tool call %d (%s) arguments: %s",
-                        idx,
-                        tc["function"]["name"],
-                        repr(tc["function"]["arguments"]),
-                    )
-                tool_call_obj = SimpleNamespace(
-                    id=tc["id"],
-                    type=tc["type"],
-                    function=SimpleNamespace(
-                        name=tc["function"]["name"],
-                        arguments=tc["function"]["arguments"],
-                    ),
-                )
-                tool_calls_list.append(tool_call_obj)
+                accumulator.add_chunk(chunk)
+
+            return accumulator.build_response()
+
+        except Exception as e:
+            mode = "streaming" if stream else "non-streaming"
+            logger.error("%s completion error: %s", mode.capitalize(), e)
+            raise StreamingError(
+                f"Failed to get {mode} completion: {e}"
+            ) from e
 
-            # Build message object
-            message = SimpleNamespace(
-                content=collected_content if collected_content else None,
-                tool_calls=tool_calls_list if tool_calls_list else None,
+    async def stream_tool_selection(
+        self,
+        messages: List[Dict[str, Any]],
+        model: str,
+        model_type: str,
+        tools: List[Dict[str, Any]],
+        tool_choice: Optional[Any] = "auto",
+        **kwargs,
+    ) -> "ToolSelectionStream":
+        """
+        Start a streamed tool-selection completion
+
+        The returned stream decides from the first chunks whether the model
+        is calling tools or answering directly, so text answers can be
+        forwarded without a second completion.
+
+        Args:
+            messages: Conversation messages
+            model: Model name
+            model_type: Type of model to use
+            tools: Tool definitions
+            tool_choice: How to handle tool selection
+            **kwargs: Additional parameters for the API
+
+        Returns:
+            ToolSelectionStream wrapping the response stream
+        """
+        client = self.get_client(model_type, async_client=True)
+
+        logger.debug(
+            "Streaming tool selection - model_type: %s, model: %s, "
+            "tool_choice: %s",
+            model_type,
+            model,
+            tool_choice,
+        )
+
+        try:
+            api_params = {
+                "model": model,
+                "messages": messages,
+                "stream": True,
+                **config.get_llm_parameters(),
+                **kwargs,
+                "tools": tools,
+                "tool_choice": tool_choice,
+                "parallel_tool_calls": True,
+            }
+            response_stream = await client.chat.completions.create(
+                **api_params
             )
+        except Exception as e:
+            logger.error("Streaming tool selection error: %s", e)
+            raise StreamingError(
+                f"Failed to start streaming tool selection: {e}"
+            ) from e
+
+        return ToolSelectionStream(
+            response_stream,
+            model,
+            decision_chars=config.llm.STREAMING_SELECTION_DECISION_CHARS,
+        )
+
+
+class CompletionAccumulator:
+    """Accumulates streamed chat completion chunks into a full response"""
+
+    def __init__(self, model: str):
+        """
+        Initialize the accumulator
 
-            # Build choice object
-            choice = SimpleNamespace(
-                index=0, message=message, finish_reason=finish_reason
+        Args:
+            model: Requested model name (used until a chunk reports one)
+        """
+        self._content_parts: List[str] = []
+        self._tool_calls: Dict[int, Dict[str, Any]] = {}
+        self.finish_reason = None
+        self.response_id = None
+        self.response_model = model
+        self.created_time = None
+
+    @property
+    def content(self) -> str:
+        """Content collected so far"""
+        return "".join(self._content_parts)
+
+    @property
+    def has_tool_calls(self) -> bool:
+        """Whether any tool call deltas have been received"""
+        return bool(self._tool_calls)
+
+    def add_chunk(self, chunk: Any) -> str:
+        """
+        Add a stream chunk to the accumulated response
+
+        Args:
+            chunk: Chat completion chunk
+
+        Returns:
+            Content delta carried by the chunk (empty string if none)
+        """
+        # Collect response metadata from first chunk
+        if self.response_id is None and hasattr(chunk, "id"):
+            self.response_id = chunk.id
+        if self.created_time is None and hasattr(chunk, "created"):
+            self.created_time = chunk.created
+        if hasattr(chunk, "model"):
+            self.response_model = chunk.model
+
+        if not chunk.choices:
+            return ""
+
+        choice = chunk.choices[0]
+        content_delta = ""
+
+        # Collect content
+        if hasattr(choice.delta, "content") and choice.delta.content:
+            content_delta = choice.delta.content
+            self._content_parts.append(content_delta)
+
+        # Collect tool calls
+        if hasattr(choice.delta, "tool_calls") and choice.delta.tool_calls:
+            for tool_call_delta in choice.delta.tool_calls:
+                self._add_tool_call_delta(tool_call_delta)
+
+        # Get finish reason
+        if hasattr(choice, "finish_reason") and choice.finish_reason:
+            self.finish_reason = choice.finish_reason
+
+        return content_delta
+
+    def _add_tool_call_delta(self, tool_call_delta: Any) -> None:
+        """Merge a tool call delta into the collected tool calls"""
+        # Handle index - might be None for single calls
+        idx = getattr(tool_call_delta, "index", 0)
+        if idx is None:
+            idx = 0
+
+        if idx not in self._tool_calls:
+            self._tool_calls[idx] = {
+                "id": "",
+                "type": "function",
+                "function": {"name": "", "arguments": ""},
+            }
+
+        tc = self._tool_calls[idx]
+
+        # Update ID if provided
+        if hasattr(tool_call_delta, "id") and tool_call_delta.id:
+            tc["id"] = tool_call_delta.id
+
+        # Update function details
+        if hasattr(tool_call_delta, "function"):
+            func = tool_call_delta.function
+
+            # Update name if provided (only comes once)
+            if hasattr(func, "name") and func.name is not None:
+                tc["function"]["name"] = func.name
+
+            # Append arguments if provided
+            if hasattr(func, "arguments") and func.arguments is not None:
+                # Log each argument chunk for debugging
+                logger.debug(
+                    "Tool call %d (%s) - appending "
+                    "arguments chunk: %s (length: %d)",
+                    idx,
+                    tc["function"]["name"] or "unknown",
+                    repr(func.arguments),
+                    len(tc["function"]["arguments"]),
+                )
+                tc["function"]["arguments"] += func.arguments
+
+    def build_response(self) -> Any:
+        """
+        Build a response object that mimics the non-streaming response
+
+        This allows the parsing service to work without modification.
+
+        Returns:
+            Response object with content and tool calls
+        """
+        # Convert collected tool calls to list
+        tool_calls_list = []
+        for idx in sorted(self._tool_calls.keys()):
+            tc = self._tool_calls[idx]
+            # Log the collected arguments for debugging
+            if tc["function"]["arguments"]:
+                logger.debug(
+                    "Tool call %d (%s) arguments: %s",
+                    idx,
+                    tc["function"]["name"],
+                    repr(tc["function"]["arguments"]),
+                )
+            tool_call_obj = SimpleNamespace(
+                id=tc["id"],
+                type=tc["type"],
+                function=SimpleNamespace(
+                    name=tc["function"]["name"],
+                    arguments=tc["function"]["arguments"],
+                ),
             )
+            tool_calls_list.append(tool_call_obj)
+
+        content = self.content
+
+        # Build message object
+        message = SimpleNamespace(
+            content=content if content else None,
+            tool_calls=tool_calls_list if tool_calls_list else None,
+        )
+
+        # Build choice object
+        choice = SimpleNamespace(
+            index=0, message=message, finish_reason=self.finish_reason
+        )
+
+        # Build response object
+        return SimpleNamespace(
+            id=self.response_id,
+            object="chat.completion",
+            created=self.created_time,
+            model=self.response_model,
+            choices=[choice],
+        )
+
+
+class ToolSelectionStream:
+    """
+    Streamed tool-selection completion
+
+    Content deltas are held back until the stream is clearly a text answer:
+    enough visible text has arrived, outside any think block, without a
+    custom tool call marker. The stream switches to tool execution as soon
+    as tool call deltas appear.
+    """
+
+    _CUSTOM_TOOL_CALL_MARKER = "<toolcall"
+
+    def __init__(
+        self, response_stream: Any, model: str, decision_chars: int = 64
+    ):
+        """
+        Initialize the tool selection stream
+
+        Args:
+            response_stream: Async iterable of chat completion chunks
+            model: Requested model name
+            decision_chars: Visible characters required before the stream
+                is treated as a text answer
+        """
+        self._stream = response_stream
+        self._iterator = response_stream.__aiter__()
+        self._accumulator = CompletionAccumulator(model)
+        self._decision_chars = decision_chars
+        self._pending: List[str] = []
+        self._exhausted = False
+        self.is_tool_call: Optional[bool] = None
+
+    async def _read_chunk(self) -> Optional[str]:
+        """Read the next chunk, returning its content delta or None at end"""
+        if self._exhausted:
+            return None
+        try:
+            chunk = await self._iterator.__anext__()
+        except StopAsyncIteration:
+            self._exhausted = True
+            return None
+        return self._accumulator.add_chunk(chunk)
+
+    def _looks_like_text_answer(self) -> bool:
+        """Check if the buffered content is clearly a direct text answer"""
+        content = self._accumulator.content
+        lowered = content.lower()
+
+        # Wait for think blocks to close before judging the answer
+        think_end = lowered.rfind("</think>")
+        if lowered.rfind("<think>") > think_end:
+            return False
+        visible = (
+            content[think_end + len("</think>") :]
+            if think_end >= 0
+            else content
+        )
+
+        if self._CUSTOM_TOOL_CALL_MARKER in visible.lower():
+            return False
+        return len(visible.strip()) >= self._decision_chars
 
-            # Build response object
-            response = SimpleNamespace(
-                id=response_id,
-                object="chat.completion",
-                created=created_time,
-                model=response_model,
-                choices=[choice],
+    async def detect(self) -> bool:
+        """
+        Read the stream until it is clear how the model is responding
+
+        Returns:
+            True if the model is calling tools, False for a text answer
+        """
+        try:
+            while self.is_tool_call is None:
+                delta = await self._read_chunk()
+                if delta is None:
+                    # Whole response arrived before a decision was possible
+                    content = self._accumulator.content.lower()
+                    self.is_tool_call = (
+                        self._accumulator.has_tool_calls
+                        or self._CUSTOM_TOOL_CALL_MARKER in content
+                    )
+                elif self._accumulator.has_tool_calls:
+                    self.is_tool_call = True
+                else:
+                    if delta:
+                        self._pending.append(delta)
+                    if self._looks_like_text_answer():
+                        self.is_tool_call = False
+        except Exception as e:
+            logger.error("Streaming tool selection error: %s", e)
+            raise StreamingError(
+                f"Failed to stream tool selection: {e}"
+            ) from e
+
+        return self.is_tool_call
+
+    async def text_chunks(self) -> AsyncGenerator[str, None]:
+        """
+        Yield the text answer, starting with content held back by detect()
+
+        Yields:
+            Response chunks
+        """
+        if self.is_tool_call is None:
+            await self.detect()
+
+        pending, self._pending = self._pending, []
+        if pending:
+            yield "".join(pending)
+
+        try:
+            while True:
+                delta = await self._read_chunk()
+                if delta is None:
+                    break
+                if delta:
+                    yield delta
+        except Exception as e:
+            logger.error("Streaming error: %s", e)
+            raise StreamingError(f"Failed to stream response: {e}") from e
+
+        if self._accumulator.has_tool_calls:
+            logger.warning(
+                "Tool calls arrived after the text answer was streamed -"
+                " ignoring them"
             )
 
-            return response
+    async def collect(self) -> Any:
+        """
+        Read the rest of the stream and build the full response
 
+        Returns:
+            Response object compatible with ResponseParsingService
+        """
+        try:
+            while await self._read_chunk() is not None:
+                pass
         except Exception as e:
-            mode = "streaming" if stream else "non-streaming"
-            logger.error("%s completion error: %s", mode.capitalize(), e)
+            logger.error("Streaming tool selection error: %s", e)
             raise StreamingError(
-                f"Failed to get {mode} completion: {e}"
+                f"Failed to stream tool selection: {e}"
             ) from e
+        return self._accumulator.build_response()
+
+    async def aclose(self) -> None:
+        """Stop reading and release the underlying response stream"""
+        self._exhausted = True
+        close = getattr(self._stream, "close", None)
+        if close is not None:
+            try:
+                result = close()
+                if hasattr(result, "__await__"):
+                    await result
+            except Exception as e:
+                logger.debug("Error closing tool selection stream: %s", e)
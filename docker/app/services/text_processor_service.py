@@ -13,6 +13,7 @@ from typing import Dict, List, Optional
 from models.chat_config import ChatConfig
 from services.llm_client_service import llm_client_service
 from utils.config import config as app_config
+from utils.token_counter import get_token_counter
 
 logger = logging.getLogger(__name__)
 
@@ -62,7 +63,7 @@ class TextProcessorService:
         """
         try:
             # Check if the text is too large for direct processing
-            estimated_tokens = len(text) // 4  # Rough token estimation
+            estimated_tokens = get_token_counter().count(text)
             max_tokens = (
                 32000  # Conservative limit to stay well under model limits
             )
@@ -179,7 +180,7 @@ class TextProcessorService:
 
         try:
             # Check if the text is too large for direct processing
-            estimated_tokens = len(text) // 4  # Rough token estimation
+            estimated_tokens = get_token_counter().count(text)
             max_tokens = (
                 100000  # Conservative limit to stay well under model limits
             )
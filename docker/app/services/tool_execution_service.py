@@ -332,6 +332,9 @@ class ToolExecutionService:
                     modified_args["image_base64"] = (
                         st.session_state.current_image_base64
                     )
+                    modified_args["image_id"] = getattr(
+                        st.session_state, "current_image_id", None
+                    )
                     modified_args["filename"] = getattr(
                         st.session_state, "current_image_filename", "Unknown"
                     )
@@ -360,6 +363,9 @@ class ToolExecutionService:
                             modified_args["image_base64"] = latest_image[
                                 "image_data"
                             ]
+                            modified_args["image_id"] = latest_image.get(
+                                "image_id"
+                            )
                             modified_args["filename"] = latest_image.get(
                                 "filename", "Unknown"
                             )
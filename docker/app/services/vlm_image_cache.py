@@ -0,0 +1,104 @@
+"""
+VLM Image Cache
+
+Memoizes VLM preprocessing of images that are not in file storage (stored
+images use their persisted "vlm" derivative instead). Preprocessed images
+are keyed by the SHA-256 of the source bytes and the target tile geometry,
+kept in a byte-budgeted memory cache and persisted to disk, so follow-up
+questions about the same image skip the resize and PNG encode entirely.
+"""
+
+import base64
+import hashlib
+import logging
+import os
+import uuid
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image
+from services.file_cache import FileCache
+from utils.config import config
+from utils.image_derivatives import render_derivative, vlm_target_size
+
+logger = logging.getLogger(__name__)
+
+
+class VLMImageCache:
+    """Two-level cache of VLM-ready images"""
+
+    def __init__(self, cache_dir: str, max_files: int, memory_bytes: int):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory holding the persisted images
+            max_files: Maximum number of persisted images
+            memory_bytes: Memory budget for base64 payloads
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_files = max(1, max_files)
+        self.memory = FileCache(memory_bytes)
+        self.disk_hits = 0
+
+    def get_or_render(self, image_base64: str) -> str:
+        """
+        Get the VLM-ready form of an image, rendering it on a miss
+
+        Args:
+            image_base64: Base64 encoded source image
+
+        Returns:
+            Base64 encoded tile-aligned PNG
+        """
+        image_bytes = base64.b64decode(image_base64)
+        # Opening only parses the header, the pixels are not decoded
+        with Image.open(BytesIO(image_bytes)) as img:
+            width, height = vlm_target_size(*img.size)
+        key = f"{hashlib.sha256(image_bytes).hexdigest()}_{width}x{height}"
+
+        processed_base64 = self.memory.get("vlm", key)
+        if processed_base64:
+            logger.debug(f"VLM image cache memory hit for {key}")
+            return processed_base64
+
+        path = self.cache_dir / f"{key}.png"
+        if path.exists():
+            processed = path.read_bytes()
+            self.disk_hits += 1
+            logger.debug(f"VLM image cache disk hit for {key}")
+        else:
+            processed = render_derivative(image_bytes, "vlm")
+            self._persist(path, processed)
+
+        processed_base64 = base64.b64encode(processed).decode("utf-8")
+        self.memory.put("vlm", key, processed_base64, len(processed_base64))
+        return processed_base64
+
+    def _persist(self, path: Path, processed: bytes) -> None:
+        """Write a processed image and trim the oldest files"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+            tmp_path.write_bytes(processed)
+            os.replace(tmp_path, path)
+
+            files = sorted(
+                self.cache_dir.glob("*.png"), key=lambda f: f.stat().st_mtime
+            )
+            for old_file in files[: len(files) - self.max_files]:
+                old_file.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not persist VLM image {path.name}: {e}")
+
+    def get_stats(self):
+        """Get memory cache statistics and the disk hit count"""
+        return {**self.memory.get_stats(), "disk_hits": self.disk_hits}
+
+
+# Global cache instance shared by all sessions in this process
+vlm_image_cache = VLMImageCache(
+    config.file_processing.VLM_IMAGE_CACHE_PATH,
+    config.file_processing.VLM_IMAGE_CACHE_MAX_FILES,
+    config.file_processing.VLM_IMAGE_CACHE_MEMORY_BYTES,
+)
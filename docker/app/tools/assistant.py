@@ -16,6 +16,7 @@ from services.document_analyzer_service import DocumentAnalyzerService
 from services.text_processor_service import TextProcessorService, TextTaskType
 from services.translation_service import TranslationService
 from tools.base import BaseTool, BaseToolResponse, ToolController, ToolView
+from utils.event_loop import background_loop
 from utils.pdf_extractor import PDFDataExtractor
 from utils.text_processing import strip_think_tags
 
@@ -79,13 +80,7 @@ class AssistantController(ToolController):
 
     def process(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Process synchronously by delegating to async method"""
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        return loop.run_until_complete(self.process_async(params))
+        return background_loop.run(self.process_async(params))
 
     async def process_async(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Process the assistant request asynchronously"""
@@ -110,8 +105,14 @@ class AssistantController(ToolController):
 
         # Route to appropriate handler
         if task_enum == AssistantTaskType.TRANSLATE:
-            return self._handle_translation(
-                text, source_language, target_language, messages
+            # Translation uses the blocking client, so keep it off the
+            # shared event loop
+            return await asyncio.to_thread(
+                self._handle_translation,
+                text,
+                source_language,
+                target_language,
+                messages,
             )
         elif task_enum == AssistantTaskType.ANALYZE:
             return await self._handle_analysis(text, instructions, messages)
@@ -325,12 +326,17 @@ class AssistantController(ToolController):
             # Direct approach: Load all batch files for the current PDF
             from models.chat_config import ChatConfig
             from services.file_storage_service import FileStorageService
+            from services.paged_pdf_store import PAGED_PDF_SUFFIX
 
             ChatConfig.from_environment()
             file_storage = FileStorageService()
 
             # Get all PDF files and find the most recent one
-            pdf_files = list(file_storage.pdfs_dir.glob("*.json"))
+            pdf_files = [
+                f
+                for f in file_storage.pdfs_dir.iterdir()
+                if f.suffix in (".json", PAGED_PDF_SUFFIX)
+            ]
             if not pdf_files:
                 logger.warning("No PDF files found")
                 return context_pages
@@ -13,6 +13,7 @@ from typing import Any, Dict, List, Literal, Optional, Type
 
 from pydantic import BaseModel, Field
 from pydantic import ValidationError as PydanticValidationError
+from utils.event_loop import background_loop
 from utils.exceptions import ValidationError
 
 logger = logging.getLogger(__name__)
@@ -209,40 +210,23 @@ class BaseTool(ABC):
 
     def _execute_async_wrapper(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Wrapper to execute async methods in sync context"""
+        logger.info(
+            f"Executing {self.name} async with timeout={self.timeout}s"
+            " on the background event loop"
+        )
         try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        try:
-            if loop.is_running():
-                # If loop is already running, use run_coroutine_threadsafe
-                logger.info(
-                    f"Executing {self.name} async with timeout={self.timeout}s"
-                    " in running loop"
-                )
-                future = asyncio.run_coroutine_threadsafe(
-                    self._execute_controller_async(params), loop
-                )
-                result = future.result(timeout=self.timeout)
-                logger.info(
-                    f"Async execution of {self.name} completed successfully"
-                )
-                return result
-            else:
-                # If no loop is running, use run_until_complete
-                logger.info(f"Executing {self.name} async in new loop")
-                return loop.run_until_complete(
-                    self._execute_controller_async(params)
-                )
-        except asyncio.TimeoutError:
+            result = background_loop.run(
+                self._execute_controller_async(params), timeout=self.timeout
+            )
+        except TimeoutError:
             logger.error(
                 f"Timeout executing {self.name} after {self.timeout}s"
             )
             raise TimeoutError(
                 f"Execution timed out after {self.timeout} seconds"
             )
+        logger.info(f"Async execution of {self.name} completed successfully")
+        return result
 
     async def _execute_controller_async(
         self, params: Dict[str, Any]
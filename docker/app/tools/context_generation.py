@@ -5,14 +5,11 @@ This tool generates contextually modified images based on an input image
 and text prompt.
 """
 
-import base64
-import io
 import logging
 import os
 from typing import Any, Dict, Optional, Type
 
-import requests
-from openai import OpenAI
+import httpx
 from pydantic import Field
 from tools.base import BaseTool, BaseToolResponse, ExecutionMode
 
@@ -227,35 +224,22 @@ class ContextGenerationTool(BaseTool):
                 **response_dict, result=json.dumps(response_dict)
             )
 
+        from services.image_generation_client import image_generation_client
+
         try:
             # Check if using OpenAI API
             if "api.openai.com" in endpoint:
                 logger.info("Using OpenAI API for image editing")
                 logger.info("Editing image with prompt: '%s'", prompt)
 
-                # Initialize OpenAI client with the API key
-                client = OpenAI(api_key=api_key)
-
-                # Convert base64 image to bytes for OpenAI API
-                image_bytes = base64.b64decode(image_base64)
-                image_file = io.BytesIO(image_bytes)
-                image_file.name = (  # OpenAI requires a filename
-                    "edit_image.png"
-                )
-
-                # Use OpenAI's image edit API
-                response = client.images.edit(
-                    model="gpt-image-1",
-                    image=image_file,
-                    prompt=prompt,
-                    n=1,
-                    input_fidelity="high",
-                    quality="high",
+                # Edit over the shared connection pool
+                generated_image_data = (
+                    image_generation_client.edit_openai_image(
+                        api_key, image_base64, prompt, timeout=self.timeout
+                    )
                 )
 
-                # Get the base64 data from response
-                if response.data and len(response.data) > 0:
-                    generated_image_data = response.data[0].b64_json
+                if generated_image_data:
                     logger.info("Image edited successfully via OpenAI API")
 
                     # Create successful response
@@ -315,16 +299,10 @@ class ContextGenerationTool(BaseTool):
                     seed,
                 )
 
-                # Make request
-                response = requests.post(
-                    endpoint,
-                    headers=headers,
-                    json=payload,
-                    timeout=self.timeout,
+                # Make request over the shared connection pool
+                response_body = image_generation_client.post_json(
+                    endpoint, payload, headers=headers, timeout=self.timeout
                 )
-                response.raise_for_status()
-
-                response_body = response.json()
                 logger.info("Context generation completed successfully")
 
                 # Log response structure for debugging
@@ -443,10 +421,10 @@ class ContextGenerationTool(BaseTool):
                     result=json.dumps(result_dict),
                 )
 
-        except requests.exceptions.HTTPError as e:
+        except httpx.HTTPStatusError as e:
             logger.error("HTTP error in context generation: %s", e)
             error_message = f"Context generation API error: {e}"
-            if e.response:
+            if e.response is not None:
                 try:
                     error_detail = e.response.json()
                     error_message = (
@@ -153,6 +153,7 @@ class ConversationContextController(ToolController):
             config,
             params.get("focus_query"),
             params.get("pdf_data"),
+            params.get("previous_summary"),
         )
 
     async def process_async(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -202,6 +203,7 @@ class ConversationContextController(ToolController):
             config,
             params.get("focus_query"),
             params.get("pdf_data"),
+            params.get("previous_summary"),
         )
 
         # Return streaming response data
@@ -227,6 +229,7 @@ class ConversationContextController(ToolController):
         config: ChatConfig,
         focus_query: Optional[str] = None,
         pdf_data: Dict[str, Any] = None,
+        previous_summary: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Analyze conversation context using LLM (non-streaming)
@@ -237,6 +240,8 @@ class ConversationContextController(ToolController):
             config: Chat configuration
             focus_query: Optional specific aspect to focus on
             pdf_data: Optional PDF data being discussed
+            previous_summary: Optional running summary to update with the
+                given messages (conversation summaries only)
 
         Returns:
             Analysis results dictionary
@@ -288,6 +293,14 @@ class ConversationContextController(ToolController):
                         "Analyze document-related aspects of this"
                         f" conversation:\n\n{conversation_text}"
                     )
+            elif previous_summary:  # Incremental CONVERSATION_SUMMARY
+                user_message = (
+                    "Update this running conversation summary with the new"
+                    " messages below and identify if the latest message"
+                    " requires action. Return the complete updated"
+                    f" summary.\n\nCurrent summary:\n{previous_summary}\n\n"
+                    f"New messages:\n{conversation_text}"
+                )
             else:  # CONVERSATION_SUMMARY
                 user_message = (
                     "Summarize this conversation and identify if the latest"
@@ -355,6 +368,7 @@ class ConversationContextController(ToolController):
         config: ChatConfig,
         focus_query: Optional[str] = None,
         pdf_data: Dict[str, Any] = None,
+        previous_summary: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Analyze conversation context using LLM with streaming (collects full response)
@@ -364,7 +378,12 @@ class ConversationContextController(ToolController):
         """
         collected_result = ""
         async for chunk in self._analyze_conversation_context_streaming(
-            context_type, messages, config, focus_query, pdf_data
+            context_type,
+            messages,
+            config,
+            focus_query,
+            pdf_data,
+            previous_summary,
         ):
             collected_result += chunk
 
@@ -392,6 +411,7 @@ class ConversationContextController(ToolController):
         config: ChatConfig,
         focus_query: Optional[str] = None,
         pdf_data: Dict[str, Any] = None,
+        previous_summary: Optional[str] = None,
     ) -> AsyncGenerator[str, None]:
         """
         Stream conversation context analysis using LLM
@@ -402,6 +422,8 @@ class ConversationContextController(ToolController):
             config: Chat configuration
             focus_query: Optional specific aspect to focus on
             pdf_data: Optional PDF data being discussed
+            previous_summary: Optional running summary to update with the
+                given messages (conversation summaries only)
 
         Yields:
             Analysis response chunks
@@ -457,6 +479,14 @@ class ConversationContextController(ToolController):
                         "Analyze document-related aspects of this"
                         f" conversation:\n\n{conversation_text}"
                     )
+            elif previous_summary:  # Incremental CONVERSATION_SUMMARY
+                user_message = (
+                    "Update this running conversation summary with the new"
+                    " messages below and identify if the latest message"
+                    " requires action. Return the complete updated"
+                    f" summary.\n\nCurrent summary:\n{previous_summary}\n\n"
+                    f"New messages:\n{conversation_text}"
+                )
             else:  # CONVERSATION_SUMMARY
                 user_message = (
                     "Summarize this conversation and identify if the latest"
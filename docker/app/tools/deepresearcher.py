@@ -24,6 +24,7 @@ from tools.base import (
     ToolView,
 )
 from tools.registry import execute_tool
+from utils.event_loop import background_loop
 from utils.text_processing import strip_think_tags
 
 logger = logging.getLogger(__name__)
@@ -219,13 +220,7 @@ class DeepResearchController(ToolController):
 
     def process(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Process synchronously by delegating to async method"""
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        return loop.run_until_complete(self.process_async(params))
+        return background_loop.run(self.process_async(params))
 
     async def process_async(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Process the deep research request asynchronously"""
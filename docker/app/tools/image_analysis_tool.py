@@ -120,6 +120,7 @@ class ImageAnalysisTool(BaseTool):
 
         # First check if image data was passed in params
         image_base64 = params.get("image_base64")
+        image_id = params.get("image_id")
         filename = params.get("filename", "Unknown")
 
         # If not in params, check session state
@@ -146,28 +147,22 @@ class ImageAnalysisTool(BaseTool):
 
             # Get image data from session state
             image_base64 = st.session_state.current_image_base64
+            image_id = getattr(st.session_state, "current_image_id", None)
             filename = getattr(
                 st.session_state, "current_image_filename", "Unknown"
             )
 
         logger.info(f"Analyzing image: {filename}")
-        logger.debug(f"Image base64 length: {len(image_base64)}")
-
-        # Log the actual size of the image being sent to VLM
-        import base64
-
-        try:
-            image_bytes = base64.b64decode(image_base64)
-            logger.debug(
-                "Image size being sent to VLM:"
-                f" {len(image_bytes) / 1024:.2f} KB"
-            )
-        except Exception as e:
-            logger.error(f"Failed to decode base64 for size check: {e}")
+        logger.debug(
+            f"Image base64 length: {len(image_base64)}"
+            f" (~{len(image_base64) * 3 / 4 / 1024:.2f} KB)"
+        )
 
         try:
             # Analyze the image
-            analysis = self._analyze_image_with_llm(image_base64, question)
+            analysis = self._analyze_image_with_llm(
+                image_base64, question, image_id
+            )
 
             return ImageAnalysisResponse(
                 success=True,
@@ -199,6 +194,7 @@ class ImageAnalysisTool(BaseTool):
 
         # First check if image data was passed in params
         image_base64 = params.get("image_base64")
+        image_id = params.get("image_id")
         filename = params.get("filename", "Unknown")
 
         # If not in params, check session state
@@ -228,29 +224,21 @@ class ImageAnalysisTool(BaseTool):
 
             # Get image data from session state
             image_base64 = st.session_state.current_image_base64
+            image_id = getattr(st.session_state, "current_image_id", None)
             filename = getattr(
                 st.session_state, "current_image_filename", "Unknown"
             )
 
         logger.info(f"Analyzing image: {filename}")
-        logger.debug(f"Image base64 length: {len(image_base64)}")
-
-        # Log the actual size of the image being sent to VLM
-        import base64
-
-        try:
-            image_bytes = base64.b64decode(image_base64)
-            logger.debug(
-                "Image size being sent to VLM:"
-                f" {len(image_bytes) / 1024:.2f} KB"
-            )
-        except Exception as e:
-            logger.error(f"Failed to decode base64 for size check: {e}")
+        logger.debug(
+            f"Image base64 length: {len(image_base64)}"
+            f" (~{len(image_base64) * 3 / 4 / 1024:.2f} KB)"
+        )
 
         try:
             # Create streaming generator for image analysis
             content_generator = self._analyze_image_with_llm_streaming(
-                image_base64, question
+                image_base64, question, image_id
             )
 
             return StreamingImageAnalysisResponse(
@@ -278,13 +266,16 @@ class ImageAnalysisTool(BaseTool):
                 direct_response=True,
             )
 
-    def _analyze_image_with_llm(self, image_base64: str, question: str) -> str:
+    def _analyze_image_with_llm(
+        self, image_base64: str, question: str, image_id: str = None
+    ) -> str:
         """
         Analyze image using vision-capable LLM
 
         Args:
             image_base64: Base64 encoded image data
             question: Question about the image
+            image_id: Stored image ID, used to reuse its VLM derivative
 
         Returns:
             Analysis result as string
@@ -298,7 +289,7 @@ class ImageAnalysisTool(BaseTool):
             from utils.text_processing import StreamingThinkTagFilter
 
             # Resize image using 12-tile constraint system
-            processed_base64 = self._preprocess_image_for_vlm(image_base64)
+            processed_base64 = self._get_vlm_image(image_base64, image_id)
 
             config_obj = ChatConfig.from_environment()
 
@@ -369,7 +360,7 @@ class ImageAnalysisTool(BaseTool):
             raise Exception(f"Failed to analyze image with LLM: {str(e)}")
 
     async def _analyze_image_with_llm_streaming(
-        self, image_base64: str, question: str
+        self, image_base64: str, question: str, image_id: str = None
     ) -> AsyncGenerator[str, None]:
         """
         Analyze image using vision-capable LLM with true streaming
@@ -377,6 +368,7 @@ class ImageAnalysisTool(BaseTool):
         Args:
             image_base64: Base64 encoded image data
             question: Question about the image
+            image_id: Stored image ID, used to reuse its VLM derivative
 
         Yields:
             Analysis response chunks as they arrive
@@ -391,7 +383,7 @@ class ImageAnalysisTool(BaseTool):
 
             # Resize image using 12-tile constraint system
             processed_base64 = await asyncio.to_thread(
-                self._preprocess_image_for_vlm, image_base64
+                self._get_vlm_image, image_base64, image_id
             )
 
             config_obj = ChatConfig.from_environment()
@@ -459,114 +451,50 @@ class ImageAnalysisTool(BaseTool):
             logger.error(f"Streaming LLM image analysis failed: {e}")
             yield f"Error analyzing image: {str(e)}"
 
-    def _preprocess_image_for_vlm(self, image_base64: str) -> str:
+    def _get_vlm_image(self, image_base64: str, image_id: str = None) -> str:
         """
-        Preprocess image for VLM with 12-tile constraint system
+        Get the VLM-ready image, preferring the stored VLM derivative
 
         Args:
             image_base64: Base64 encoded image data
+            image_id: Stored image ID, if the image is in file storage
 
         Returns:
-            Processed base64 image string
+            Base64 encoded tile-aligned PNG
         """
-        try:
+        if image_id:
             # Import here to avoid circular imports
             import base64
-            from io import BytesIO
-            from PIL import Image
 
-            # Decode base64 to PIL Image
-            image_bytes = base64.b64decode(image_base64)
-            img = Image.open(BytesIO(image_bytes))
+            from services.file_storage_service import FileStorageService
 
-            original_width, original_height = img.size
-            original_aspect = original_width / original_height
-
-            logger.info(
-                "VLM preprocessing - Original image dimensions:"
-                f" {original_width}x{original_height}, aspect ratio:"
-                f" {original_aspect:.3f}"
+            derivative = FileStorageService().get_image_derivative(
+                image_id, "vlm"
             )
+            if derivative:
+                logger.info(f"Using stored VLM derivative of {image_id}")
+                return base64.b64encode(derivative).decode("utf-8")
 
-            # Find best tile configuration (w_tiles × h_tiles ≤ 12) that maintains closest aspect ratio
-            # with maximum dimension constraint of 3072 pixels
-            best_tiles = (1, 1)
-            best_aspect_diff = float("inf")
-            max_dimension = 3072
-            tile_size = 512
-            max_tiles_per_dimension = (
-                max_dimension // tile_size
-            )  # 6 tiles max per dimension
-
-            for w_tiles in range(1, max_tiles_per_dimension + 1):
-                for h_tiles in range(1, max_tiles_per_dimension + 1):
-                    if w_tiles * h_tiles > 12:
-                        break
-
-                    tile_aspect = w_tiles / h_tiles
-                    aspect_diff = abs(original_aspect - tile_aspect)
-
-                    if aspect_diff < best_aspect_diff:
-                        best_aspect_diff = aspect_diff
-                        best_tiles = (w_tiles, h_tiles)
-
-            # Calculate target dimensions
-            target_width = best_tiles[0] * 512
-            target_height = best_tiles[1] * 512
-
-            # Ensure minimum 32x32
-            target_width = max(target_width, 32)
-            target_height = max(target_height, 32)
-
-            # Check if resizing is needed
-            if (
-                original_width != target_width
-                or original_height != target_height
-            ):
-                # Resize image
-                resized_img = img.resize(
-                    (target_width, target_height), Image.Resampling.LANCZOS
-                )
+        return self._preprocess_image_for_vlm(image_base64)
 
-                logger.info(
-                    "Resized image for VLM from"
-                    f" {original_width}x{original_height} to"
-                    f" {target_width}x{target_height} (tiles:"
-                    f" {best_tiles[0]}x{best_tiles[1]})"
-                )
-            else:
-                resized_img = img
-                logger.info(
-                    "Image already at target size:"
-                    f" {target_width}x{target_height}"
-                )
+    def _preprocess_image_for_vlm(self, image_base64: str) -> str:
+        """
+        Preprocess image for VLM with 12-tile constraint system
 
-            # Convert to RGB and encode (lossless PNG format)
-            buffer = BytesIO()
-            if resized_img.mode in ("RGBA", "LA", "P"):
-                # Convert to RGB (no alpha channel support)
-                rgb_img = Image.new("RGB", resized_img.size, (255, 255, 255))
-                rgb_img.paste(
-                    resized_img,
-                    mask=(
-                        resized_img.split()[-1]
-                        if resized_img.mode == "RGBA"
-                        else None
-                    ),
-                )
-                resized_img = rgb_img
+        Results are memoized by content hash and target tile geometry, so
+        repeated questions about the same image skip the image work.
 
-            resized_img.save(buffer, format="PNG")
-            buffer.seek(0)
-            resized_bytes = buffer.getvalue()
-            processed_base64 = base64.b64encode(resized_bytes).decode("utf-8")
+        Args:
+            image_base64: Base64 encoded image data
 
-            logger.info(
-                "VLM image size after processing:"
-                f" {len(resized_bytes) / 1024:.2f} KB"
-            )
+        Returns:
+            Processed base64 image string
+        """
+        try:
+            # Import here to avoid circular imports
+            from services.vlm_image_cache import vlm_image_cache
 
-            return processed_base64
+            return vlm_image_cache.get_or_render(image_base64)
 
         except Exception as e:
             logger.error(
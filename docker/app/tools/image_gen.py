@@ -1,12 +1,19 @@
+import asyncio
+import json
 import logging
 from typing import Any, Dict, List, Optional, Tuple, Type
 
 from models.chat_config import ChatConfig
-from openai import OpenAI
-from PIL import Image
 from pydantic import Field
-from tools.base import BaseTool, BaseToolResponse, ExecutionMode
-from utils.image import generate_image
+from tools.base import (
+    BaseTool,
+    BaseToolResponse,
+    ExecutionMode,
+    ToolController,
+    ToolView,
+)
+from utils.event_loop import background_loop
+from utils.image import agenerate_image
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -20,6 +27,9 @@ ASPECT_RATIO_MAPPINGS = {
 
 ALLOWED_ASPECT_RATIOS = list(ASPECT_RATIO_MAPPINGS.keys())
 
+# Image generation can take longer than other tools
+IMAGE_GENERATION_TIMEOUT = 120.0
+
 
 def get_dimensions_from_aspect_ratio(aspect_ratio: str) -> Tuple[int, int]:
     """
@@ -82,138 +92,37 @@ class ImageGenerationResponse(BaseToolResponse):
     )
 
 
-class ImageGenerationTool(BaseTool):
-    """Tool for generating images with AI"""
+class ImageGenerationController(ToolController):
+    """Controller for image generation"""
 
-    def __init__(self):
-        super().__init__()
-        self.name = "generate_image"
-        self.description = (
-            "Generate images or visualizations from text descriptions. Use"
-            " when user requests creating, generating, making, or drawing"
-            " images or other visuals. OK to use for graphs, charts or signs"
-            " with text."
-        )
-        self.supported_contexts = ["image_generation"]
-        self.execution_mode = (
-            ExecutionMode.SYNC
-        )  # Image generation is synchronous
-        self.timeout = 120.0  # Image generation can take longer
+    def __init__(self, timeout: float):
+        self.timeout = timeout
 
-    def _initialize_mvc(self):
-        """Initialize MVC components"""
-        # This tool doesn't need separate MVC components as it's simple
-        self._controller = None
-        self._view = None
+    def process(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Process synchronously by delegating to async method"""
+        return background_loop.run(self.process_async(params))
 
-    def get_definition(self) -> Dict[str, Any]:
-        """
-        Return OpenAI-compatible tool definition
-
-        Returns:
-            Dict containing the OpenAI-compatible tool definition
-        """
-        return {
-            "type": "function",
-            "function": {
-                "name": self.name,
-                "description": self.description,
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "user_prompt": {
-                            "type": "string",
-                            "description": (
-                                "The user's original message requesting image"
-                                " generation"
-                            ),
-                        },
-                        "aspect_ratio": {
-                            "type": "string",
-                            "description": (
-                                "Aspect ratio for the image. Choose based on"
-                                " the content: 'square' for balanced"
-                                " compositions, social media posts, or general"
-                                " purpose images; 'portrait' for vertical"
-                                " subjects like people, tall buildings, or"
-                                " phone wallpapers; 'landscape' for wide"
-                                " scenes, natural vistas, or desktop"
-                                " wallpapers."
-                            ),
-                            "enum": ALLOWED_ASPECT_RATIOS,
-                            "default": "square",
-                        },
-                        "use_conversation_context": {
-                            "type": "boolean",
-                            "description": (
-                                "Whether to use conversation history to"
-                                " enhance the prompt. Useful for generating"
-                                " images related to ongoing discussions or"
-                                " stories."
-                            ),
-                            "default": True,
-                        },
-                        "but_why": {
-                            "type": "integer",
-                            "description": (
-                                "An integer from 1-5 where a larger number"
-                                " indicates confidence this is the right tool"
-                                " to help the user."
-                            ),
-                        },
-                        "enhanced_prompt": {
-                            "type": "string",
-                            "description": (
-                                "The enhanced/rewritten prompt to use for"
-                                " image generation. If the original user"
-                                " prompt is already detailed and well-formed,"
-                                " you can use it as-is. Otherwise, enhance it"
-                                " with more specific details, artistic"
-                                " direction, and visual elements to improve"
-                                " the image generation result."
-                            ),
-                        },
-                    },
-                    "required": [
-                        "user_prompt",
-                        "aspect_ratio",
-                        "use_conversation_context",
-                        "but_why",
-                        "enhanced_prompt",
-                    ],
-                },
-            },
-        }
-
-    def get_response_type(self) -> Type[ImageGenerationResponse]:
-        """Get the response type for this tool"""
-        return ImageGenerationResponse
-
-    def _execute_sync(self, params: Dict[str, Any]) -> ImageGenerationResponse:
-        """Execute the tool synchronously"""
+    async def process_async(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate the image, awaiting the endpoint on the event loop"""
         user_prompt = params.get("user_prompt")
         aspect_ratio = params.get("aspect_ratio", "square")
+        cfg_scale = params.get("cfg_scale", 3.5)
         use_conversation_context = params.get("use_conversation_context", True)
         enhanced_prompt = params.get("enhanced_prompt", user_prompt)
         messages = params.get("messages")
 
         # Create config from environment
         config = ChatConfig.from_environment()
-        return self.generate_image_from_prompt(
+        return await self.generate_image_from_prompt(
             user_prompt,
             aspect_ratio,
-            3.5,
+            cfg_scale,
             use_conversation_context,
             enhanced_prompt,
             config,
             messages,
         )
 
-    def execute(self, params: Dict[str, Any]) -> ImageGenerationResponse:
-        """Execute the tool with given parameters"""
-        # This tool doesn't use MVC pattern, so execute directly
-        return self._execute_sync(params)
-
     def _get_conversation_context(
         self, messages: List[Dict[str, Any]]
     ) -> Optional[Dict[str, Any]]:
@@ -269,14 +178,14 @@ class ImageGenerationTool(BaseTool):
             logger.error("Error retrieving conversation context: %s", e)
             return None
 
-    def _generate_image_with_config(
+    async def _generate_image_with_config(
         self,
         enhanced_prompt: str,
         config: ChatConfig,
         width: int = 1204,
         height: int = 1204,
         cfg_scale: float = 3.5,
-    ) -> Optional[Image.Image]:
+    ) -> Optional[str]:
         """
         Generate image using the enhanced prompt and configuration
 
@@ -288,12 +197,14 @@ class ImageGenerationTool(BaseTool):
             cfg_scale: Guidance scale for image generation (1.5-4.5)
 
         Returns:
-            Generated PIL Image or None if failed
+            Base64 encoded image as returned by the API, or None if failed
         """
         if not config.image_endpoint:
             logger.error("Image generation endpoint not configured")
             return None
 
+        from services.image_generation_client import image_generation_client
+
         try:
             # Check if using OpenAI API
             if "api.openai.com" in config.image_endpoint:
@@ -305,25 +216,21 @@ class ImageGenerationTool(BaseTool):
                     height,
                 )
 
-                # Initialize OpenAI client
-                client = OpenAI(api_key=config.image_api_key)
-
                 # Convert dimensions to OpenAI size format
                 size = get_openai_size_string(width, height)
                 logger.info("Using OpenAI size format: %s", size)
 
-                # Generate image using OpenAI API
-                response = client.images.generate(
-                    model="gpt-image-1",
-                    prompt=enhanced_prompt,
-                    n=1,
-                    size=size,
-                    moderation="low",
+                # Generate image over the shared connection pool
+                # The OpenAI client is synchronous, so keep it off the loop
+                image_b64 = await asyncio.to_thread(
+                    image_generation_client.generate_openai_image,
+                    config.image_api_key,
+                    enhanced_prompt,
+                    size,
+                    timeout=self.timeout,
                 )
 
-                # Get the base64 data from response
-                if response.data and len(response.data) > 0:
-                    image_b64 = response.data[0].b64_json
+                if image_b64:
                     logger.info("Image generated successfully via OpenAI API")
                     return image_b64  # Return base64 string directly
                 else:
@@ -340,13 +247,13 @@ class ImageGenerationTool(BaseTool):
                     height,
                     cfg_scale,
                 )
-                generated_image = generate_image(
+                generated_image = await agenerate_image(
                     invoke_url=config.image_endpoint,
                     prompt=enhanced_prompt,
                     width=width,
                     height=height,
                     cfg_scale=cfg_scale,
-                    return_bytes_io=False,
+                    timeout=self.timeout,
                 )
 
                 if generated_image:
@@ -360,7 +267,7 @@ class ImageGenerationTool(BaseTool):
             logger.error("Error during image generation: %s", e)
             return None
 
-    def generate_image_from_prompt(
+    async def generate_image_from_prompt(
         self,
         user_prompt: str,
         aspect_ratio: str,
@@ -369,7 +276,7 @@ class ImageGenerationTool(BaseTool):
         enhanced_prompt: str,
         config: ChatConfig = None,
         messages: List[Dict[str, Any]] = None,
-    ) -> ImageGenerationResponse:
+    ) -> Dict[str, Any]:
         """
         Generate an image based on user prompt with enhancement
 
@@ -383,7 +290,7 @@ class ImageGenerationTool(BaseTool):
             messages: Optional conversation messages for context
 
         Returns:
-            ImageGenerationResponse with the result
+            Fields of the ImageGenerationResponse with the result
         """
         if config is None:
             config = ChatConfig.from_environment()
@@ -410,7 +317,10 @@ class ImageGenerationTool(BaseTool):
         # Get conversation context if requested and available
         conversation_context = None
         if use_conversation_context and messages:
-            conversation_context = self._get_conversation_context(messages)
+            # The conversation context tool runs synchronously
+            conversation_context = await asyncio.to_thread(
+                self._get_conversation_context, messages
+            )
 
         # Use the provided enhanced prompt, or fall back to user_prompt if not provided
         if enhanced_prompt is None:
@@ -437,14 +347,10 @@ class ImageGenerationTool(BaseTool):
                 "error_code": "CONFIGURATION_ERROR",
                 "direct_response": True,
             }
-            import json
-
-            return ImageGenerationResponse(
-                **response_dict, result=json.dumps(response_dict)
-            )
+            return {**response_dict, "result": json.dumps(response_dict)}
 
         # Generate the image
-        generated_image = self._generate_image_with_config(
+        generated_image = await self._generate_image_with_config(
             enhanced_prompt, config, width, height, cfg_scale
         )
 
@@ -482,18 +388,16 @@ class ImageGenerationTool(BaseTool):
                 else:
                     result_dict["used_conversation_context"] = False
 
-                import json
-
-                return ImageGenerationResponse(
-                    success=True,
-                    image_data=image_b64,  # Keep image data in response object for Streamlit app
-                    original_prompt=user_prompt,
-                    enhanced_prompt=enhanced_prompt,
-                    direct_response=True,
-                    result=json.dumps(
-                        result_dict
-                    ),  # Result field excludes image_data
-                )
+                return {
+                    "success": True,
+                    # Keep image data in response object for Streamlit app
+                    "image_data": image_b64,
+                    "original_prompt": user_prompt,
+                    "enhanced_prompt": enhanced_prompt,
+                    "direct_response": True,
+                    # Result field excludes image_data
+                    "result": json.dumps(result_dict),
+                }
             except Exception as e:
                 logger.error("Error converting image to base64: %s", e)
                 response_dict = {
@@ -506,11 +410,7 @@ class ImageGenerationTool(BaseTool):
                     "error_code": "IMAGE_PROCESSING_ERROR",
                     "direct_response": True,
                 }
-                import json
-
-                return ImageGenerationResponse(
-                    **response_dict, result=json.dumps(response_dict)
-                )
+                return {**response_dict, "result": json.dumps(response_dict)}
         else:
             response_dict = {
                 "success": False,
@@ -523,11 +423,140 @@ class ImageGenerationTool(BaseTool):
                 "error_code": "GENERATION_FAILED",
                 "direct_response": True,
             }
-            import json
+            return {**response_dict, "result": json.dumps(response_dict)}
+
+
+class ImageGenerationView(ToolView):
+    """View for formatting image generation responses"""
+
+    def format_response(
+        self, data: Dict[str, Any], response_type: Type[BaseToolResponse]
+    ) -> BaseToolResponse:
+        """Format raw data into ImageGenerationResponse"""
+        return response_type(**data)
+
+    def format_error(
+        self, error: Exception, response_type: Type[BaseToolResponse]
+    ) -> BaseToolResponse:
+        """Format error into ImageGenerationResponse"""
+        response_dict = {
+            "success": False,
+            "original_prompt": "",
+            "enhanced_prompt": "",
+            "error_message": f"Image generation failed: {str(error)}",
+            "error_code": "EXECUTION_ERROR",
+            "direct_response": True,
+        }
+        return response_type(**response_dict, result=json.dumps(response_dict))
 
-            return ImageGenerationResponse(
-                **response_dict, result=json.dumps(response_dict)
-            )
+
+class ImageGenerationTool(BaseTool):
+    """Tool for generating images with AI"""
+
+    def __init__(self):
+        super().__init__()
+        self.name = "generate_image"
+        self.description = (
+            "Generate images or visualizations from text descriptions. Use"
+            " when user requests creating, generating, making, or drawing"
+            " images or other visuals. OK to use for graphs, charts or signs"
+            " with text."
+        )
+        self.supported_contexts = ["image_generation"]
+        # Generation awaits the endpoint instead of holding a thread
+        self.execution_mode = ExecutionMode.ASYNC
+        self.timeout = IMAGE_GENERATION_TIMEOUT
+
+    def _initialize_mvc(self):
+        """Initialize MVC components"""
+        self._controller = ImageGenerationController(IMAGE_GENERATION_TIMEOUT)
+        self._view = ImageGenerationView()
+
+    def _validate_params(self, params: Dict[str, Any]) -> None:
+        """Accept partial parameters, which fall back to defaults"""
+
+    def get_definition(self) -> Dict[str, Any]:
+        """
+        Return OpenAI-compatible tool definition
+
+        Returns:
+            Dict containing the OpenAI-compatible tool definition
+        """
+        return {
+            "type": "function",
+            "function": {
+                "name": self.name,
+                "description": self.description,
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "user_prompt": {
+                            "type": "string",
+                            "description": (
+                                "The user's original message requesting image"
+                                " generation"
+                            ),
+                        },
+                        "aspect_ratio": {
+                            "type": "string",
+                            "description": (
+                                "Aspect ratio for the image. Choose based on"
+                                " the content: 'square' for balanced"
+                                " compositions, social media posts, or general"
+                                " purpose images; 'portrait' for vertical"
+                                " subjects like people, tall buildings, or"
+                                " phone wallpapers; 'landscape' for wide"
+                                " scenes, natural vistas, or desktop"
+                                " wallpapers."
+                            ),
+                            "enum": ALLOWED_ASPECT_RATIOS,
+                            "default": "square",
+                        },
+                        "use_conversation_context": {
+                            "type": "boolean",
+                            "description": (
+                                "Whether to use conversation history to"
+                                " enhance the prompt. Useful for generating"
+                                " images related to ongoing discussions or"
+                                " stories."
+                            ),
+                            "default": True,
+                        },
+                        "but_why": {
+                            "type": "integer",
+                            "description": (
+                                "An integer from 1-5 where a larger number"
+                                " indicates confidence this is the right tool"
+                                " to help the user."
+                            ),
+                        },
+                        "enhanced_prompt": {
+                            "type": "string",
+                            "description": (
+                                "The enhanced/rewritten prompt to use for"
+                                " image generation. If the original user"
+                                " prompt is already detailed and well-formed,"
+                                " you can use it as-is. Otherwise, enhance it"
+                                " with more specific details, artistic"
+                                " direction, and visual elements to improve"
+                                " the image generation result."
+                            ),
+                        },
+                    },
+                    "required": [
+                        "user_prompt",
+                        "aspect_ratio",
+                        "use_conversation_context",
+                        "but_why",
+                        "enhanced_prompt",
+                    ],
+                },
+            },
+        }
+
+    def get_response_type(self) -> Type[ImageGenerationResponse]:
+        """Get the response type for this tool"""
+        return ImageGenerationResponse
 
     def run_with_dict(self, params: Dict[str, Any]) -> ImageGenerationResponse:
         """
@@ -575,17 +604,7 @@ class ImageGenerationTool(BaseTool):
             "Number of messages: %d", len(messages) if messages else 0
         )
 
-        # Create config from environment
-        config = ChatConfig.from_environment()
-        return self.generate_image_from_prompt(
-            user_prompt,
-            aspect_ratio,
-            cfg_scale,
-            use_conversation_context,
-            enhanced_prompt,
-            config,
-            messages,
-        )
+        return self.execute(params)
 
 
 # Helper functions for backward compatibility
@@ -4,6 +4,7 @@ from typing import Any, Dict, List, Optional, Type
 import serpapi
 from pydantic import BaseModel, Field
 from tools.base import BaseTool, BaseToolResponse
+from utils.event_loop import background_loop
 from utils.text_processing import clean_content, strip_think_tags
 
 # Configure logger
@@ -175,15 +176,6 @@ class NewsTool(BaseTool):
                     ):
                         # StreamingExtractResponse - collect the content
                         try:
-                            import asyncio
-
-                            # Create a new event loop if one doesn't exist
-                            try:
-                                loop = asyncio.get_event_loop()
-                            except RuntimeError:
-                                loop = asyncio.new_event_loop()
-                                asyncio.set_event_loop(loop)
-
                             # Collect content from the async generator
                             async def collect_content():
                                 collected = ""
@@ -193,9 +185,7 @@ class NewsTool(BaseTool):
                                     collected += chunk
                                 return collected
 
-                            content = loop.run_until_complete(
-                                collect_content()
-                            )
+                            content = background_loop.run(collect_content())
                         except Exception as e:
                             logger.error(
                                 "Failed to collect streaming content "
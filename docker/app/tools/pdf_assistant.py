@@ -7,6 +7,7 @@ Simplified tool that delegates to the new PDF services:
 - PDFSummarizerServiceV2 for summaries
 """
 
+import asyncio
 import logging
 from typing import Any, Dict, List, Optional, Type
 
@@ -17,6 +18,7 @@ from services.pdf_query_service_v2 import PDFQueryServiceV2
 from services.pdf_summarizer_service_v2 import PDFSummarizerServiceV2
 from services.session_state import get_active_pdf_id
 from tools.base import BaseTool, BaseToolResponse, ToolController, ToolView
+from utils.event_loop import background_loop
 
 logger = logging.getLogger(__name__)
 
@@ -53,15 +55,7 @@ class PDFAssistantController(ToolController):
     def process(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Process PDF operation synchronously"""
         # Run async operation in sync context
-        import asyncio
-
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        return loop.run_until_complete(self.process_async(params))
+        return background_loop.run(self.process_async(params))
 
     async def process_async(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Process PDF operation asynchronously"""
@@ -78,8 +72,12 @@ class PDFAssistantController(ToolController):
                 "filename": "None",
             }
 
-        # Get PDF metadata
-        pdf_data = self.file_storage.get_pdf(pdf_id)
+        # Get PDF metadata; pages are only loaded for summarization
+        # Storage and vector search calls block, so run them off the event
+        # loop shared by all sessions
+        pdf_data = await asyncio.to_thread(
+            self.file_storage.get_pdf_metadata, pdf_id
+        )
         if not pdf_data:
             return {
                 "success": False,
@@ -104,8 +102,12 @@ class PDFAssistantController(ToolController):
                 )
 
                 # Pass the user's query as instruction for context
+                full_pdf_data = (
+                    await asyncio.to_thread(self.file_storage.get_pdf, pdf_id)
+                    or pdf_data
+                )
                 result = await self.summarizer.summarize_pdf(
-                    pdf_data, user_instruction=query
+                    full_pdf_data, user_instruction=query
                 )
 
                 logger.info(
@@ -145,7 +147,9 @@ class PDFAssistantController(ToolController):
                         "filename": filename,
                     }
 
-                query_result = self.query_service.query(pdf_id, query)
+                query_result = await asyncio.to_thread(
+                    self.query_service.query, pdf_id, query
+                )
 
                 # Format chunks into readable response
                 if query_result["used"]:
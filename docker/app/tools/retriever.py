@@ -9,6 +9,7 @@ from pydantic import BaseModel, Field
 from pymilvus import MilvusClient
 from tools.base import BaseTool, BaseToolResponse
 from utils.config import config
+from utils.embedding_cache import embedding_cache
 from utils.text_processing import strip_think_tags
 
 # Configure logger
@@ -58,9 +59,19 @@ class EmbeddingCreator:
         )
 
     def create_formatted_query(self, input_text: str) -> List[float]:
-        """Create and format query embedding"""
+        """Create and format query embedding, reusing cached embeddings"""
+        # Whitespace differences should not cause a cache miss
+        input_text = " ".join(input_text.split())
+        if embedding_cache:
+            cached = embedding_cache.get(self.model, "query", input_text)
+            if cached:
+                return [cached]
+
         embedding_info = self.create_query(input_text)
-        return [embedding_info.data[0].embedding]
+        embedding = embedding_info.data[0].embedding
+        if embedding_cache:
+            embedding_cache.put(self.model, "query", input_text, embedding)
+        return [embedding]
 
 
 class SimilaritySearch:
@@ -107,10 +118,17 @@ class SimilaritySearch:
         client.load_collection(collection_name=self.config.collection_name)
         return client
 
-    def search(self, data: List[float]) -> List[Dict[str, Any]]:
-        """Perform vector similarity search"""
+    def search(
+        self,
+        data: List[float],
+        filter: str = "",
+        partition_names: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Perform vector similarity search, optionally filtered by scalars"""
         results = self.client.search(
             data=data,
+            filter=filter,
+            partition_names=partition_names,
             limit=self.config.topk,
             collection_name=self.config.collection_name,
             search_params=self.search_params,
@@ -1,4 +1,5 @@
 from .components import ChatHistoryComponent
+from .streaming_markdown import IncrementalMarkdownRenderer
 from .view_helpers import (
     MessageHelper,
     ProgressHelper,
@@ -18,6 +19,7 @@ from .view_interfaces import (
 
 __all__ = [
     "ChatHistoryComponent",
+    "IncrementalMarkdownRenderer",
     "ViewHelperFactory",
     "MessageHelper",
     "ProgressHelper",
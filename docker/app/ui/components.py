@@ -1,14 +1,32 @@
 import logging
+from functools import lru_cache
 
 import streamlit as st
 from models.chat_config import ChatConfig
 from models.chat_message import ChatMessage
 from services.file_storage_service import FileStorageService
-from utils.image import base64_to_pil_image
+from utils.config import config
 from utils.split_context import extract_context_regex
 from utils.text_processing import escape_markdown_dollars, strip_think_tags
 
 
+@lru_cache(maxsize=config.ui.MARKDOWN_CACHE_SIZE)
+def render_markdown(content: str) -> str:
+    """
+    Prepare message text for st.markdown, memoized by content
+
+    History messages never change once stored, so each one is processed
+    once instead of on every rerun.
+
+    Args:
+        content: Display text of a message
+
+    Returns:
+        Markdown with dollar signs escaped for Streamlit
+    """
+    return escape_markdown_dollars(content)
+
+
 class ChatHistoryComponent:
     """Component for displaying chat history with pagination"""
 
@@ -26,128 +44,178 @@ class ChatHistoryComponent:
         self, messages: list, messages_per_page: int = 25
     ):
         """
-        Display the chat history with pagination
+        Display the chat history, virtualized or with pagination
 
         Args:
             messages: List of messages to display
             messages_per_page: Number of messages to show per page
         """
+        # Filter out system messages and tool messages (PDF content is now automatically injected)
+        display_messages = [
+            m for m in messages if m["role"] not in ("system", "tool")
+        ]
+
+        if config.ui.CHAT_HISTORY_MODE == "virtualized":
+            self._display_virtualized(display_messages)
+        else:
+            self._display_paginated(display_messages, messages_per_page)
+
+    def _display_virtualized(self, display_messages: list):
+        """
+        Render only the most recent window of messages
+
+        Earlier messages are not rendered at all until the user widens the
+        window, so reruns cost the same however long the session grows.
+        Images in the window are shown as stored thumbnails, except the
+        newest one which is shown at display size.
+
+        Args:
+            display_messages: Messages to display, oldest first
+        """
+        if "history_window" not in st.session_state:
+            st.session_state.history_window = config.ui.CHAT_HISTORY_WINDOW
+
+        window = st.session_state.history_window
+        hidden = max(0, len(display_messages) - window)
+        if hidden:
+            earlier = min(hidden, config.ui.CHAT_HISTORY_WINDOW_STEP)
+            if st.button(
+                f"Show {earlier} earlier messages", key="history_show_earlier"
+            ):
+                st.session_state.history_window = (
+                    window + config.ui.CHAT_HISTORY_WINDOW_STEP
+                )
+                st.rerun()
+
+        visible = display_messages[hidden:]
+        newest_image = max(
+            (
+                i
+                for i, m in enumerate(visible)
+                if ChatMessage(m["role"], m["content"]).is_image_message()
+            ),
+            default=None,
+        )
+        for i, message in enumerate(visible):
+            self._display_message(
+                message,
+                is_last=i == len(visible) - 1,
+                image_preset="display" if i == newest_image else "thumbnail",
+            )
+
+    def _display_paginated(
+        self, display_messages: list, messages_per_page: int
+    ):
+        """
+        Render one page of messages with pagination controls
+
+        Args:
+            display_messages: Messages to display, oldest first
+            messages_per_page: Number of messages to show per page
+        """
         # Defensive check for current_page
         if not hasattr(st.session_state, "current_page"):
             st.session_state.current_page = 0
 
         current_page = st.session_state.current_page
-
-        # Filter out system messages and tool messages (PDF content is now automatically injected)
-        display_messages = []
-        for m in messages:
-            if m["role"] == "system":
-                continue
-            if m["role"] == "tool":
-                # Skip tool messages - they're no longer needed for display
-                continue
-            else:
-                display_messages.append(m)
         total_pages = max(1, len(display_messages) // messages_per_page + 1)
 
         start_idx = current_page * messages_per_page
         end_idx = start_idx + messages_per_page
+        page_messages = display_messages[start_idx:end_idx]
 
-        for i, message in enumerate(display_messages[start_idx:end_idx]):
-            with st.chat_message(
-                message["role"],
-                avatar=(
-                    self.config.user_avatar
-                    if message["role"] == "user"
-                    else self.config.assistant_avatar
-                ),
-            ):
-                chat_message = ChatMessage(message["role"], message["content"])
-
-                # Check if this is an image message
-                if chat_message.is_image_message():
-                    image_id, enhanced_prompt, original_prompt = (
-                        chat_message.get_image_data()
-                    )
-
-                    # Retrieve image from file storage
-                    if image_id:
-                        try:
-                            # Get image data from file storage
-                            image_info = self.file_storage.get_image(image_id)
-
-                            if image_info and "image_data" in image_info:
-                                image_data = image_info["image_data"]
-
-                                # Convert base64 back to PIL Image for display
-                                image = base64_to_pil_image(image_data)
-                                if image:
-                                    st.image(
-                                        image,
-                                        caption=f"{enhanced_prompt}",
-                                        use_container_width=True,
-                                    )
-                                else:
-                                    logging.error(
-                                        "Failed to convert image data for"
-                                        f" image_id: {image_id}"
-                                    )
-                                    st.info(
-                                        "🖼️ Image could not be displayed"
-                                        " (conversion error)"
-                                    )
-                            else:
-                                logging.warning(
-                                    f"Image not found in storage: {image_id}"
-                                )
-                                st.info(
-                                    "🖼️ Image not available (may have been"
-                                    " removed)"
-                                )
-
-                        except Exception as e:
-                            logging.error(
-                                "Error displaying image %s: %s", image_id, e
-                            )
-                            st.error(f"Error displaying image: {e}")
-                    else:
-                        # No image ID available
-                        logging.warning("Image message without image_id")
-                        st.info("🖼️ Image reference not available")
-
-                    # Display the text content
-                    content = chat_message.get_display_content()
-                    if content:
-                        # Escape dollar signs for proper markdown rendering
-                        escaped_content = escape_markdown_dollars(content)
-                        st.markdown(escaped_content, unsafe_allow_html=True)
-                else:
-                    # Regular text message
-                    content = chat_message.get_display_content()
-                    # Escape dollar signs for proper markdown rendering
-                    escaped_content = escape_markdown_dollars(content)
-                    st.markdown(escaped_content, unsafe_allow_html=True)
-
-                # Display tool context if this is the last assistant message and context exists
-                if (
-                    message["role"] == "assistant"
-                    and i == len(display_messages[start_idx:end_idx]) - 1
-                    and hasattr(
-                        st.session_state, "last_tool_context"
-                    )  # Last message in current page
-                    and st.session_state.last_tool_context
-                    and not st.session_state.get(
-                        "processing", False
-                    )  # Don't show during active processing
-                ):
-                    self.display_context_expander(
-                        st.session_state.last_tool_context
-                    )
+        for i, message in enumerate(page_messages):
+            self._display_message(
+                message,
+                # Last message in current page
+                is_last=i == len(page_messages) - 1,
+                image_preset="display",
+            )
 
         # Display pagination controls if needed
         if total_pages > 1:
             self._display_pagination_controls(current_page, total_pages)
 
+    def _display_message(
+        self, message: dict, is_last: bool, image_preset: str
+    ):
+        """
+        Render one chat message
+
+        Args:
+            message: Message to display
+            is_last: Whether this is the last rendered message
+            image_preset: Stored derivative used for image messages
+        """
+        with st.chat_message(
+            message["role"],
+            avatar=(
+                self.config.user_avatar
+                if message["role"] == "user"
+                else self.config.assistant_avatar
+            ),
+        ):
+            chat_message = ChatMessage(message["role"], message["content"])
+
+            # Check if this is an image message
+            if chat_message.is_image_message():
+                image_id, enhanced_prompt, original_prompt = (
+                    chat_message.get_image_data()
+                )
+
+                # Retrieve image from file storage
+                if image_id:
+                    try:
+                        # Derivatives come from the storage hot cache, so
+                        # reruns skip disk reads and full-resolution decoding
+                        image_bytes = self.file_storage.get_image_derivative(
+                            image_id, image_preset
+                        )
+
+                        if image_bytes:
+                            st.image(
+                                image_bytes,
+                                caption=f"{enhanced_prompt}",
+                                use_container_width=image_preset
+                                != "thumbnail",
+                            )
+                        else:
+                            logging.warning(
+                                f"Image not found in storage: {image_id}"
+                            )
+                            st.info(
+                                "🖼️ Image not available (may have been removed)"
+                            )
+
+                    except Exception as e:
+                        logging.error(
+                            "Error displaying image %s: %s", image_id, e
+                        )
+                        st.error(f"Error displaying image: {e}")
+                else:
+                    # No image ID available
+                    logging.warning("Image message without image_id")
+                    st.info("🖼️ Image reference not available")
+
+            # Display the text content
+            content = chat_message.get_display_content()
+            if content:
+                st.markdown(render_markdown(content), unsafe_allow_html=True)
+
+            # Display tool context if this is the last assistant message and context exists
+            if (
+                message["role"] == "assistant"
+                and is_last
+                and hasattr(st.session_state, "last_tool_context")
+                and st.session_state.last_tool_context
+                and not st.session_state.get(
+                    "processing", False
+                )  # Don't show during active processing
+            ):
+                self.display_context_expander(
+                    st.session_state.last_tool_context
+                )
+
     def _display_pagination_controls(
         self, current_page: int, total_pages: int
     ):
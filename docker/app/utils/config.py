@@ -22,6 +22,26 @@ class UIConfig:
     # Pagination and display
     CURRENT_PAGE_DEFAULT: int = 0
 
+    # Chat history rendering: "virtualized" renders only the most recent
+    # window of messages, "paginated" renders pages of messages
+    CHAT_HISTORY_MODE: str = field(
+        default_factory=lambda: os.getenv("CHAT_HISTORY_MODE", "virtualized")
+    )
+    CHAT_HISTORY_WINDOW: int = 20  # Messages rendered in virtualized mode
+    CHAT_HISTORY_WINDOW_STEP: int = 20  # Added by "Show earlier messages"
+    MARKDOWN_CACHE_SIZE: int = 1024  # Rendered message bodies kept
+
+    # Streamed responses re-render their open markdown block at most this
+    # often, or once this many characters are pending
+    STREAM_FLUSH_INTERVAL_MS: int = field(
+        default_factory=lambda: int(
+            os.getenv("STREAM_FLUSH_INTERVAL_MS", "100")
+        )
+    )
+    STREAM_FLUSH_CHARS: int = field(
+        default_factory=lambda: int(os.getenv("STREAM_FLUSH_CHARS", "400"))
+    )
+
     # Colors and styling
     BRAND_COLOR: str = "#76b900"
 
@@ -40,10 +60,49 @@ class SessionConfig:
     # PDF storage limits
     MAX_PDFS_IN_SESSION: int = 3
 
+    # Chat history preprocessing
+    HISTORY_CLEAN_CACHE_SIZE: int = 4096  # Cleaned message contents kept
+
     # Image ID generation
     IMAGE_ID_PREFIX: str = "img_"
 
 
+@dataclass
+class StorageConfig:
+    """Stored file eviction and caching configuration"""
+
+    EVICTION_ENABLED: bool = field(
+        default_factory=lambda: os.getenv(
+            "STORAGE_EVICTION_ENABLED", "true"
+        ).lower()
+        == "true"
+    )
+    MAX_TOTAL_BYTES: int = field(
+        default_factory=lambda: int(os.getenv("STORAGE_MAX_TOTAL_MB", "1024"))
+        * 1024
+        * 1024
+    )  # Cap on all stored files; 0 disables
+    SESSION_QUOTA_BYTES: int = field(
+        default_factory=lambda: int(
+            os.getenv("STORAGE_SESSION_QUOTA_MB", "100")
+        )
+        * 1024
+        * 1024
+    )  # Per-session quota; 0 disables
+    MAX_AGE_SECONDS: int = field(
+        default_factory=lambda: int(os.getenv("STORAGE_MAX_AGE_HOURS", "168"))
+        * 3600
+    )  # Evict files not accessed for this long; 0 disables
+    EVICTION_INTERVAL_SECONDS: float = 60.0  # Time between eviction passes
+    EVICTION_BATCH_SIZE: int = 100  # Maximum files evicted per pass
+    LIVE_SESSION_SECONDS: int = 1800  # Sessions seen this recently are live
+    HOT_CACHE_MAX_BYTES: int = field(
+        default_factory=lambda: int(os.getenv("STORAGE_HOT_CACHE_MB", "128"))
+        * 1024
+        * 1024
+    )  # In-memory cache of recently read files; 0 disables
+
+
 @dataclass
 class FileProcessingConfig:
     """File processing configuration"""
@@ -56,6 +115,9 @@ class FileProcessingConfig:
     MAX_PDF_SIZE: int = 100 * 1024 * 1024
     MAX_IMAGE_SIZE: int = 20 * 1024 * 1024
 
+    # Uploads are spooled to disk and hashed in chunks of this size
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+
     # Supported file types
     SUPPORTED_PDF_TYPES: List[str] = field(default_factory=lambda: ["pdf"])
     SUPPORTED_IMAGE_TYPES: List[str] = field(
@@ -100,6 +162,67 @@ class FileProcessingConfig:
         3.0  # L2 distance threshold for similarity
     )
 
+    # PDF embedding settings
+    PDF_EMBEDDING_BATCH_SIZE: int = field(
+        default_factory=lambda: int(
+            os.getenv("PDF_EMBEDDING_BATCH_SIZE", "32")
+        )
+    )  # Chunk texts sent per embeddings request
+    PDF_EMBEDDING_MAX_CONCURRENCY: int = field(
+        default_factory=lambda: int(
+            os.getenv("PDF_EMBEDDING_MAX_CONCURRENCY", "4")
+        )
+    )  # Embedding batches in flight at once
+    PDF_EMBEDDING_MAX_RETRIES: int = 3  # Retries per failed batch
+    PDF_EMBEDDING_RETRY_BACKOFF: float = 1.0  # Base backoff in seconds
+
+    # Background ingestion: run extraction, chunking and indexing off the
+    # Streamlit script run and poll progress from the UI
+    PDF_BACKGROUND_INGESTION: bool = field(
+        default_factory=lambda: os.getenv(
+            "PDF_BACKGROUND_INGESTION", "true"
+        ).lower()
+        == "true"
+    )
+    PDF_INGESTION_JOB_TTL: int = 3600  # Seconds finished jobs are kept
+
+    # Milvus layout for PDF chunks: "none" (one shared partition),
+    # "partition_key" (pdf_id is the partition key) or "per_document"
+    # (one named partition per PDF, limited by Milvus' partition cap)
+    PDF_MILVUS_PARTITION_MODE: str = field(
+        default_factory=lambda: os.getenv(
+            "PDF_MILVUS_PARTITION_MODE", "none"
+        ).lower()
+    )
+    PDF_MILVUS_NUM_PARTITIONS: int = 64  # Partitions in partition_key mode
+
+    # Embedding cache settings (shared by PDF ingestion and queries)
+    EMBEDDING_CACHE_ENABLED: bool = field(
+        default_factory=lambda: os.getenv(
+            "EMBEDDING_CACHE_ENABLED", "true"
+        ).lower()
+        == "true"
+    )
+    EMBEDDING_CACHE_PATH: str = field(
+        default_factory=lambda: os.getenv(
+            "EMBEDDING_CACHE_PATH", "/tmp/chatbot_storage/embedding_cache.db"
+        )
+    )
+    EMBEDDING_CACHE_MAX_ENTRIES: int = field(
+        default_factory=lambda: int(
+            os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "100000")
+        )
+    )  # Least recently used embeddings are evicted beyond this
+
+    # Preprocessed VLM images of unstored images, keyed by content hash
+    VLM_IMAGE_CACHE_PATH: str = field(
+        default_factory=lambda: os.getenv(
+            "VLM_IMAGE_CACHE_PATH", "/tmp/chatbot_storage/vlm_cache"
+        )
+    )
+    VLM_IMAGE_CACHE_MAX_FILES: int = 256  # Oldest files are removed beyond
+    VLM_IMAGE_CACHE_MEMORY_BYTES: int = 64 * 1024 * 1024
+
     # PDF Upload behavior
     PDF_REUPLOAD_EXISTING: bool = field(
         default_factory=lambda: os.getenv(
@@ -144,6 +267,12 @@ class LLMConfig:
             os.getenv("MAX_TOOL_RESPONSE_TOKENS", "16000")
         )
     )  # Maximum tokens for individual tool responses
+    TOKENIZER_PATH: str = field(
+        default_factory=lambda: os.getenv(
+            "TOKENIZER_PATH", "/app/assets/tokenizer.model"
+        )
+    )  # tiktoken BPE file (e.g. a Llama 3 tokenizer.model) for token counts
+    TOKEN_COUNT_CACHE_SIZE: int = 4096  # Message token counts kept
 
     # Conversation context injection
     AUTO_INJECT_CONVERSATION_CONTEXT: bool = (
@@ -152,6 +281,53 @@ class LLMConfig:
     MIN_TURNS_FOR_CONTEXT_INJECTION: int = (
         1  # Minimum turns before injecting context
     )
+    INCREMENTAL_CONVERSATION_SUMMARY: bool = field(
+        default_factory=lambda: os.getenv(
+            "INCREMENTAL_CONVERSATION_SUMMARY", "true"
+        ).lower()
+        == "true"
+    )  # Fold only new turns into a per-session rolling summary
+    SUMMARY_MIN_NEW_CHARS: int = (
+        20  # Assistant messages shorter than this don't update the summary
+    )
+    SUMMARY_MAX_SESSIONS: int = (
+        256  # Maximum number of sessions with a cached rolling summary
+    )
+    PARALLEL_CONTEXT_AND_TOOL_SELECTION: bool = field(
+        default_factory=lambda: os.getenv(
+            "PARALLEL_CONTEXT_AND_TOOL_SELECTION", "true"
+        ).lower()
+        == "true"
+    )  # Run tool selection concurrently with conversation context generation
+    SPECULATIVE_SELECTION_MIN_SIMILARITY: float = (
+        0.5  # Re-run tool selection if the fresh summary is less similar
+    )
+    STREAMING_TOOL_SELECTION: bool = field(
+        default_factory=lambda: os.getenv(
+            "STREAMING_TOOL_SELECTION", "false"
+        ).lower()
+        == "true"
+    )  # Stream tool selection and forward direct answers (tool_choice=auto)
+    STREAMING_SELECTION_DECISION_CHARS: int = (
+        64  # Visible characters before a streamed selection counts as text
+    )
+
+    # Async HTTP connection pool per LLM client and event loop
+    HTTP_MAX_CONNECTIONS: int = field(
+        default_factory=lambda: int(
+            os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100")
+        )
+    )
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = field(
+        default_factory=lambda: int(
+            os.getenv("LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")
+        )
+    )
+    HTTP_KEEPALIVE_EXPIRY: float = field(
+        default_factory=lambda: float(
+            os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "30")
+        )
+    )
 
 
 @dataclass
@@ -171,6 +347,26 @@ class ImageGenerationConfig:
         ]
     )
 
+    # Shared HTTP connection pool of the image generation client
+    HTTP_MAX_CONNECTIONS: int = field(
+        default_factory=lambda: int(
+            os.getenv("IMAGE_HTTP_MAX_CONNECTIONS", "20")
+        )
+    )
+    HTTP_KEEPALIVE_EXPIRY: float = field(
+        default_factory=lambda: float(
+            os.getenv("IMAGE_HTTP_KEEPALIVE_EXPIRY", "30")
+        )
+    )
+    MAX_CONCURRENT_REQUESTS: int = field(
+        default_factory=lambda: int(
+            os.getenv("IMAGE_MAX_CONCURRENT_REQUESTS", "4")
+        )
+    )
+    # Total time budget per request, including waiting for a free slot
+    REQUEST_TIMEOUT: float = 120.0
+    CONNECT_TIMEOUT: float = 10.0
+
 
 @dataclass
 class APIConfig:
@@ -477,6 +673,7 @@ class AppConfig:
         """Initialize all configuration sections"""
         self.ui = UIConfig()
         self.session = SessionConfig()
+        self.storage = StorageConfig()
         self.file_processing = FileProcessingConfig()
         self.tool_context = ToolContextConfig()
         self.llm = LLMConfig()
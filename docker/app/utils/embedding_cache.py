@@ -0,0 +1,265 @@
+"""
+Embedding Cache Utility
+
+This module provides a persistent, content-addressed cache for embeddings so
+identical texts are not re-embedded. Entries are keyed by model, input type
+and the SHA-256 of the text, stored as float32 blobs in SQLite and evicted in
+least-recently-used order once the cache grows past its entry limit.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from utils.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """Thread-safe SQLite-backed LRU cache for embeddings"""
+
+    def __init__(self, db_path: str, max_entries: int):
+        """
+        Initialize the embedding cache
+
+        Args:
+            db_path: Path of the SQLite database file
+            max_entries: Maximum number of embeddings to keep
+        """
+        self.db_path = Path(db_path)
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._entry_count = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Open the database on first use (caller holds the lock)"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.db_path), check_same_thread=False, timeout=30
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    key TEXT PRIMARY KEY,
+                    dim INTEGER NOT NULL,
+                    vector BLOB NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access"
+                " ON embeddings (last_access)"
+            )
+            conn.commit()
+            self._entry_count = conn.execute(
+                "SELECT COUNT(*) FROM embeddings"
+            ).fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def make_key(model: str, input_type: str, text: str) -> str:
+        """
+        Build the cache key for a text
+
+        Args:
+            model: Embedding model name
+            input_type: Embedding input type (e.g. "query" or "passage")
+            text: Text being embedded
+
+        Returns:
+            Cache key string
+        """
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{model}:{input_type}:{digest}"
+
+    def get_many(
+        self, model: str, input_type: str, texts: Sequence[str]
+    ) -> List[Optional[List[float]]]:
+        """
+        Look up embeddings for several texts
+
+        Args:
+            model: Embedding model name
+            input_type: Embedding input type
+            texts: Texts to look up
+
+        Returns:
+            Embeddings in the same order as texts, None for misses
+        """
+        keys = [self.make_key(model, input_type, text) for text in texts]
+        found: Dict[str, List[float]] = {}
+
+        try:
+            with self._lock:
+                conn = self._get_connection()
+                unique_keys = list(dict.fromkeys(keys))
+                # Stay well below SQLite's bound parameter limit
+                for start in range(0, len(unique_keys), 500):
+                    batch = unique_keys[start : start + 500]
+                    placeholders = ",".join("?" * len(batch))
+                    rows = conn.execute(
+                        "SELECT key, vector FROM embeddings"
+                        f" WHERE key IN ({placeholders})",
+                        batch,
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = array("f")
+                        vector.frombytes(blob)
+                        found[key] = vector.tolist()
+
+                if found:
+                    now = time.time()
+                    conn.executemany(
+                        "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                        [(now, key) for key in found],
+                    )
+                    conn.commit()
+
+                hit_count = sum(1 for key in keys if key in found)
+                self.hits += hit_count
+                self.misses += len(keys) - hit_count
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache lookup failed: {e}")
+            return [None] * len(texts)
+
+        return [found.get(key) for key in keys]
+
+    def get(
+        self, model: str, input_type: str, text: str
+    ) -> Optional[List[float]]:
+        """
+        Look up the embedding for a single text
+
+        Args:
+            model: Embedding model name
+            input_type: Embedding input type
+            text: Text to look up
+
+        Returns:
+            Cached embedding, or None on a miss
+        """
+        return self.get_many(model, input_type, [text])[0]
+
+    def put_many(
+        self,
+        model: str,
+        input_type: str,
+        texts: Sequence[str],
+        embeddings: Sequence[Optional[Sequence[float]]],
+    ) -> None:
+        """
+        Store embeddings for several texts
+
+        Args:
+            model: Embedding model name
+            input_type: Embedding input type
+            texts: Texts that were embedded
+            embeddings: Embeddings for the texts; None entries are skipped
+        """
+        now = time.time()
+        rows = [
+            (
+                self.make_key(model, input_type, text),
+                len(embedding),
+                array("f", embedding).tobytes(),
+                now,
+            )
+            for text, embedding in zip(texts, embeddings)
+            if embedding
+        ]
+        if not rows:
+            return
+
+        try:
+            with self._lock:
+                conn = self._get_connection()
+                before = conn.total_changes
+                conn.executemany(
+                    "INSERT OR IGNORE INTO embeddings"
+                    " (key, dim, vector, last_access) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                self._entry_count += conn.total_changes - before
+                if self._entry_count > self.max_entries:
+                    self._evict(conn)
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache store failed: {e}")
+
+    def put(
+        self,
+        model: str,
+        input_type: str,
+        text: str,
+        embedding: Sequence[float],
+    ) -> None:
+        """
+        Store the embedding for a single text
+
+        Args:
+            model: Embedding model name
+            input_type: Embedding input type
+            text: Text that was embedded
+            embedding: Embedding vector
+        """
+        self.put_many(model, input_type, [text], [embedding])
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop least recently used entries (caller holds the lock)"""
+        # Evict down to 90% so eviction does not run on every insert
+        target = int(self.max_entries * 0.9)
+        excess = self._entry_count - target
+        conn.execute(
+            "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings"
+            " ORDER BY last_access LIMIT ?)",
+            (excess,),
+        )
+        self._entry_count = conn.execute(
+            "SELECT COUNT(*) FROM embeddings"
+        ).fetchone()[0]
+        self.evictions += excess
+        logger.debug(f"Evicted {excess} embeddings from cache")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with entry count, hits, misses, hit rate and evictions
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": self._entry_count,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+# Global embedding cache instance, None when disabled
+embedding_cache: Optional[EmbeddingCache] = (
+    EmbeddingCache(
+        config.file_processing.EMBEDDING_CACHE_PATH,
+        config.file_processing.EMBEDDING_CACHE_MAX_ENTRIES,
+    )
+    if config.file_processing.EMBEDDING_CACHE_ENABLED
+    else None
+)
@@ -0,0 +1,253 @@
+"""
+Background Event Loop Utility
+
+This module provides a process-wide event loop running on a dedicated
+thread. Synchronous callers such as Streamlit script runs submit coroutines
+and async streams to it instead of creating a loop per call, so async
+clients and their pooled connections bound to the loop are reused across
+turns and users.
+
+Jobs keep the Streamlit script run context of the thread that submitted
+them. Streamlit looks the context up on the current thread, and the loop
+thread answers that lookup per asyncio task, so concurrent jobs of
+different sessions each see their own session state.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import contextvars
+import logging
+import queue
+import threading
+from typing import Any, AsyncIterable, Awaitable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Script run context of the job a task belongs to
+_job_script_run_ctx: contextvars.ContextVar = contextvars.ContextVar(
+    "job_script_run_ctx", default=None
+)
+
+# Queue marker ending a bridged stream
+_DONE = object()
+
+
+def _current_script_run_ctx():
+    """Script run context of the calling thread, if any"""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    return get_script_run_ctx(suppress_warning=True)
+
+
+class _LoopThread(threading.Thread):
+    """Thread running the background event loop"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        super().__init__(name="background_event_loop", daemon=True)
+        self._loop = loop
+
+    # Attribute Streamlit reads and writes in get_script_run_ctx and
+    # add_script_run_ctx, resolved per task instead of per thread
+    @property
+    def streamlit_script_run_ctx(self):
+        return _job_script_run_ctx.get()
+
+    @streamlit_script_run_ctx.setter
+    def streamlit_script_run_ctx(self, ctx):
+        _job_script_run_ctx.set(ctx)
+
+    def run(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+
+class BackgroundEventLoop:
+    """Singleton event loop on a dedicated thread for shared use"""
+
+    _instance: Optional["BackgroundEventLoop"] = None
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _thread: Optional[_LoopThread] = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Get the background event loop, starting its thread on first use"""
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    thread = _LoopThread(loop)
+                    thread.start()
+                    self._thread = thread
+                    self._loop = loop
+                    logger.info("Started background event loop thread")
+
+                    # Register cleanup on exit
+                    atexit.register(self._cleanup)
+        return self._loop
+
+    def in_loop_thread(self) -> bool:
+        """Whether the caller runs on the background loop thread"""
+        return (
+            self._thread is not None
+            and threading.current_thread() is self._thread
+        )
+
+    def submit(self, coroutine: Awaitable) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the background loop
+
+        The coroutine runs with the Streamlit script run context of the
+        calling thread. Cancelling the returned future cancels the task.
+
+        Args:
+            coroutine: Coroutine to run
+
+        Returns:
+            Future with the result of the coroutine
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self._run_job(coroutine, _current_script_run_ctx()), self.loop
+        )
+
+    def run(self, coroutine: Awaitable, timeout: Optional[float] = None):
+        """
+        Run a coroutine on the background loop and wait for its result
+
+        Args:
+            coroutine: Coroutine to run
+            timeout: Seconds to wait before cancelling the coroutine
+
+        Returns:
+            Result of the coroutine
+
+        Raises:
+            RuntimeError: If called from the loop thread, which would block
+                the loop on itself
+            TimeoutError: If the coroutine did not finish in time
+        """
+        if self.in_loop_thread():
+            coroutine.close()
+            raise RuntimeError(
+                "Cannot wait for the background event loop from its own"
+                " thread; await the coroutine instead"
+            )
+
+        future = self.submit(coroutine)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def stream(self, iterable: AsyncIterable) -> Iterator[Any]:
+        """
+        Iterate an async iterable on the background loop from sync code
+
+        Items are handed over through a queue as soon as they are produced,
+        and errors of the iterable are raised to the caller. Closing the
+        returned iterator early, for instance when a script run is stopped
+        or rerun, cancels the job and closes the async iterable.
+
+        Args:
+            iterable: Async iterable to consume, not iterated yet
+
+        Yields:
+            Items of the iterable
+        """
+        if self.in_loop_thread():
+            raise RuntimeError(
+                "Cannot stream from the background event loop on its own"
+                " thread; iterate the async iterable instead"
+            )
+
+        items: queue.SimpleQueue = queue.SimpleQueue()
+
+        async def pump():
+            try:
+                async for item in iterable:
+                    items.put(item)
+            finally:
+                aclose = getattr(iterable, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+
+        future = self.submit(pump())
+        future.add_done_callback(lambda _: items.put(_DONE))
+        try:
+            while True:
+                item = items.get()
+                if item is _DONE:
+                    break
+                yield item
+            future.result()
+        finally:
+            if not future.done():
+                logger.info("Cancelling background stream closed early")
+                future.cancel()
+
+    def shutdown(self, timeout: float = 5.0):
+        """Cancel pending tasks and stop the background loop"""
+        loop, thread = self._loop, self._thread
+        if loop is None or loop.is_closed():
+            return
+
+        logger.info("Shutting down background event loop")
+
+        async def cancel_tasks():
+            tasks = [
+                task
+                for task in asyncio.all_tasks()
+                if task is not asyncio.current_task()
+            ]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            # Close the async clients bound to this loop so their
+            # connections are not left open
+            from services.image_generation_client import (
+                image_generation_client,
+            )
+            from services.llm_client_service import llm_client_service
+
+            await llm_client_service.aclose_loop_clients()
+            await image_generation_client.aclose_loop_client()
+
+        try:
+            asyncio.run_coroutine_threadsafe(cancel_tasks(), loop).result(
+                timeout=timeout
+            )
+        except Exception as e:
+            logger.debug(f"Error cancelling background tasks: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=timeout)
+        self._loop = None
+        self._thread = None
+
+    async def _run_job(self, coroutine: Awaitable, script_run_ctx):
+        """Run a coroutine as a job of the submitting script run"""
+        # Tasks run in a copy of the context, so this stays with the job
+        # and the tasks it spawns
+        _job_script_run_ctx.set(script_run_ctx)
+        return await coroutine
+
+    def _cleanup(self):
+        """Cleanup function called on exit"""
+        self.shutdown(timeout=1.0)
+
+
+# Global background event loop instance
+background_loop = BackgroundEventLoop()
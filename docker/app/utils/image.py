@@ -6,7 +6,7 @@ from io import BytesIO
 from typing import Optional
 
 # Third-party imports
-import requests
+import httpx
 from PIL import Image
 from pydantic import BaseModel
 
@@ -65,6 +65,42 @@ class ImageProcessingRequest(BaseModel):
         arbitrary_types_allowed = True  # dead: disable
 
 
+def _request_payload(
+    prompt: Optional[str],
+    cfg_scale: float,
+    width: int,
+    height: int,
+    preprocess_image: bool,
+    seed: int,
+    steps: int,
+    disable_safety_checker: bool,
+) -> dict:
+    """Build the JSON body of an image generation request"""
+    # Create a dictionary of parameters
+    params = {
+        "prompt": prompt,
+        # "mode": mode,
+        "cfg_scale": cfg_scale,
+        "width": width,
+        "height": height,
+        "preprocess_image": preprocess_image,
+        "seed": seed,
+        "steps": steps,
+        "disable_safety_checker": disable_safety_checker,
+    }
+
+    # Only add the image parameter if mode is not "base" and image_b64 is provided
+    # if mode in ALLOWED_MODES and image_b64 is not None:
+    #     params["image"] = image_b64
+    # elif mode == "redux" and image_b64 is not None:
+    #     params.pop("prompt")
+    #     params["image"] = image_b64
+
+    logger.info(f"Params: {params}")
+    # Create the request object using the Pydantic model
+    return ImageProcessingRequest(**params).model_dump()
+
+
 def generate_image(
     invoke_url: str,
     image_b64: Optional[str] = None,
@@ -78,9 +114,10 @@ def generate_image(
     steps: int = DEFAULT_STEPS,
     disable_safety_checker: bool = True,
     return_bytes_io: bool = True,
-) -> Image.Image:
+) -> Optional[Image.Image | str]:
     """
-    Send a request to an image generation API using the requests library and Pydantic model.
+    Send a request to an image generation API using the shared image
+    generation client and Pydantic model.
 
     Args:
         invoke_url: The URL endpoint to invoke
@@ -94,57 +131,110 @@ def generate_image(
         seed: Random seed for reproducibility
         steps: Number of diffusion steps
         disable_safety_checker: Whether to disable safety checker
+        return_bytes_io: Decode the result into a PIL Image; when False the
+            base64 string from the API is returned as is
 
     Returns:
-        PIL Image object created from the API response
+        PIL Image or base64 string from the API response, or None if the
+        request failed
 
     Raises:
-        requests.RequestException: If the request fails
         ImageProcessingError: If there's an issue with processing parameters
     """
     try:
-        # Create a dictionary of parameters
-        params = {
-            "prompt": prompt,
-            # "mode": mode,
-            "cfg_scale": cfg_scale,
-            "width": width,
-            "height": height,
-            "preprocess_image": preprocess_image,
-            "seed": seed,
-            "steps": steps,
-            "disable_safety_checker": disable_safety_checker,
-        }
-
-        # Only add the image parameter if mode is not "base" and image_b64 is provided
-        # if mode in ALLOWED_MODES and image_b64 is not None:
-        #     params["image"] = image_b64
-        # elif mode == "redux" and image_b64 is not None:
-        #     params.pop("prompt")
-        #     params["image"] = image_b64
-
-        logger.info(f"Params: {params}")
-        # Create the request object using the Pydantic model
-        request_data = ImageProcessingRequest(**params)
-
-        # Make the request using the model's json method
-        response = requests.post(
-            invoke_url, json=request_data.model_dump(), headers=HTTP_HEADERS
+        payload = _request_payload(
+            prompt,
+            cfg_scale,
+            width,
+            height,
+            preprocess_image,
+            seed,
+            steps,
+            disable_safety_checker,
         )
 
-        # Raise HTTP errors
-        response.raise_for_status()
+        # Pooled, coalesced and concurrency-bounded request
+        from services.image_generation_client import image_generation_client
+
+        generated_b64 = image_generation_client.generate_image(
+            invoke_url, payload, headers=HTTP_HEADERS
+        )
         if return_bytes_io:
-            return base64_to_pil_image(
-                response.json()["artifacts"][0]["base64"]
-            )
+            return base64_to_pil_image(generated_b64)
         else:
-            return response.json()["artifacts"][0]["base64"]
+            # Pass the base64 through for storage without a PIL round trip
+            return generated_b64
 
-    except requests.RequestException as e:
+    except httpx.HTTPStatusError as e:
+        logger.error(f"API request failed: {str(e)}")
+        logger.error(e.response.text)
+    except httpx.HTTPError as e:
+        logger.error(f"API request failed: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error generating image: {str(e)}")
+        raise ImageProcessingError(
+            f"Failed to generate image: {str(e)}"
+        ) from e
+
+
+async def agenerate_image(
+    invoke_url: str,
+    prompt: Optional[str] = DEFAULT_PROMPT,
+    cfg_scale: float = DEFAULT_CFG_SCALE,
+    width: int = DEFAULT_WIDTH,
+    height: int = DEFAULT_HEIGHT,
+    preprocess_image: bool = True,
+    seed: int = DEFAULT_SEED,
+    steps: int = DEFAULT_STEPS,
+    disable_safety_checker: bool = True,
+    timeout: Optional[float] = None,
+) -> Optional[str]:
+    """
+    Async counterpart of generate_image for callers on an event loop,
+    returning the base64 string from the API.
+
+    Args:
+        invoke_url: The URL endpoint to invoke
+        prompt: Text prompt describing the desired image
+        cfg_scale: Classifier free guidance scale
+        width: Image width in pixels
+        height: Image height in pixels
+        preprocess_image: Whether to preprocess the input image
+        seed: Random seed for reproducibility
+        steps: Number of diffusion steps
+        disable_safety_checker: Whether to disable safety checker
+        timeout: Seconds to wait for the image, defaults to the client's
+            request timeout
+
+    Returns:
+        Base64 string from the API response, or None if the request failed
+
+    Raises:
+        ImageProcessingError: If there's an issue with processing parameters
+    """
+    try:
+        payload = _request_payload(
+            prompt,
+            cfg_scale,
+            width,
+            height,
+            preprocess_image,
+            seed,
+            steps,
+            disable_safety_checker,
+        )
+
+        from services.image_generation_client import image_generation_client
+
+        return await image_generation_client.agenerate_image(
+            invoke_url, payload, headers=HTTP_HEADERS, timeout=timeout
+        )
+
+    except httpx.HTTPStatusError as e:
+        logger.error(f"API request failed: {str(e)}")
+        logger.error(e.response.text)
+    except httpx.HTTPError as e:
         logger.error(f"API request failed: {str(e)}")
-        logger.error(response.json())
-        # raise
     except Exception as e:
         logger.error(f"Error generating image: {str(e)}")
         raise ImageProcessingError(
@@ -186,3 +276,26 @@ def base64_to_pil_image(base64_str: str) -> Optional[Image.Image]:
     except Exception as e:
         logger.error(f"Error converting base64 to PIL Image: {str(e)}")
         return None
+
+
+def decode_base64_image(base64_str: str) -> Optional[bytes]:
+    """
+    Decode a base64 encoded image to its encoded bytes without parsing it.
+
+    Streamlit and storage accept the encoded bytes directly, so this avoids
+    the full PIL decode of base64_to_pil_image.
+
+    Args:
+        base64_str: Base64 encoded image string, with or without data URI
+            prefix
+
+    Returns:
+        The encoded image bytes or None if decoding fails
+    """
+    try:
+        if "data:" in base64_str and ";base64," in base64_str:
+            base64_str = re.sub(BASE64_PREFIX_PATTERN, "", base64_str)
+        return base64.b64decode(base64_str)
+    except Exception as e:
+        logger.error(f"Error decoding base64 image: {str(e)}")
+        return None
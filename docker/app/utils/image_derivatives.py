@@ -0,0 +1,146 @@
+"""
+Image Derivatives Utility
+
+Renders the resized variants of stored images that readers actually need,
+so they can be generated once and persisted instead of decoding and
+resizing the full-resolution original on every use:
+
+- thumbnail: small preview for the sidebar
+- display: chat history rendering, longest side capped at 1024 pixels
+- vlm: the tile-aligned RGB PNG sent to the vision language model
+"""
+
+import logging
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Dict, Optional, Tuple
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# VLM inputs are tiled in 512 pixel squares, at most 12 tiles in total and
+# 3072 pixels per side
+VLM_TILE_SIZE = 512
+VLM_MAX_TILES = 12
+VLM_MAX_DIMENSION = 3072
+
+
+@dataclass(frozen=True)
+class DerivativePreset:
+    """How one derivative is rendered"""
+
+    name: str
+    format: str  # PIL format name
+    mime_type: str
+    max_dimension: Optional[int] = None  # Longest side; None for VLM tiling
+    quality: int = 85
+
+    @property
+    def extension(self) -> str:
+        """File extension of the rendered derivative"""
+        return f".{self.format.lower()}"
+
+
+DERIVATIVE_PRESETS: Dict[str, DerivativePreset] = {
+    preset.name: preset
+    for preset in (
+        DerivativePreset("thumbnail", "WEBP", "image/webp", 256),
+        DerivativePreset("display", "WEBP", "image/webp", 1024, quality=90),
+        DerivativePreset("vlm", "PNG", "image/png"),
+    )
+}
+
+
+def vlm_target_size(width: int, height: int) -> Tuple[int, int]:
+    """
+    Pick the tile grid closest to an image's aspect ratio
+
+    Args:
+        width: Original width in pixels
+        height: Original height in pixels
+
+    Returns:
+        Target (width, height), a multiple of the tile size per side
+    """
+    aspect = width / height
+    best_tiles = (1, 1)
+    best_aspect_diff = float("inf")
+    max_tiles_per_dimension = VLM_MAX_DIMENSION // VLM_TILE_SIZE
+
+    for w_tiles in range(1, max_tiles_per_dimension + 1):
+        for h_tiles in range(1, max_tiles_per_dimension + 1):
+            if w_tiles * h_tiles > VLM_MAX_TILES:
+                break
+
+            aspect_diff = abs(aspect - w_tiles / h_tiles)
+            if aspect_diff < best_aspect_diff:
+                best_aspect_diff = aspect_diff
+                best_tiles = (w_tiles, h_tiles)
+
+    return best_tiles[0] * VLM_TILE_SIZE, best_tiles[1] * VLM_TILE_SIZE
+
+
+def _flatten_to_rgb(img: Image.Image) -> Image.Image:
+    """Composite transparent images on white and convert to RGB"""
+    if img.mode in ("RGBA", "LA", "P"):
+        img = img.convert("RGBA")
+        rgb_img = Image.new("RGB", img.size, (255, 255, 255))
+        rgb_img.paste(img, mask=img.split()[-1])
+        return rgb_img
+    if img.mode != "RGB":
+        return img.convert("RGB")
+    return img
+
+
+def render_derivative(image_bytes: bytes, preset_name: str) -> bytes:
+    """
+    Render one derivative of an image
+
+    Args:
+        image_bytes: Encoded original image
+        preset_name: Key of DERIVATIVE_PRESETS
+
+    Returns:
+        Encoded derivative image
+    """
+    preset = DERIVATIVE_PRESETS[preset_name]
+
+    with Image.open(BytesIO(image_bytes)) as img:
+        width, height = img.size
+
+        if preset.max_dimension is None:
+            target_size = vlm_target_size(width, height)
+            if (
+                img.size == target_size
+                and img.format == "PNG"
+                and img.mode == "RGB"
+            ):
+                # Already VLM-ready, skip decoding and re-encoding
+                return image_bytes
+            rendered = _flatten_to_rgb(img)
+            if rendered.size != target_size:
+                rendered = rendered.resize(
+                    target_size, Image.Resampling.LANCZOS
+                )
+        else:
+            rendered = img.convert(
+                "RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB"
+            )
+            # thumbnail() keeps the aspect ratio and never upscales
+            rendered.thumbnail(
+                (preset.max_dimension, preset.max_dimension),
+                Image.Resampling.LANCZOS,
+            )
+
+        buffer = BytesIO()
+        if preset.format == "PNG":
+            rendered.save(buffer, format="PNG")
+        else:
+            rendered.save(buffer, format=preset.format, quality=preset.quality)
+
+    logger.debug(
+        f"Rendered {preset_name} derivative of {width}x{height} image as"
+        f" {rendered.size[0]}x{rendered.size[1]} ({buffer.tell()} bytes)"
+    )
+    return buffer.getvalue()
@@ -0,0 +1,128 @@
+"""
+Image Upload Utility
+
+Prepares uploaded images for storage in a single pass: the upload is parsed
+once, decoded only when it has to be resized (at reduced scale for JPEGs),
+encoded once and hashed from the encoded bytes. The resulting ProcessedImage
+is handed to storage as is, so nothing downstream decodes or re-hashes it.
+"""
+
+import base64
+import hashlib
+import logging
+from dataclasses import dataclass
+from functools import cached_property
+from io import BytesIO
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Longest side of stored uploads in pixels
+UPLOAD_MAX_DIMENSION = 1024
+
+# Formats resized uploads are re-encoded in; anything else becomes PNG
+_ENCODE_FORMATS = ("JPEG", "PNG", "GIF", "BMP")
+
+
+@dataclass
+class ProcessedImage:
+    """An upload ready for storage, with its SHA-256 digest"""
+
+    filename: str
+    file_type: str  # MIME type
+    image_bytes: bytes
+    sha256: str
+    width: int
+    height: int
+    resized: bool = False
+
+    @property
+    def size_bytes(self) -> int:
+        """Size of the encoded image in bytes"""
+        return len(self.image_bytes)
+
+    @cached_property
+    def base64(self) -> str:
+        """Base64 form of the encoded image, encoded on first use"""
+        return base64.b64encode(self.image_bytes).decode("utf-8")
+
+
+def _encode_format(file_type: str) -> str:
+    """PIL format name to re-encode an upload of a MIME type in"""
+    img_format = file_type.split("/")[-1].upper()
+    if img_format == "JPG":
+        img_format = "JPEG"
+    return img_format if img_format in _ENCODE_FORMATS else "PNG"
+
+
+def prepare_image_upload(
+    image_bytes: bytes,
+    filename: str,
+    file_type: str,
+    max_dimension: int = UPLOAD_MAX_DIMENSION,
+) -> ProcessedImage:
+    """
+    Fit an uploaded image within a maximum dimension and hash it
+
+    Images already within bounds are kept byte for byte; opening them only
+    parses the header. Larger JPEGs are decoded at the smallest DCT scale
+    that still covers the target size before the final Lanczos resize.
+
+    Args:
+        image_bytes: Encoded upload
+        filename: Original filename
+        file_type: MIME type of the upload
+        max_dimension: Longest side of the stored image in pixels
+
+    Returns:
+        ProcessedImage with the bytes to store
+    """
+    with Image.open(BytesIO(image_bytes)) as img:
+        original_width, original_height = img.size
+        if max(original_width, original_height) <= max_dimension:
+            logger.debug(
+                f"Uploaded image '{filename}' already within size limit"
+                f" ({original_width}x{original_height})"
+            )
+            return ProcessedImage(
+                filename=filename,
+                file_type=file_type,
+                image_bytes=image_bytes,
+                sha256=hashlib.sha256(image_bytes).hexdigest(),
+                width=original_width,
+                height=original_height,
+            )
+
+        scale = max_dimension / max(original_width, original_height)
+        target_size = (
+            int(original_width * scale),
+            int(original_height * scale),
+        )
+
+        if img.format == "JPEG":
+            # Let libjpeg decode at 1/2, 1/4 or 1/8 scale where possible
+            img.draft(img.mode, target_size)
+
+        resized_img = img.resize(target_size, Image.Resampling.LANCZOS)
+
+    img_format = _encode_format(file_type)
+    buffer = BytesIO()
+    resized_img.save(buffer, format=img_format, optimize=True)
+    encoded = buffer.getvalue()
+
+    logger.info(
+        f"Resized uploaded image '{filename}' from"
+        f" {original_width}x{original_height} to"
+        f" {target_size[0]}x{target_size[1]} {img_format}"
+        f" ({len(encoded) / 1024:.1f} KB)"
+    )
+    return ProcessedImage(
+        filename=filename,
+        file_type=file_type,
+        image_bytes=encoded,
+        sha256=hashlib.sha256(encoded).hexdigest(),
+        width=target_size[0],
+        height=target_size[1],
+        resized=True,
+    )
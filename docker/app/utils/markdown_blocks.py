@@ -0,0 +1,140 @@
+"""
+Markdown Block Splitter
+
+Splits streamed markdown into committed blocks that can no longer change,
+so a streaming renderer can render each of them once and only keep
+re-rendering the open block at the end:
+
+- paragraphs, lists and tables are committed at the blank line ending them,
+  once the next line shows the block does not continue (indented
+  continuation lines and further items of a list stay in the block)
+- fenced code blocks are committed at their closing fence
+
+Only complete lines are inspected, and each line once, so the total cost is
+linear in the length of the stream.
+"""
+
+import re
+from typing import List, Optional
+
+_FENCE_OPEN = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+_LIST_ITEM = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s")
+
+
+class MarkdownBlockSplitter:
+    """Incremental splitter of streamed markdown into committed blocks"""
+
+    def __init__(self):
+        # Text of the open block, starting after the last committed block
+        self._tail = ""
+        # Offset in _tail of the first line not inspected yet
+        self._line_start = 0
+        # Fence marker while inside a fenced code block
+        self._fence: Optional[str] = None
+        # Offset in _tail of a blank line that may end the open block
+        self._break_at: Optional[int] = None
+
+    @property
+    def tail(self) -> str:
+        """The open block, which may still change"""
+        return self._tail
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Add streamed text
+
+        Args:
+            text: Next piece of the stream
+
+        Returns:
+            Blocks committed by this piece, in order
+        """
+        self._tail += text
+        blocks = []
+        while (newline := self._tail.find("\n", self._line_start)) != -1:
+            line = self._tail[self._line_start : newline]
+            line_end = newline + 1
+
+            if self._fence is not None:
+                if self._closes_fence(line):
+                    self._fence = None
+                    line_end = self._commit(blocks, line_end)
+            elif not line.strip():
+                if self._break_at is None:
+                    self._break_at = self._line_start
+            else:
+                if self._break_at is not None:
+                    if self._continues_block(line):
+                        self._break_at = None
+                    else:
+                        line_end = self._commit_at_break(blocks, line_end)
+
+                fence = _FENCE_OPEN.match(line)
+                if fence:
+                    # A fence interrupts the paragraph before it
+                    if self._tail[: self._line_start].strip():
+                        line_end = self._commit_before(blocks, line_end)
+                    self._fence = fence.group(1)
+
+            self._line_start = line_end
+        return blocks
+
+    def flush(self) -> List[str]:
+        """
+        End the stream
+
+        Returns:
+            The remaining blocks, including the open one
+        """
+        blocks = []
+        if self._break_at is not None and self._fence is None:
+            self._commit_at_break(blocks, len(self._tail))
+        if self._tail.strip():
+            blocks.append(self._tail)
+        self._tail = ""
+        self._line_start = 0
+        self._fence = None
+        self._break_at = None
+        return blocks
+
+    def _closes_fence(self, line: str) -> bool:
+        """Whether a line closes the open code fence"""
+        stripped = line.strip()
+        return (
+            len(line) - len(line.lstrip(" ")) <= 3
+            and stripped.startswith(self._fence)
+            and not stripped.strip(self._fence[0])
+        )
+
+    def _continues_block(self, line: str) -> bool:
+        """Whether a line after a blank line still belongs to the block"""
+        if line[:1] in (" ", "\t"):
+            return True
+        return bool(
+            _LIST_ITEM.match(line) and _LIST_ITEM.match(self._tail.lstrip())
+        )
+
+    def _commit(self, blocks: List[str], end: int) -> int:
+        """Commit _tail[:end] and return the new offset of end"""
+        if self._tail[:end].strip():
+            blocks.append(self._tail[:end])
+        self._tail = self._tail[end:]
+        self._break_at = None
+        return 0
+
+    def _commit_before(self, blocks: List[str], line_end: int) -> int:
+        """Commit the text before the current line"""
+        start = self._line_start
+        self._commit(blocks, start)
+        self._line_start = 0
+        return line_end - start
+
+    def _commit_at_break(self, blocks: List[str], line_end: int) -> int:
+        """Commit the block ending at the pending blank line"""
+        start = self._line_start
+        if self._tail[: self._break_at].strip():
+            blocks.append(self._tail[: self._break_at])
+        self._tail = self._tail[start:]
+        self._break_at = None
+        self._line_start = 0
+        return line_end - start
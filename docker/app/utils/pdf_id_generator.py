@@ -6,9 +6,12 @@ and reliable identification across sessions.
 """
 
 import hashlib
+import json
 import logging
 from typing import BinaryIO, Union
 
+from utils.upload_spool import hash_stream
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,23 +36,14 @@ def generate_pdf_id(
     try:
         # Handle both bytes and file-like objects
         if hasattr(pdf_content, "read"):
-            # It's a file-like object (e.g., UploadedFile from Streamlit)
-            # Read the content and reset position
-            current_pos = (
-                pdf_content.tell() if hasattr(pdf_content, "tell") else 0
-            )
-            pdf_content.seek(0)
-            content_bytes = pdf_content.read()
-            pdf_content.seek(current_pos)  # Reset to original position
+            # It's a file-like object (e.g., UploadedFile from Streamlit);
+            # hash it in chunks instead of reading it whole
+            content_hash = hash_stream(pdf_content)
         else:
             # It's already bytes
-            content_bytes = pdf_content
-
-        # Generate SHA256 hash of content
-        content_hash = hashlib.sha256(content_bytes).hexdigest()
+            content_hash = hashlib.sha256(pdf_content).hexdigest()
 
-        # Use first 16 characters for ID (sufficient uniqueness)
-        pdf_id = f"pdf_{content_hash[:16]}"
+        pdf_id = pdf_id_from_digest(content_hash)
 
         logger.debug(
             f"Generated PDF ID {pdf_id} for {filename or 'unknown file'}"
@@ -72,6 +66,23 @@ def generate_pdf_id(
             return f"pdf_{timestamp_hash}"
 
 
+def pdf_id_from_digest(sha256_hexdigest: str) -> str:
+    """
+    Build a PDF ID from the SHA-256 digest of the PDF content.
+
+    Lets callers that already hashed the file while spooling it skip a
+    second pass over the content.
+
+    Args:
+        sha256_hexdigest: Hex SHA-256 digest of the PDF bytes
+
+    Returns:
+        str: PDF ID in format 'pdf_<hash>', the same as generate_pdf_id
+    """
+    # Use first 16 characters for ID (sufficient uniqueness)
+    return f"pdf_{sha256_hexdigest[:16]}"
+
+
 def check_pdf_exists(pdf_id: str, milvus_client) -> bool:
     """
     Check if a PDF with given ID already exists in the database.
@@ -90,7 +101,7 @@ def check_pdf_exists(pdf_id: str, milvus_client) -> bool:
         collection = Collection("pdf_chunks")
 
         # Search for one result with this pdf_id
-        expr = f'metadata like "%\\"pdf_id\\": \\"{pdf_id}\\"%"'
+        expr = f"pdf_id == {json.dumps(pdf_id)}"
         results = collection.query(expr=expr, output_fields=["id"], limit=1)
 
         exists = len(results) > 0
@@ -115,16 +126,12 @@ def get_existing_pdf_info(pdf_id: str, file_storage_service) -> dict:
         dict: PDF metadata if found, None otherwise
     """
     try:
-        # Try to get PDF data from file storage
-        pdf_data = file_storage_service.get_pdf(pdf_id)
+        # Read only the stored metadata, not the page text
+        pdf_data = file_storage_service.get_pdf_metadata(pdf_id)
         if pdf_data:
-            # Count chunks if available in pages data
-            chunk_count = 0
-            pages = pdf_data.get("pages", [])
-            if pages:
-                # Estimate chunk count based on page count
-                # Typically 2-3 chunks per page with overlapping windows
-                chunk_count = len(pages) * 2
+            # Estimate chunk count based on page count
+            # Typically 2-3 chunks per page with overlapping windows
+            chunk_count = pdf_data.get("total_pages", 0) * 2
 
             return {
                 "pdf_id": pdf_id,
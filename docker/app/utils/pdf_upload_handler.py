@@ -12,7 +12,10 @@ import streamlit as st
 from controllers.file_controller import FileController
 from models.chat_config import ChatConfig
 from services.pdf_ingestion_service import PDFIngestionService
+from services.pdf_ingestion_worker import pdf_ingestion_worker
 from services.session_state import set_active_pdf_id, set_session_id
+from utils.config import config as app_config
+from utils.upload_spool import spool_upload
 
 logger = logging.getLogger(__name__)
 
@@ -56,8 +59,6 @@ def handle_pdf_upload(uploaded_file) -> Optional[Dict[str, Any]]:
         ingestion_service = PDFIngestionService(config)
 
         # Use configuration to determine whether to check for existing PDFs
-        from utils.config import config as app_config
-
         check_existing = app_config.file_processing.PDF_REUPLOAD_EXISTING
 
         result = ingestion_service.ingest(
@@ -70,16 +71,7 @@ def handle_pdf_upload(uploaded_file) -> Optional[Dict[str, Any]]:
 
         # Set as active PDF
         pdf_id = result["pdf_id"]
-        set_active_pdf_id(pdf_id)
-
-        # Store in session state for UI
-        st.session_state["active_pdf"] = {
-            "pdf_id": pdf_id,
-            "filename": filename,
-            "total_pages": result["total_pages"],
-            "char_count": result["char_count"],
-            "chunk_count": result["chunk_count"],
-        }
+        activate_pdf(pdf_id, filename, result)
 
         logger.info(f"PDF ingestion complete: {result}")
 
@@ -121,6 +113,59 @@ def handle_pdf_upload(uploaded_file) -> Optional[Dict[str, Any]]:
         return None
 
 
+def submit_pdf_upload(uploaded_file) -> Optional[str]:
+    """
+    Queue a PDF upload for background ingestion.
+
+    The file is spooled to disk here, in the script run, because the
+    uploaded file object does not outlive it.
+
+    Args:
+        uploaded_file: Streamlit UploadedFile object
+
+    Returns:
+        Ingestion job ID to poll, or None if nothing was uploaded
+    """
+    if not uploaded_file:
+        return None
+
+    session_id = st.session_state.get("session_id", "default")
+    set_session_id(session_id)
+
+    upload = spool_upload(
+        uploaded_file,
+        filename=uploaded_file.name,
+        suffix=app_config.file_processing.PDF_TEMP_FILE_SUFFIX,
+    )
+    return pdf_ingestion_worker.submit(
+        upload=upload,
+        session_id=session_id,
+        check_existing=app_config.file_processing.PDF_REUPLOAD_EXISTING,
+    )
+
+
+def activate_pdf(pdf_id: str, filename: str, info: Dict[str, Any]):
+    """
+    Make a PDF the active document of the session.
+
+    Args:
+        pdf_id: The PDF identifier
+        filename: Original filename
+        info: Ingestion result (or partial progress) with page, character
+            and chunk counts
+    """
+    set_active_pdf_id(pdf_id)
+
+    # Store in session state for UI
+    st.session_state["active_pdf"] = {
+        "pdf_id": pdf_id,
+        "filename": filename,
+        "total_pages": info.get("total_pages", 0),
+        "char_count": info.get("char_count", 0),
+        "chunk_count": info.get("chunk_count", 0),
+    }
+
+
 def clear_active_pdf():
     """Clear the active PDF from session state"""
     set_active_pdf_id(None)
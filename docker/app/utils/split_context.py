@@ -1,5 +1,3 @@
-import re
-
 START_CONTEXT = "<START_CONTEXT>"
 END_CONTEXT = "<END_CONTEXT>"
 
@@ -7,12 +5,11 @@ END_CONTEXT = "<END_CONTEXT>"
 def extract_context_regex(
     text, start_token=START_CONTEXT, end_token=END_CONTEXT
 ):
-    start_escaped = re.escape(start_token)
-    end_escaped = re.escape(end_token)
-    pattern = f"(.*?){start_escaped}(.*?){end_escaped}"
-
-    match = re.search(pattern, text, re.DOTALL)
-    if match:
-        before_text = match.group(1)  # Text before START_TOKEN
+    # Text before the first start token, if an end token follows it. Same
+    # result as searching for (.*?)START(.*?)END, without the quadratic
+    # backtracking of that pattern on text without tokens
+    start = text.find(start_token)
+    if start != -1 and text.find(end_token, start + len(start_token)) != -1:
+        before_text = text[:start]  # Text before START_TOKEN
         return before_text
     return text
@@ -466,10 +466,20 @@ class TextProcessor:
         return info
 
 
+_THINK_OPEN = "<think>"
+_THINK_CLOSE = "</think>"
+
+
 class StreamingThinkTagFilter:
     """
     A stateful filter for removing think tags from streaming text.
     Handles cases where tags span multiple chunks.
+
+    Each chunk is searched with str.find from where the previous chunk left
+    off. Inside a think block only the last characters that could still
+    begin the closing tag are kept, and outside one at most a possible
+    opening tag is held back, so the total cost is linear in the length of
+    the stream.
     """
 
     def __init__(self):
@@ -487,62 +497,42 @@ class StreamingThinkTagFilter:
         Returns:
             Text that can be safely displayed (with think tags removed)
         """
-        # Add chunk to buffer
-        self.buffer += chunk
-
-        # Process buffer to extract displayable content
-        output = ""
+        buffer = self.buffer + chunk
+        output = []
         i = 0
 
-        while i < len(self.buffer):
+        while True:
             if self.in_think_tag:
                 # Look for closing tag
-                close_index = self.buffer.find("</think>", i)
-                if close_index != -1:
-                    # Found closing tag, skip to after it
-                    i = close_index + 8  # len('</think>')
-                    self.in_think_tag = False
-                else:
-                    # No closing tag yet, wait for more chunks
+                close_index = buffer.find(_THINK_CLOSE, i)
+                if close_index == -1:
+                    # Only the end can still begin the closing tag
+                    self.buffer = buffer[
+                        max(i, len(buffer) - len(_THINK_CLOSE) + 1) :
+                    ]
                     break
+                # Found closing tag, skip to after it
+                i = close_index + len(_THINK_CLOSE)
+                self.in_think_tag = False
             else:
                 # Look for opening tag
-                open_index = self.buffer.find("<think>", i)
-                if open_index != -1:
-                    # Output text before the tag
-                    output += self.buffer[i:open_index]
-                    i = open_index + 7  # len('<think>')
-                    self.in_think_tag = True
-                else:
-                    # Check if we might have a partial tag at the end
-                    partial_tag_start = max(i, len(self.buffer) - 7)
-                    for j in range(partial_tag_start, len(self.buffer)):
-                        if (
-                            self.buffer[j:].startswith("<")
-                            or self.buffer[j:].startswith("<t")
-                            or self.buffer[j:].startswith("<th")
-                            or self.buffer[j:].startswith("<thi")
-                            or self.buffer[j:].startswith("<thin")
-                            or self.buffer[j:].startswith("<think")
-                        ):
-                            # Might be start of tag, output up to this point
-                            output += self.buffer[i:j]
-                            # Keep the potential tag start in buffer
-                            self.buffer = self.buffer[j:]
-                            return output
-
-                    # No partial tags, output the rest
-                    output += self.buffer[i:]
-                    self.buffer = ""
+                open_index = buffer.find(_THINK_OPEN, i)
+                if open_index == -1:
+                    # Hold back a "<" near the end that might start a tag
+                    hold_index = buffer.find(
+                        "<", max(i, len(buffer) - len(_THINK_OPEN))
+                    )
+                    if hold_index == -1:
+                        hold_index = len(buffer)
+                    output.append(buffer[i:hold_index])
+                    self.buffer = buffer[hold_index:]
                     break
+                # Output text before the tag
+                output.append(buffer[i:open_index])
+                i = open_index + len(_THINK_OPEN)
+                self.in_think_tag = True
 
-        # Update buffer to remove processed content
-        if i < len(self.buffer):
-            self.buffer = self.buffer[i:]
-        else:
-            self.buffer = ""
-
-        return output
+        return "".join(output)
 
     def flush(self) -> str:
         """
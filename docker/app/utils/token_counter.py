@@ -0,0 +1,240 @@
+"""
+Token Counter
+
+Counts tokens for context budgeting. A tokenizer bundled with the
+deployment gives exact counts: a tiktoken BPE file such as the
+tokenizer.model shipped with Llama 3 models, loaded from TOKENIZER_PATH
+without network access. Without one, a heuristic calibrated against
+cl100k_base estimates counts from the same pre-tokenization the BPE
+tokenizers start from, so code, CJK text and base64 payloads are no
+longer counted as if every four characters were one token.
+
+Message contents never change once stored, so counters cache the counts
+of the strings they have seen.
+"""
+
+import base64
+import logging
+import math
+import os
+import re
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Optional
+
+from utils.config import config
+
+logger = logging.getLogger(__name__)
+
+# Pre-tokenizer of Llama 3 and cl100k_base BPE files
+_BPE_PATTERN = (
+    r"(?i:'s|'t|'re|'ve|'m|'ll|'d)|[^\r\n\p{L}\p{N}]?\p{L}+|\p{N}{1,3}"
+    r"| ?[^\s\p{L}\p{N}]+[\r\n]*|\s*[\r\n]+|\s+(?!\S)|\s+"
+)
+
+# The same pre-tokenizer with re, where [^\W\d_] stands for \p{L}
+_PIECE = re.compile(
+    r"'(?i:[sdmt]|ll|ve|re)|(?:[^\S\r\n]|[^\s\w]|_)?+[^\W\d_]++|\d{1,3}+"
+    r"| ?(?:[^\s\w]|_)++[\r\n]*+|\s++$|\s*[\r\n]|\s+(?!\S)|\s"
+)
+_CASE_RISE = re.compile(r"[a-z](?=[A-Z])")
+_CASE_FALL = re.compile(r"(?<=[A-Za-z][A-Z])[a-z]")
+_LONG_WORD = re.compile(r"[A-Za-z]{9,}")
+_CJK = "぀-ヿ㐀-䶿一-鿿가-힯"
+_CJK_CHAR = re.compile(f"[{_CJK}]")
+_CJK_RUN = re.compile(f"[{_CJK}]+")
+_OTHER_LETTER = re.compile(f"[^\\W\\d_A-Za-z{_CJK}]")
+_OTHER_SYMBOL = re.compile(r"[^\x00-\x7f\w\s]")
+
+# Heuristic weights fitted against cl100k_base on prose, code, CJK text,
+# JSON and base64: extra tokens per case change inside a word, per letter
+# beyond eight in a word, per CJK character and per other non-ASCII
+# letter or symbol, on top of one token per pre-tokenizer piece
+_CASE_RISE_TOKENS = 1.36
+_CASE_FALL_TOKENS = 0.91
+_LONG_WORD_TOKENS = 0.12
+_CJK_CHAR_TOKENS = 1.25
+_OTHER_CHAR_TOKENS = 0.5
+
+
+class TokenCounter(ABC):
+    """Token counter with a per-content cache"""
+
+    name: str = "token counter"
+
+    def __init__(self, cache_size: int = config.llm.TOKEN_COUNT_CACHE_SIZE):
+        """
+        Initialize the counter
+
+        Args:
+            cache_size: Number of counted strings to keep
+        """
+        self._count_cached = lru_cache(maxsize=cache_size)(self.count)
+
+    @abstractmethod
+    def count(self, text: str) -> int:
+        """
+        Count the tokens of a text
+
+        Args:
+            text: Text to count
+
+        Returns:
+            Number of tokens
+        """
+
+    def count_cached(self, text: str) -> int:
+        """
+        Count the tokens of a text that is likely to be counted again,
+        such as a message in the conversation history
+
+        Args:
+            text: Text to count
+
+        Returns:
+            Number of tokens
+        """
+        return self._count_cached(text)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """
+        Cut a text to at most a number of tokens
+
+        Args:
+            text: Text to cut
+            max_tokens: Maximum number of tokens to keep
+
+        Returns:
+            The longest prefix found within the limit
+        """
+        tokens = self.count(text)
+        while tokens > max_tokens and text:
+            # Cut in proportion to the token density of the text
+            text = text[: int(len(text) * max_tokens / tokens * 0.95)]
+            tokens = self.count(text)
+        return text
+
+
+class HeuristicTokenCounter(TokenCounter):
+    """Token estimate from pre-tokenizer pieces and character classes"""
+
+    name = "heuristic"
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+
+        estimate = len(_PIECE.findall(text))
+
+        # Mixed case and long letter runs (identifiers, base64) split
+        # into several tokens
+        estimate += _CASE_RISE_TOKENS * len(_CASE_RISE.findall(text))
+        estimate += _CASE_FALL_TOKENS * len(_CASE_FALL.findall(text))
+        long_words = _LONG_WORD.findall(text)
+        if long_words:
+            estimate += _LONG_WORD_TOKENS * (
+                sum(map(len, long_words)) - 8 * len(long_words)
+            )
+
+        # CJK text takes more than one token per character
+        cjk_chars = len(_CJK_CHAR.findall(text))
+        if cjk_chars:
+            estimate += _CJK_CHAR_TOKENS * cjk_chars - len(
+                _CJK_RUN.findall(text)
+            )
+
+        if not text.isascii():
+            estimate += _OTHER_CHAR_TOKENS * (
+                len(_OTHER_LETTER.findall(text))
+                + len(_OTHER_SYMBOL.findall(text))
+            )
+
+        return math.ceil(estimate)
+
+
+class BPETokenCounter(TokenCounter):
+    """Exact counts from a bundled tiktoken BPE file"""
+
+    def __init__(self, path: str, **kwargs):
+        """
+        Load the tokenizer
+
+        Args:
+            path: tiktoken BPE file, one base64 token and its rank per line
+            **kwargs: Arguments of TokenCounter
+
+        Raises:
+            ImportError: If tiktoken is not installed
+        """
+        import tiktoken
+
+        with open(path, "rb") as f:
+            mergeable_ranks = {
+                base64.b64decode(token): int(rank)
+                for token, rank in (line.split() for line in f if line.strip())
+            }
+        self.name = os.path.basename(path)
+        self._encoding = tiktoken.Encoding(
+            name=self.name,
+            pat_str=_BPE_PATTERN,
+            mergeable_ranks=mergeable_ranks,
+            special_tokens={},
+        )
+        super().__init__(**kwargs)
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        return len(self._encoding.encode_ordinary(text))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        tokens = self._encoding.encode_ordinary(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return self._encoding.decode(tokens[: max(max_tokens, 0)])
+
+
+_token_counter: Optional[TokenCounter] = None
+_token_counter_lock = threading.Lock()
+
+
+def load_token_counter(path: Optional[str] = None) -> TokenCounter:
+    """
+    Create the token counter for a tokenizer file
+
+    Args:
+        path: tiktoken BPE file, defaults to TOKENIZER_PATH
+
+    Returns:
+        BPETokenCounter if the file exists and loads, otherwise
+        HeuristicTokenCounter
+    """
+    path = path if path is not None else config.llm.TOKENIZER_PATH
+    if path and os.path.isfile(path):
+        try:
+            counter = BPETokenCounter(path)
+            logger.info(f"Counting tokens with bundled tokenizer {path}")
+            return counter
+        except Exception as e:
+            logger.warning(
+                f"Could not load tokenizer {path}, estimating tokens: {e}"
+            )
+    else:
+        logger.info("No bundled tokenizer found, estimating tokens")
+    return HeuristicTokenCounter()
+
+
+def get_token_counter() -> TokenCounter:
+    """
+    Get the shared token counter, loading it on first use
+
+    Returns:
+        Shared TokenCounter instance
+    """
+    global _token_counter
+    if _token_counter is None:
+        with _token_counter_lock:
+            if _token_counter is None:
+                _token_counter = load_token_counter()
+    return _token_counter
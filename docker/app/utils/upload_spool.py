@@ -0,0 +1,143 @@
+"""
+Upload Spooling Utility
+
+Streams uploaded files to a temporary file in fixed-size chunks while
+hashing them, so an upload is copied to disk once and never held in memory
+as a whole. The resulting path and digest are reused for PDF extraction,
+content-based IDs and storage.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import BinaryIO, Optional
+
+from utils.config import config
+from utils.exceptions import FileProcessingError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SpooledUpload:
+    """An upload written to a temporary file, with its SHA-256 digest"""
+
+    name: str  # Original filename
+    path: str
+    sha256: str
+    size_bytes: int
+
+    def open(self) -> BinaryIO:
+        """Open the spooled file for reading"""
+        return open(self.path, "rb")
+
+    def cleanup(self) -> None:
+        """Delete the temporary file"""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove spooled upload {self.path}: {e}")
+
+    def __enter__(self) -> "SpooledUpload":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.cleanup()
+
+
+def spool_upload(
+    source: BinaryIO,
+    filename: Optional[str] = None,
+    suffix: str = "",
+    max_bytes: Optional[int] = None,
+) -> SpooledUpload:
+    """
+    Copy a file-like upload to a temporary file, hashing it on the way
+
+    Reading starts at the beginning of the source when it is seekable.
+
+    Args:
+        source: File-like object, e.g. a Streamlit UploadedFile
+        filename: Original filename, defaults to the source's name
+        suffix: Suffix of the temporary file
+        max_bytes: Abort once the upload grows past this size
+
+    Returns:
+        SpooledUpload the caller must clean up
+
+    Raises:
+        FileProcessingError: If the upload exceeds max_bytes
+    """
+    chunk_size = config.file_processing.UPLOAD_CHUNK_SIZE
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+    digest = hashlib.sha256()
+    size = 0
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as spool:
+        try:
+            while chunk := source.read(chunk_size):
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise FileProcessingError(
+                        f"Upload exceeds the limit of {max_bytes} bytes"
+                    )
+                digest.update(chunk)
+                spool.write(chunk)
+        except BaseException:
+            spool.close()
+            os.unlink(spool.name)
+            raise
+
+    return SpooledUpload(
+        name=filename or getattr(source, "name", os.path.basename(spool.name)),
+        path=spool.name,
+        sha256=digest.hexdigest(),
+        size_bytes=size,
+    )
+
+
+def hash_stream(source: BinaryIO, algorithm: str = "sha256") -> str:
+    """
+    Hash a file-like object chunk by chunk, restoring its position
+
+    Args:
+        source: Seekable file-like object
+        algorithm: hashlib algorithm name
+
+    Returns:
+        Hex digest of the full content
+    """
+    chunk_size = config.file_processing.UPLOAD_CHUNK_SIZE
+    position = source.tell()
+    source.seek(0)
+    digest = hashlib.new(algorithm)
+    while chunk := source.read(chunk_size):
+        digest.update(chunk)
+    source.seek(position)
+    return digest.hexdigest()
+
+
+def hash_text(text: str, algorithm: str = "md5") -> str:
+    """
+    Hash an ASCII string chunk by chunk
+
+    Gives the same digest as hashing text.encode() without materializing a
+    full encoded copy, which matters for large base64 payloads.
+
+    Args:
+        text: ASCII text such as base64 data
+        algorithm: hashlib algorithm name
+
+    Returns:
+        Hex digest of the encoded text
+    """
+    chunk_size = config.file_processing.UPLOAD_CHUNK_SIZE
+    digest = hashlib.new(algorithm)
+    for start in range(0, len(text), chunk_size):
+        digest.update(text[start : start + chunk_size].encode())
+    return digest.hexdigest()